@@ -20,23 +20,30 @@ bl_info = {
 from importlib import reload
 
 if "bpy" in locals():
+    reload(utils_image)
     reload(ops_settings)
     reload(props_nodes)
     reload(props_settings)
+    reload(utils_validation)
     reload(ui_node_generator)
     reload(ops_generation)
+    reload(ops_io)
 
 else:
-    from . import ops_settings, props_nodes, props_settings, ui_node_generator, ops_generation
-    from .connector import props, ui, ops, icon_picker, popup_menu, panel
+    from . import utils_image, utils_validation
+    from . import ops_settings, props_nodes, props_settings, ui_node_generator, ops_generation, ops_io
+    from .connector import node_index, props, ui, ops, icon_picker, popup_menu, panel
 
 def register():
+    utils_validation.register()
     ops_settings.register()
     props_nodes.register()
     props_settings.register()
     ui_node_generator.register()
     ops_generation.register()
+    ops_io.register()
 
+    node_index.register()
     props.register()
     ui.register()
     ops.register()
@@ -45,12 +52,15 @@ def register():
     panel.register()
 
 def unregister():
+    utils_validation.unregister()
     ops_settings.unregister()
     props_nodes.unregister()
     props_settings.unregister()
     ui_node_generator.unregister()
     ops_generation.unregister()
+    ops_io.unregister()
 
+    node_index.unregister()
     props.unregister()
     ui.unregister()
     ops.unregister()
@@ -0,0 +1,162 @@
+"""File-wide index of Beantextures node group instances, kept up to date through handlers."""
+import bpy
+from bpy.app.handlers import persistent
+
+class NodeIndex:
+    """Group nodes of every material, and the users of every node group. Materials are indexed by name and node groups by pointer (so that renaming them doesn't matter); the index is rebuilt on file load and undo, and single materials are indexed again whenever the depsgraph reports them (or their node trees) as updated.
+    Materials the depsgraph doesn't report (e.g. on hidden objects, or without users) are checked when queried, and the index can be rebuilt by hand (see `BtxsOp_RefreshNodeIndex`)."""
+    def __init__(self):
+        # {material name: {node name: node group pointer}} of all group nodes
+        self.group_nodes: dict[str, dict[str, int]] = {}
+        # {node group pointer: {(material name, node name)}}
+        self.users: dict[int, set[tuple[str, str]]] = {}
+        # Pointers of node groups generated by Beantextures
+        self.beantextures_trees: set[int] = set()
+        # Material names by the pointer of their (embedded) node tree
+        self.owners: dict[int, str] = {}
+        # (node tree pointer, node count) of every material when it was
+        # indexed; data outside of the view layer never shows up in depsgraph
+        # updates, so entries are checked against it when queried
+        self.signatures: dict[str, tuple[int, int]] = {}
+        # Whether or not the whole index has to be rebuilt before it's used
+        self.dirty = True
+        # Changed whenever any material is indexed (again), so that results
+        # derived from the index (e.g. resolved connector nodes) can be cached
+        self.revision = 0
+
+    def clear(self):
+        self.group_nodes.clear()
+        self.users.clear()
+        self.beantextures_trees.clear()
+        self.owners.clear()
+        self.signatures.clear()
+
+    def rebuild(self):
+        """Index all node groups and materials of the file."""
+        self.clear()
+        for node_tree in bpy.data.node_groups:
+            self.index_node_tree(node_tree)
+        for material in bpy.data.materials:
+            self.index_material(material)
+        self.dirty = False
+
+    def ensure(self):
+        if self.dirty:
+            self.rebuild()
+
+    def index_node_tree(self, node_tree: bpy.types.NodeTree):
+        if node_tree.is_beantextures:
+            self.beantextures_trees.add(node_tree.as_pointer())
+        else:
+            self.beantextures_trees.discard(node_tree.as_pointer())
+
+    def remove_material(self, name: str):
+        self.signatures.pop(name, None)
+        for node_name, tree_key in self.group_nodes.pop(name, {}).items():
+            self.users.get(tree_key, set()).discard((name, node_name))
+
+    def get_signature(self, material: bpy.types.Material) -> tuple[int, int]:
+        if not material.use_nodes or material.node_tree is None:
+            return (0, 0)
+        return (material.node_tree.as_pointer(), len(material.node_tree.nodes))
+
+    def ensure_material(self, material: bpy.types.Material):
+        """Index a material again if it (probably) changed since it was indexed, i.e. its node tree or node count differ."""
+        self.ensure()
+        if self.signatures.get(material.name) != self.get_signature(material):
+            self.index_material(material)
+
+    def index_material(self, material: bpy.types.Material):
+        """(Re)index the group nodes of a material."""
+        self.remove_material(material.name)
+        self.revision += 1
+        nodes: dict[str, int] = {}
+        self.group_nodes[material.name] = nodes
+        self.signatures[material.name] = self.get_signature(material)
+        if not material.use_nodes or material.node_tree is None:
+            return
+
+        self.owners[material.node_tree.as_pointer()] = material.name
+        for node in material.node_tree.nodes:
+            if isinstance(node, bpy.types.ShaderNodeGroup) and node.node_tree is not None:
+                tree_key = node.node_tree.as_pointer()
+                nodes[node.name] = tree_key
+                self.users.setdefault(tree_key, set()).add((material.name, node.name))
+
+    def get_nodes(self, material: bpy.types.Material) -> list[str]:
+        """Get the names of the Beantextures node group instances of a material."""
+        self.ensure_material(material)
+        node_names = list(self.group_nodes[material.name])
+        if not all(material.node_tree.nodes.get(node_name) is not None for node_name in node_names):
+            # Nodes were renamed (without changing the node count)
+            self.index_material(material)
+            node_names = list(self.group_nodes[material.name])
+        return [node_name for node_name in node_names if self.has_node(material, node_name)]
+
+    def has_node(self, material: bpy.types.Material, node_name: str) -> bool:
+        """Check if a material has a Beantextures node group instance with the given name. Checked on the material itself, so it's never stale."""
+        if not material.use_nodes or material.node_tree is None:
+            return False
+        node = material.node_tree.nodes.get(node_name)
+        return isinstance(node, bpy.types.ShaderNodeGroup) and node.node_tree is not None and node.node_tree.is_beantextures
+
+    def get_users(self, node_tree: bpy.types.NodeTree) -> set[tuple[str, str]]:
+        """Get the `(material name, node name)` of every instance of a node group. Entries of renamed or removed materials (and nodes) are left out; the whole index is only rebuilt when it's marked dirty."""
+        self.ensure()
+        users = set()
+        for material_name, node_name in self.users.get(node_tree.as_pointer(), set()):
+            material = bpy.data.materials.get(material_name)
+            node = material.node_tree.nodes.get(node_name) if material is not None and material.node_tree is not None else None
+            if isinstance(node, bpy.types.ShaderNodeGroup) and node.node_tree == node_tree:
+                users.add((material_name, node_name))
+        return users
+
+    def update(self, depsgraph: bpy.types.Depsgraph):
+        """Index the materials and node groups reported as updated by the depsgraph again."""
+        if self.dirty:
+            return
+
+        for update in depsgraph.updates:
+            data = update.id.original
+            if isinstance(data, bpy.types.Material):
+                self.index_material(data)
+            elif isinstance(data, bpy.types.NodeTree):
+                if not data.is_embedded_data:
+                    self.index_node_tree(data)
+                elif (owner_name := self.owners.get(data.as_pointer())) is not None and (material := bpy.data.materials.get(owner_name)) is not None:
+                    self.index_material(material)
+
+node_index = NodeIndex()
+
+@persistent
+def rebuild_node_index(*args):
+    node_index.rebuild()
+
+@persistent
+def invalidate_node_index(*args):
+    # Data may have moved in memory; rebuilt on first use
+    node_index.dirty = True
+    node_index.revision += 1
+
+@persistent
+def update_node_index(scene, depsgraph):
+    node_index.update(depsgraph)
+
+def register():
+    node_index.dirty = True
+    node_index.revision += 1
+    bpy.app.handlers.load_post.append(rebuild_node_index)
+    bpy.app.handlers.undo_post.append(invalidate_node_index)
+    bpy.app.handlers.redo_post.append(invalidate_node_index)
+    bpy.app.handlers.depsgraph_update_post.append(update_node_index)
+
+def unregister():
+    for handlers, handler in (
+        (bpy.app.handlers.load_post, rebuild_node_index),
+        (bpy.app.handlers.undo_post, invalidate_node_index),
+        (bpy.app.handlers.redo_post, invalidate_node_index),
+        (bpy.app.handlers.depsgraph_update_post, update_node_index),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
+    node_index.clear()
@@ -1,12 +1,15 @@
 """Operators used to configure connector items."""
 import bpy
 from bpy.types import Operator
-from .props import Btxs_ConnectorInstance, update_valid_nodes_list
+from .props import Btxs_ConnectorInstance, invalidate_connector_order
+from .node_index import node_index
 
 def add_new_connector_item(context, name: str) -> Btxs_ConnectorInstance:
     connector = context.active_bone.beantextures_connector
     item = connector.connectors.add()
     item.name = name
+    connector.next_uid += 1
+    item.uid = connector.next_uid
     item.menu_index = len(connector.connectors) - 1
     connector.active_connector_idx = len(connector.connectors) - 1
     return item
@@ -18,6 +21,7 @@ def remove_connector_item(context, idx: int):
         connector.active_connector_idx -= 1
 
     connector.connectors.remove(idx)
+    invalidate_connector_order()
 
 class BtxsOp_ConnectorOperator(Operator):
 
@@ -64,6 +68,7 @@ class BtxsOp_RemoveAllConnector(BtxsOp_ConnectorOperator):
     def execute(self, context):
         connector = context.active_bone.beantextures_connector
         connector.connectors.clear()
+        invalidate_connector_order()
         return {'FINISHED'}
 
     def draw(self, context):
@@ -75,35 +80,6 @@ class BtxsOp_RemoveAllConnector(BtxsOp_ConnectorOperator):
         bpy.context.area.tag_redraw()
         return wm.invoke_props_dialog(self)
 
-class BtxsOp_ReloadNodeNames(BtxsOp_ConnectorOperator):
-    """Reload available Beantextures node group instances"""
-    bl_label = "Reload List"
-    bl_idname = "beantextures.connector_reload_group_list"
-
-    def execute(self, context):
-        connector = context.active_bone.beantextures_connector
-        item = connector.connectors[connector.active_connector_idx]
-        update_valid_nodes_list(item, context)
-        item.node_is_valid = True if item.node_name in item.valid_nodes else False
-        return {'FINISHED'}
-
-class BtxsOp_ReloadAllNodeNames(BtxsOp_ConnectorOperator):
-    """Reload available Beantextures node group instances across all connector items"""
-    bl_label = "Reload List"
-    bl_idname = "beantextures.connector_reload_all_group_list"
-
-    @classmethod
-    def poll(cls, context):
-        return (super().poll(context)) and (len(context.active_bone.beantextures_connector.connectors) > 0)
-
-    def execute(self, context):
-        connector = context.active_bone.beantextures_connector
-        for item in connector.connectors:
-            update_valid_nodes_list(item, context)
-            item.node_is_valid = True if item.node_name in item.valid_nodes else False
-        return {'FINISHED'}
-
-
 class BtxsOp_ModifyNodeSelection(BtxsOp_ConnectorOperator):
     """Select a target material"""
     bl_label = "Set Target Material"
@@ -132,19 +108,28 @@ class BtxsOp_ModifyNodeSelection(BtxsOp_ConnectorOperator):
         # HACK: this doesn't seem right..
         return wm.invoke_popup(self)
         
+class BtxsOp_RefreshNodeIndex(BtxsOp_ConnectorOperator):
+    """Reload available Beantextures node group instances of all materials"""
+    bl_label = "Reload List"
+    bl_idname = "beantextures.connector_reload_group_list"
+
+    def execute(self, context):
+        node_index.rebuild()
+        invalidate_connector_order()
+        if context.area is not None:
+            context.area.tag_redraw()
+        return {'FINISHED'}
 
 def register():
     bpy.utils.register_class(BtxsOp_NewConnectorItem)
     bpy.utils.register_class(BtxsOp_RemoveSelectedConnectorItem)
     bpy.utils.register_class(BtxsOp_RemoveAllConnector)
     bpy.utils.register_class(BtxsOp_ModifyNodeSelection)
-    bpy.utils.register_class(BtxsOp_ReloadNodeNames)
-    bpy.utils.register_class(BtxsOp_ReloadAllNodeNames)
+    bpy.utils.register_class(BtxsOp_RefreshNodeIndex)
 
 def unregister():
     bpy.utils.unregister_class(BtxsOp_NewConnectorItem)
     bpy.utils.unregister_class(BtxsOp_RemoveSelectedConnectorItem)
     bpy.utils.unregister_class(BtxsOp_RemoveAllConnector)
     bpy.utils.unregister_class(BtxsOp_ModifyNodeSelection)
-    bpy.utils.unregister_class(BtxsOp_ReloadNodeNames)
-    bpy.utils.unregister_class(BtxsOp_ReloadAllNodeNames)
+    bpy.utils.unregister_class(BtxsOp_RefreshNodeIndex)
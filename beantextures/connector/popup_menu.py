@@ -1,34 +1,47 @@
 """Definition of popup menus used to display the `Value` input of a Beantextures node."""
 import bpy
 from bpy.types import UILayout
-from .props import Btxs_ConnectorInstance, update_valid_nodes_list
+from .props import Btxs_ConnectorInstance, get_connector_item, get_connector_order, resolve_connector_node
+
+def draw_connector_item(layout: UILayout, item: Btxs_ConnectorInstance, node: bpy.types.ShaderNodeGroup):
+    """Draw the control of a connector item's node: its enum property for enum nodes, otherwise its `Value` input."""
+    row = layout.row()
+    row.alignment = 'EXPAND'
+    row.label(text="", icon=item.icon)
+
+    if node.node_tree.beantextures_props.link_type == 'ENUM':
+        row.prop(node, "beantxs_enum_prop", text=item.name)
+    else:
+        row.prop(node.inputs["Value"], "default_value", icon=item.icon, text=item.name)
+
+def get_shown_connector_items(connector) -> list[tuple[int, Btxs_ConnectorInstance, bpy.types.ShaderNodeGroup]]:
+    """Get the shown connector items whose node exists (and has a `Value` input), sorted by `menu_index`, along with their indices and nodes."""
+    shown = []
+    items = connector.connectors
+    for idx in get_connector_order(connector)[0]:
+        item = items[idx]
+        if not item.show:
+            continue
+        node = resolve_connector_node(connector, item)
+        if node is not None and "Value" in node.inputs:
+            shown.append((idx, item, node))
+    return shown
 
 def list_draw(self, context, layout: UILayout, label: bool = False):
     layout = layout
     layout.use_property_split = True
     col = layout.column()
-    connector: list[Btxs_ConnectorInstance] = context.active_bone.beantextures_connector
-    connectors_sorted: list[Btxs_ConnectorInstance] = sorted(connector.connectors, key=lambda x: x.menu_index)
-    available = False
+    connector = context.active_bone.beantextures_connector
 
     if label:
         col.label(text="Beantextures Nodes Control")
         col.separator()
 
-    for item in connectors_sorted:
-        if (item.material is not None) and item.material.use_nodes and item.show:
-            if (item.node_name in item.material.node_tree.nodes) and ("Value" in item.material.node_tree.nodes[item.node_name].inputs):
-                available = True
-                row = col.row()
-                row.alignment = 'EXPAND'
-                row.label(text="", icon=item.icon)
+    shown = get_shown_connector_items(connector)
+    for _, item, node in shown:
+        draw_connector_item(col, item, node)
 
-                if item.material.node_tree.nodes[item.node_name].node_tree.beantextures_props.link_type == 'ENUM':
-                    row.prop(item.material.node_tree.nodes[item.node_name], "beantxs_enum_prop", text=item.name)
-                else:
-                    row.prop(item.material.node_tree.nodes[item.node_name].inputs["Value"], "default_value", icon=item.icon, text=item.name)
-
-    if not available:
+    if len(shown) == 0:
         col.label(text="No connector item available.", icon='INFO')
 
 
@@ -53,13 +66,6 @@ class BtxsOp_ListMenu(bpy.types.Operator):
         return {'FINISHED'}
 
     def invoke(self, context, event):
-        connector: list[Btxs_ConnectorInstance] = context.active_bone.beantextures_connector
-        try:
-            item = connector.connectors[connector.active_connector_idx]
-            update_valid_nodes_list(item, context)
-        except IndexError:
-            pass
-
         wm = context.window_manager
         bpy.context.area.tag_redraw()
 
@@ -72,6 +78,8 @@ class BtxsOp_PieMenuItem(bpy.types.Operator):
     bl_idname = "beantextures.show_pie_menu_item"
     bl_options = {'INTERNAL'}
 
+    uid: bpy.props.IntProperty()
+    # Only used if the uid doesn't identify the item (see `get_connector_item()`)
     idx: bpy.props.IntProperty()
 
     @classmethod
@@ -84,17 +92,15 @@ class BtxsOp_PieMenuItem(bpy.types.Operator):
     def draw(self, context):
         layout = self.layout
         layout.use_property_split = True
-        row = layout.row()
-        row.alignment = 'EXPAND'
         connector = context.active_bone.beantextures_connector
 
-        item = connector.connectors[self.idx]
+        item = get_connector_item(connector, self.uid, self.idx)
+        node = resolve_connector_node(connector, item) if item is not None else None
+        if node is None:
+            layout.label(text="Connector item is no longer available.", icon='ERROR')
+            return
 
-        row.label(text="", icon=item.icon)
-        if item.material.node_tree.nodes[item.node_name].node_tree.beantextures_props.link_type == 'ENUM':
-            row.prop(item.material.node_tree.nodes[item.node_name], "beantxs_enum_prop", text=item.name)
-        else:
-            row.prop(item.material.node_tree.nodes[item.node_name].inputs["Value"], "default_value", icon=item.icon, text=item.name)
+        draw_connector_item(layout, item, node)
 
     def execute(self, context):
         return {'FINISHED'}
@@ -121,20 +127,18 @@ class BtxsOp_PieMenu(bpy.types.Menu):
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
-        layout = layout
         layout.use_property_split = True
         connector = context.active_bone.beantextures_connector
-        connectors_sorted: list[Btxs_ConnectorInstance] = sorted(connector.connectors, key=lambda x: x.menu_index)
-        available = False
-
-        for item in connectors_sorted:
-            available = True
 
-            if (item.material is not None) and item.material.use_nodes and item.show and (item.node_name in item.material.node_tree.nodes) and ("Value" in item.material.node_tree.nodes[item.node_name].inputs):
-                pie.operator(BtxsOp_PieMenuItem.bl_idname, text=item.name, icon=item.icon).idx = connector.connectors.keys().index(item.name)
+        shown = get_shown_connector_items(connector)
+        for idx, item, _ in shown:
+            # Items are picked by uid, as names don't have to be unique
+            op = pie.operator(BtxsOp_PieMenuItem.bl_idname, text=item.name, icon=item.icon)
+            op.uid = item.uid
+            op.idx = idx
 
-        if not available:
-            col.label(text="No connector item available.", icon='INFO')
+        if len(shown) == 0:
+            pie.label(text="No connector item available.", icon='INFO')
 
 
 class BtxsOp_ShowMenu(bpy.types.Operator):
@@ -1,6 +1,9 @@
 """Custom properties for Beantexture's connector."""
+from collections import Counter
 import bpy
+from bpy.app.handlers import persistent
 from .icon_picker import ICONS
+from .node_index import node_index
 
 icons_enum: list[tuple[str, str, str, int]] = [
         (icon, icon.title(), icon.title(), i) for i, icon in enumerate(ICONS)
@@ -11,54 +14,153 @@ beantextures_connector_menu_types: list[tuple[str, str, str, int]] = [
         ('PIE', "Pie", "Pie menu listing all available connectors", 1)
 ]
 
-def generate_valid_nodes(material: bpy.types.Material) -> list[str]:
-    nodes = material.node_tree.nodes
-    return [node.name for node in nodes if (isinstance(node, bpy.types.ShaderNodeGroup) and node.node_tree.is_beantextures)]
+def search_node_names(self, context, edit_text: str) -> list[str]:
+    """Names of the Beantextures node group instances of the connector's material (see `NodeIndex`)."""
+    if self.material is None:
+        return []
+    return node_index.get_nodes(self.material)
 
-# FIXME: this is not executed periodically; only when the user changes the target material.
-# For now the solution is to have a dedicated operator used to refresh the list manually whenever
-# needed.
-def update_valid_nodes_list(self, context):
-    valid_nodes_list = self.valid_nodes
-    valid_nodes_list.clear()
-    if self.material is not None and self.material.use_nodes:
-        valid_nodes = generate_valid_nodes(self.material)
+def is_connector_valid(item) -> bool:
+    """Check if the node of a connector item exists (and is a Beantextures node group instance)."""
+    return item.material is not None and node_index.has_node(item.material, item.node_name)
 
-        for node_name in valid_nodes:
-            item = valid_nodes_list.add()
-            item.name = node_name
+# Changed whenever the order of connector items may have changed (any
+# `menu_index` edit, or items being added/removed), which invalidates
+# BTXS_CACHE_CONNECTOR_ORDER
+connector_order_revision = 0
 
-        self.node_is_valid = True if self.node_name in self.valid_nodes else False
+# Caches are keyed by armature and bone names instead of pointers, as bones are
+# reallocated whenever edit mode is left
 
-class Btxs_ConnectorValidNode(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty()
+# Sorted item indices of connectors by (armature name, connector path), as
+# (order revision, [item uid], [item index], {uid: item index})
+BTXS_CACHE_CONNECTOR_ORDER: dict[tuple[str, str], tuple[int, list[int], list[int], dict[int, int]]] = {}
+
+# Whether or not the node of a connector item exists, by (armature name,
+# connector path, uid), as (node index revision, material name, node name,
+# exists). Only names are kept; bpy objects may be freed in the meantime.
+BTXS_CACHE_CONNECTOR_NODES: dict[tuple[str, str, int], tuple[int, str, str, bool]] = {}
+
+def invalidate_connector_order(*args):
+    global connector_order_revision
+    connector_order_revision += 1
+
+def get_connector_key(connector) -> tuple[str, str]:
+    """Identify a connector by the name of its armature and its path (which holds the bone name)."""
+    return (connector.id_data.name, connector.path_from_id())
+
+def get_connector_order(connector) -> tuple[list[int], dict[int, int]]:
+    """Get the indices of the connector items sorted by `menu_index`, and the index of every item by uid. Only sorted again if the order may have changed."""
+    key = get_connector_key(connector)
+    items = connector.connectors
+    uids = [item.uid for item in items]
+    cached = BTXS_CACHE_CONNECTOR_ORDER.get(key)
+    if cached is not None and cached[0] == connector_order_revision and cached[1] == uids:
+        return (cached[2], cached[3])
+
+    order = sorted(range(len(items)), key=lambda idx: items[idx].menu_index)
+    # Items without a (unique) uid, e.g. on linked rigs saved by older
+    # versions, can only be found by index (see `get_connector_item()`)
+    uid_counts = Counter(uids)
+    by_uid = {uid: idx for idx, uid in enumerate(uids) if uid != 0 and uid_counts[uid] == 1}
+    BTXS_CACHE_CONNECTOR_ORDER[key] = (connector_order_revision, uids, order, by_uid)
+    return (order, by_uid)
+
+def get_connector_item(connector, uid: int, idx: int):
+    """Get a connector item by its uid, or by its index if the uid doesn't identify an item (it's zero or shared); `None` if there's no such item."""
+    by_uid = get_connector_order(connector)[1]
+    if uid in by_uid:
+        return connector.connectors[by_uid[uid]]
+    if 0 <= idx < len(connector.connectors) and connector.connectors[idx].uid == uid:
+        return connector.connectors[idx]
+    return None
+
+def resolve_connector_node(connector, item) -> bpy.types.ShaderNodeGroup | None:
+    """Get the Beantextures node group instance controlled by a connector item, or `None` if it doesn't exist. Its check is cached until the material is changed (see `NodeIndex.revision`)."""
+    material = item.material
+    if material is None or not material.use_nodes or material.node_tree is None:
+        return None
+
+    key = (*get_connector_key(connector), item.uid)
+    cached = BTXS_CACHE_CONNECTOR_NODES.get(key)
+    if cached is not None and cached[0] == node_index.revision and cached[1] == material.name and cached[2] == item.node_name:
+        exists = cached[3]
+    else:
+        exists = node_index.has_node(material, item.node_name)
+        BTXS_CACHE_CONNECTOR_NODES[key] = (node_index.revision, material.name, item.node_name, exists)
+
+    return material.node_tree.nodes.get(item.node_name) if exists else None
+
+def ensure_connector_uids(connector):
+    """Give connector items (e.g. from older files) that have no uid, or share it with another item, a new one."""
+    seen: set[int] = set()
+    for item in connector.connectors:
+        if item.uid == 0 or item.uid in seen:
+            connector.next_uid += 1
+            item.uid = connector.next_uid
+        seen.add(item.uid)
+
+@persistent
+def clear_connector_caches(*args):
+    BTXS_CACHE_CONNECTOR_ORDER.clear()
+    BTXS_CACHE_CONNECTOR_NODES.clear()
+
+@persistent
+def init_connectors(*args):
+    clear_connector_caches()
+    for armature in bpy.data.armatures:
+        # Linked data can't be written; its items are found by index instead
+        if armature.library is not None:
+            continue
+        for bone in armature.bones:
+            ensure_connector_uids(bone.beantextures_connector)
+
+def init_connectors_deferred():
+    # bpy.data can't be written while registering, so the already open file
+    # is initialized from a timer
+    init_connectors()
+    return None
 
 class Btxs_ConnectorInstance(bpy.types.PropertyGroup):
-    valid_nodes: bpy.props.CollectionProperty(type=Btxs_ConnectorValidNode)
-    material: bpy.props.PointerProperty(type=bpy.types.Material, name="Material Selection", description="Location of target node group instance", update=update_valid_nodes_list)
+    material: bpy.props.PointerProperty(type=bpy.types.Material, name="Material Selection", description="Location of target node group instance")
     name: bpy.props.StringProperty()
-    node_name: bpy.props.StringProperty(name="Node Name", description="A Beantextures node group instance to control", update=update_valid_nodes_list)
-    menu_index: bpy.props.IntProperty(name="Menu Index", description="Index of the connector item; will influence the order of the item when displayed")
+    node_name: bpy.props.StringProperty(name="Node Name", description="A Beantextures node group instance to control", search=search_node_names)
+    menu_index: bpy.props.IntProperty(name="Menu Index", description="Index of the connector item; will influence the order of the item when displayed", update=invalidate_connector_order)
+    uid: bpy.props.IntProperty(name="Unique ID", description="Identifies the connector item among the items of its bone, even if they share a name", options={'HIDDEN'})
     icon: bpy.props.EnumProperty(items=icons_enum, name="Icon", description="Icon used to identify the connector item", default='NODETREE')
     show: bpy.props.BoolProperty(name="Show on View3D Sidebar and Pop-up", default=True)
-    node_is_valid: bpy.props.BoolProperty(name="Whether or not the node under said name exists on the respecting material")
 
 class Btxs_Connector(bpy.types.PropertyGroup):
     connectors: bpy.props.CollectionProperty(type=Btxs_ConnectorInstance, name="Connector Items")
     active_connector_idx: bpy.props.IntProperty(name="Index of Active Connector Item")
     menu_type: bpy.props.EnumProperty(items=beantextures_connector_menu_types, name="Menu Type", default='LIST')
+    next_uid: bpy.props.IntProperty(name="Last Unique ID", description="Last uid given to a connector item of this bone", options={'HIDDEN'})
 
     # used by the pie popup menu 
     tmp_connector_idx: bpy.props.IntProperty()
 
 def register():
-    bpy.utils.register_class(Btxs_ConnectorValidNode)
     bpy.utils.register_class(Btxs_ConnectorInstance)
     bpy.utils.register_class(Btxs_Connector)
 
     bpy.types.Bone.beantextures_connector = bpy.props.PointerProperty(type=Btxs_Connector)
 
+    bpy.app.handlers.load_post.append(init_connectors)
+    bpy.app.handlers.undo_post.append(clear_connector_caches)
+    bpy.app.handlers.redo_post.append(clear_connector_caches)
+    bpy.app.timers.register(init_connectors_deferred, first_interval=0)
+
 def unregister():
-    bpy.utils.unregister_class(Btxs_ConnectorValidNode)
     bpy.utils.unregister_class(Btxs_ConnectorInstance)
     bpy.utils.unregister_class(Btxs_Connector)
+
+    for handlers, handler in (
+        (bpy.app.handlers.load_post, init_connectors),
+        (bpy.app.handlers.undo_post, clear_connector_caches),
+        (bpy.app.handlers.redo_post, clear_connector_caches),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
+    if bpy.app.timers.is_registered(init_connectors_deferred):
+        bpy.app.timers.unregister(init_connectors_deferred)
+    clear_connector_caches()
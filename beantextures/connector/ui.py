@@ -2,8 +2,8 @@
 import bpy
 from bpy.types import UIList
 from .icon_picker import ICONS, BtxsOp_IV_OT_icons_set
-from .ops import BtxsOp_ModifyNodeSelection, BtxsOp_ReloadAllNodeNames, BtxsOp_ReloadNodeNames
-from .props import update_valid_nodes_list
+from .ops import BtxsOp_ModifyNodeSelection, BtxsOp_RefreshNodeIndex
+from .props import is_connector_valid
 
 class BEANTEXTURES_UL_ConnectorItemsListRenderer(UIList):
     """
@@ -19,7 +19,7 @@ class BEANTEXTURES_UL_ConnectorItemsListRenderer(UIList):
 
             layout.prop(item, "name", text="", emboss=False)
 
-            if not item.node_is_valid:
+            if not is_connector_valid(item):
                 layout.label(text="", icon='ERROR')
 
             if item.show:
@@ -79,7 +79,7 @@ class Btxs_ConnectorItemsList(bpy.types.Panel):
         col.operator("beantextures.connector_remove", icon='REMOVE', text="")
         col.separator()
         col.operator("beantextures.connector_remove_all", icon='X', text="")
-        col.operator(BtxsOp_ReloadAllNodeNames.bl_idname, text="", icon='FILE_REFRESH')
+        col.operator(BtxsOp_RefreshNodeIndex.bl_idname, text="", icon='FILE_REFRESH')
 
         try:
             layout.use_property_split = True
@@ -89,8 +89,8 @@ class Btxs_ConnectorItemsList(bpy.types.Panel):
 
             col = layout.column()
             row = col.row(align=True)
-            row.prop_search(item, "node_name", item, "valid_nodes", text="Node", icon='NODE')
-            row.operator(BtxsOp_ReloadNodeNames.bl_idname, text="", icon='FILE_REFRESH')
+            row.prop(item, "node_name", text="Node", icon='NODE')
+            row.operator(BtxsOp_RefreshNodeIndex.bl_idname, text="", icon='FILE_REFRESH')
             row.operator(BtxsOp_ModifyNodeSelection.bl_idname, text="", icon='PREFERENCES')
             col.prop(item, "menu_index", text="Menu Index")
 
@@ -1,65 +1,273 @@
 """Operators used to generate node groups."""
+import re
+import json
+import hashlib
+import math
+import time
+import bisect
+import fnmatch
+from contextlib import contextmanager
 import bpy
 from bpy.types import Image, Operator, NodeTree, NodeGroupInput, NodeGroupOutput, NodeReroute, ShaderNodeMath, ShaderNodeTexImage, ShaderNodeMix
 from .props_settings import Btxs_ConfigEntry, Btxs_LinkItem
-from .ui_node_generator import check_warnings_general, check_warnings_int, check_warnings_enum, check_warnings_float, check_warnings_int_simple
+from .utils_image import ATLAS_MAX_SIZE, IMAGE_TAG_PROP, PackedAtlas, pack_images_to_atlas, pack_lookup_table, split_sequence_filepath
+from .connector.node_index import node_index
+from .ui_node_generator import collect_config_warnings
+from bpy_extras.io_utils import ExportHelper
+from . import bl_info
+from .utils_validation import is_range_empty, has_overlaps, get_validation_report
+
+# Node properties that only affect how the node tree looks in the editor
+LAYOUT_PROPS = {"location", "hide"}
+
+def values_equal(a, b) -> bool:
+    """Compare two property values; floats (and arrays of them, e.g. vectors and colors) are compared with a tolerance since Blender stores them in single precision."""
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-6)
+    if hasattr(a, "__len__") and hasattr(b, "__len__") and not isinstance(a, str) and not isinstance(b, str):
+        return len(a) == len(b) and all(values_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+def natural_sort_key(name: str) -> tuple[list[str | int], str]:
+    """Sort key for names with numbers in them, so that e.g. "2" comes before "10"."""
+    # Splitting by a captured pattern alternates between text and numbers,
+    # so parts at the same index always have the same type
+    return ([int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)], name)
+
+def get_longest_increasing_subsequence(values: list[int]) -> list[int]:
+    """Get the indices of (one of) the longest strictly increasing subsequence(s) of `values`, in O(N log N)."""
+    # Smallest last value (and its index) of increasing subsequences by length
+    tails: list[int] = []
+    tail_indices: list[int] = []
+    prev_indices: list[int] = [-1] * len(values)
+
+    for idx, value in enumerate(values):
+        length = bisect.bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_indices.append(idx)
+        else:
+            tails[length] = value
+            tail_indices[length] = idx
+        prev_indices[idx] = tail_indices[length - 1] if length > 0 else -1
+
+    indices: list[int] = []
+    idx = tail_indices[-1] if len(tail_indices) > 0 else -1
+    while idx != -1:
+        indices.append(idx)
+        idx = prev_indices[idx]
+    return indices[::-1]
+
+def get_graph_depth(node: NodeTree) -> int:
+    """Get the amount of nodes on the longest path through a node tree (which mustn't have cycles), in O(nodes + links)."""
+    successors: dict[str, list[str]] = {n.name: [] for n in node.nodes}
+    in_degrees = dict.fromkeys(successors, 0)
+    for link in node.links:
+        successors[link.from_node.name].append(link.to_node.name)
+        in_degrees[link.to_node.name] += 1
+
+    # Visit the nodes in topological order, so that a node's depth is final
+    # once it's visited
+    depths = dict.fromkeys(successors, 1)
+    queue = [name for name, in_degree in in_degrees.items() if in_degree == 0]
+    while len(queue) > 0:
+        name = queue.pop()
+        for successor in successors[name]:
+            depths[successor] = max(depths[successor], depths[name] + 1)
+            in_degrees[successor] -= 1
+            if in_degrees[successor] == 0:
+                queue.append(successor)
+
+    return max(depths.values(), default=0)
+
+def get_link_key(from_socket: bpy.types.NodeSocket, to_socket: bpy.types.NodeSocket) -> tuple[str, str, str, str]:
+    """Identify a link between two sockets by names that stay the same across node re-generations."""
+    return (from_socket.node.name, from_socket.identifier, to_socket.node.name, to_socket.identifier)
 
 class BtxsNodeTreeBuilder:
     """Base class for node tree builder. Link type-specific builders should derive this class and override some of the methods here as needed."""
     prev_mix_inputs_loc = (530, 470)
     prev_mix_nodes_loc = (1000, 0)
 
-    def __init__(self, config: Btxs_ConfigEntry):
+    # Whether or not the `Value` input only ever holds whole numbers
+    integer_value = True
+    # Socket type of the `Value` input
+    value_socket_type = 'NodeSocketInt'
+
+    def __init__(self, config: Btxs_ConfigEntry, incremental: bool = True, profile: bool = False):
+        # When incremental, nodes from a previous generation are re-used (by
+        # name) and only changed where needed, instead of building everything
+        # from scratch
+        self.incremental = incremental
+
+        # When profiling, the time of every generation phase (see `measure()`)
+        # and the depth of the resulting graph are recorded as well
+        self.profile = profile
+        self.phase_times: dict[str, float] = {}
+        self.graph_depth = 0
+
+        self.links_added = 0
+        self.links_removed = 0
+        self.sockets_added = 0
+        self.sockets_removed = 0
+        self.socket_moves = 0
+
+        self.claimed_nodes: set[str] = set()
+        self.claimed_links: set[tuple[str, str, str, str]] = set()
+        self.created_nodes: set[str] = set()
+        self.updated_nodes: set[str] = set()
+        self.removed_nodes_count = 0
+
+        # Things the generation did differently than asked, for the user to know about
+        self.warnings: list[str] = []
+
+        # Image texture nodes by (image, interpolation, projection, extension),
+        # so that links sharing an image also share its node
+        self.img_nodes: dict[tuple[int, str, str, str], ShaderNodeTexImage] = {}
+
+        # Math nodes shared between links (see `LINKLOOP_add_shared_math_nodes()`)
+        self.shared_nodes: dict[tuple, ShaderNodeMath] = {}
+
         self.generate(config)
 
+    @property
+    def touched_nodes_count(self) -> int:
+        return len(self.created_nodes) + len(self.updated_nodes - self.created_nodes) + self.removed_nodes_count
+
     def generate(self, config: Btxs_ConfigEntry):
         """Steps of building the node tree (abstracted)."""
+        with self.measure("total"):
+            with self.measure("prepare"):
+                # Mode that was actually used, as some modes fall back to the mix chain
+                self.generation_mode = config.generation_mode
+                self.share_comparisons = config.share_comparisons
+
+                if self.generation_mode == 'TREE' and not self.can_generate_tree(config):
+                    self.generation_mode = 'CHAIN'
+                elif self.generation_mode == 'ATLAS' and not self.prepare_atlas(config):
+                    self.generation_mode = 'CHAIN'
+                elif self.generation_mode == 'LOOKUP' and not self.prepare_lookup(config):
+                    self.generation_mode = 'CHAIN'
+                elif self.generation_mode == 'SEQUENCE' and not self.prepare_sequence(config):
+                    self.generation_mode = 'CHAIN'
+
+                # Images are baked into the atlas (and sequence) modes, so only the mix chain
+                # and the balanced tree can be shared
+                self.use_selector = config.share_node_group and self.generation_mode in ('CHAIN', 'TREE') and len(config.links) > 0
+
+                node = self.init_node_tree(config)
+
+            with self.measure("sockets"):
+                self.delete_redundant_sockets(config, node)
+                self.add_io_sockets(config, node)
+
+            with self.measure("build"):
+                group_in, group_out = self.add_io_nodes(node)
+                rerouter = self.add_maths_rerouter(node, group_in)
+
+                if self.use_selector:
+                    self.generate_instance(config, node, group_in, group_out, rerouter)
+                else:
+                    match self.generation_mode:
+                        case 'TREE':
+                            self.generate_tree(config, node, group_in, group_out, rerouter)
+                        case 'ATLAS':
+                            self.generate_atlas(config, node, group_in, group_out, rerouter)
+                        case 'LOOKUP':
+                            self.generate_lookup(config, node, group_in, group_out, rerouter)
+                        case 'SEQUENCE':
+                            self.generate_sequence(config, node, group_in, group_out, rerouter)
+                        case _:
+                            self.generate_chain(config, node, group_in, group_out, rerouter)
+
+                self.adjust_final_node_locations(group_in, rerouter)
+                self.setup_node_tree_attributes(config, node)
+
+            with self.measure("sort"):
+                self.sort_input_sockets(config, node)
+
+            with self.measure("cleanup"):
+                self.remove_unused_nodes(node)
+
+            # The orange texture tag for Beantextures node group
+            node.color_tag = 'TEXTURE'
+
+        if self.profile:
+            self.graph_depth = get_graph_depth(node)
+
+        self.node_count = len(node.nodes)
+        self.link_count = len(node.links)
+        self.store_stats(node)
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Add the time spent in the `with` block to a phase (only when profiling)."""
+        if not self.profile:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - start
+
+    def get_stats(self) -> dict:
+        """Get the statistics of the generation (JSON serializable); the keys match the properties of `Btxs_BuildStats`."""
+        stats = {
+            "generation_mode": self.generation_mode,
+            "profiled": self.profile,
+            "nodes_added": len(self.created_nodes),
+            "nodes_updated": len(self.updated_nodes - self.created_nodes),
+            "nodes_removed": self.removed_nodes_count,
+            "links_added": self.links_added,
+            "links_removed": self.links_removed,
+            "sockets_added": self.sockets_added,
+            "sockets_removed": self.sockets_removed,
+            "socket_moves": self.socket_moves,
+            "node_count": self.node_count,
+            "link_count": self.link_count,
+            "graph_depth": self.graph_depth,
+        }
+        for phase in ("total", "prepare", "sockets", "build", "node_creation", "link_creation", "sort", "cleanup"):
+            stats[phase + "_time"] = self.phase_times.get(phase, 0.0)
+        return stats
+
+    def store_stats(self, node: NodeTree):
+        """Keep the statistics on the node tree, as its last build statistics."""
+        build_stats = node.beantextures_props.last_build_stats
+        for key, value in self.get_stats().items():
+            setattr(build_stats, key, value)
+
+    def get_summary(self) -> str:
+        """Summarize the statistics for reports."""
+        summary = f"{self.touched_nodes_count} node(s) touched: {len(self.created_nodes)} added, {len(self.updated_nodes - self.created_nodes)} updated, {self.removed_nodes_count} removed; {self.links_added} link(s) and {self.sockets_added} socket(s) added"
+        if self.profile:
+            times = ", ".join(f"{phase} {self.phase_times.get(phase, 0.0) * 1000:.1f}" for phase in ("sockets", "build", "sort", "cleanup"))
+            summary += f"; depth {self.graph_depth}; took {self.phase_times['total'] * 1000:.1f} ms ({times} ms)"
+        return summary
+
+    def generate_chain(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, rerouter: NodeReroute):
+        """Link the mix nodes one after another; a later link overrides an earlier one when both match."""
         prev_mix_color_node: ShaderNodeMix | None = None # FIXME: python momen
         prev_mix_alpha_node: ShaderNodeMix | None = None # FIXME: python momen
         curr_mix_color_node = None
         curr_mix_alpha_node = None
 
-        node = self.init_node_tree(config)
-        self.add_io_sockets(config, node)
-        self.delete_redundant_sockets(config, node)
-        group_in, group_out = self.add_io_nodes(node)
-        rerouter = self.add_maths_rerouter(node, group_in)
-
         # Loop through all links
-        for link in config.links:
-            gt_node, lt_node, mult_node, self.prev_mix_inputs_loc = self.LINKLOOP_add_math_nodes(link, node, rerouter, self.prev_mix_inputs_loc)
+        for idx, link in enumerate(config.links):
+            match_node, self.prev_mix_inputs_loc = self.LINKLOOP_add_match_nodes(link, node, rerouter, self.get_link_range(config, idx, link), self.prev_mix_inputs_loc)
 
-            curr_mix_color_node, self.prev_mix_nodes_loc = self.LINKLOOP_add_mix_color_node(link, node, mult_node, self.prev_mix_nodes_loc)
+            curr_mix_color_node, self.prev_mix_nodes_loc = self.LINKLOOP_add_mix_color_node(link, node, match_node, self.prev_mix_nodes_loc)
             self.LINKLOOP_connect_previous_mix_color_node(node, curr_mix_color_node, prev_mix_color_node)
 
             if config.output_alpha:
-                curr_mix_alpha_node = self.LINKLOOP_add_mix_alpha_node(link, node, curr_mix_color_node, mult_node)
+                curr_mix_alpha_node = self.LINKLOOP_add_mix_alpha_node(link, node, curr_mix_color_node, match_node)
                 self.LINKLOOP_connect_previous_mix_alpha_node(node, curr_mix_alpha_node, prev_mix_alpha_node)
 
-            img_node: None | ShaderNodeTexImage = None
+            self.LINKLOOP_connect_link_inputs(config, link, node, group_in, curr_mix_color_node, curr_mix_alpha_node)
 
-            if link.img is None:
-                if not link.name in node.interface.items_tree:
-                    self.LINKLOOP_add_color_input_socket(link, node) 
-                self.LINKLOOP_connect_color_input_socket(link, node, group_in, curr_mix_color_node)
-
-                if config.output_alpha:
-                    # HACK: ↓ possibly unbound, but is guaranteed to be set if config.output_alpha is set to True
-                    if not link.name + "_alpha" in node.interface.items_tree:
-                        self.LINKLOOP_add_alpha_input_socket(node, link)
-                    self.LINKLOOP_connect_alpha_input_socket(link, node, group_in, curr_mix_alpha_node)
-            else:
-                img_node, self.prev_mix_inputs_loc = self.LINKLOOP_add_img(link, node, self.prev_mix_inputs_loc)
-                self.LINKLOOP_connect_image_to_mix_node(node, img_node, curr_mix_color_node)
-
-                if config.output_alpha:
-                    # HACK: ↓ possibly unbound, but is guaranteed to be set if config.output_alpha is set to True
-                    self.LINKLOOP_connect_image_alpha_to_mix_node(node, img_node, curr_mix_alpha_node) 
-
-                if config.input_vector:
-                    self.LINKLOOP_connect_vector_input_to_image_node(node, group_in, img_node)
-
-            if link == config.links[0]:
+            if idx == 0:
                 if config.fallback_img is None:
                     self.LINKLOOP_set_falback_color(curr_mix_color_node)
                     if config.output_alpha:
@@ -80,476 +288,1376 @@ class BtxsNodeTreeBuilder:
         if config.output_alpha:
             self.connect_last_alpha_mix_node(node, group_out, curr_mix_alpha_node)
 
-        self.adjust_final_node_locations(group_in, rerouter)
-        self.setup_node_tree_attributes(config, node)
-        self.sort_input_sockets(node)
+    def can_generate_tree(self, config: Btxs_ConfigEntry) -> bool:
+        """Check if the links can be selected with a balanced tree. Overlapping ranges rely on the order of the mix chain (last matching link wins), so they can't."""
+        ranges = [self.get_link_range(config, idx, link) for idx, link in enumerate(config.links)]
+        return not has_overlaps(ranges, self.integer_value)
+
+    def generate_tree(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, rerouter: NodeReroute):
+        """Give every link its own mix node (leaf) between the fallback and its image, then pick between the leaves with a binary tree of compare/mix nodes.
+        Links are sorted by their ranges; a tree node picks its right half when the value is greater than the lowest threshold of that half.
+        Ranges must not overlap (see `can_generate_tree()`).
+        """
+        fallback_img_node: ShaderNodeTexImage | None = None
+        if config.fallback_img is not None:
+            fallback_img_node = self.TREE_add_fallback_image(node, config.fallback_img)
+
+        # (greater than threshold, mix color node, mix alpha node) for every link that can be matched
+        leaves: list[tuple[float, ShaderNodeMix, ShaderNodeMix | None]] = []
+
+        for idx, link in enumerate(config.links):
+            link_range = self.get_link_range(config, idx, link)
+            if is_range_empty(link_range, self.integer_value):
+                continue
+
+            match_node, self.prev_mix_inputs_loc = self.LINKLOOP_add_match_nodes(link, node, rerouter, link_range, self.prev_mix_inputs_loc)
+            mix_color_node, _ = self.LINKLOOP_add_mix_color_node(link, node, match_node, (self.prev_mix_inputs_loc[0] + 200, self.prev_mix_inputs_loc[1] - 100))
+
+            mix_alpha_node: ShaderNodeMix | None = None
+            if config.output_alpha:
+                mix_alpha_node = self.LINKLOOP_add_mix_alpha_node(link, node, mix_color_node, match_node)
+
+            self.LINKLOOP_connect_link_inputs(config, link, node, group_in, mix_color_node, mix_alpha_node)
+
+            if fallback_img_node is None:
+                self.LINKLOOP_set_falback_color(mix_color_node)
+                if mix_alpha_node is not None:
+                    self.LINKLOOP_set_fallback_alpha(mix_alpha_node)
+            else:
+                self.connect(node, fallback_img_node.outputs['Color'], mix_color_node.inputs['A'])
+                if mix_alpha_node is not None:
+                    self.LINKLOOP_set_fallback_image_alpha(node, fallback_img_node, mix_alpha_node)
+
+            leaves.append((link_range[0], mix_color_node, mix_alpha_node))
+
+        leaves.sort(key=lambda leaf: leaf[0])
+
+        if len(leaves) == 0:
+            # No link can ever match; output the fallback, just like the mix chain does
+            self.prev_mix_nodes_loc = (self.prev_mix_inputs_loc[0] + 400, 0)
+            curr_mix_color_node, curr_mix_alpha_node = self.TREE_add_fallback_only(config, node, fallback_img_node)
+        else:
+            self.tree_depth = (len(leaves) - 1).bit_length()
+            self.prev_mix_nodes_loc = (self.prev_mix_inputs_loc[0] + 700 + self.tree_depth * 220, 0)
+            curr_mix_color_node, curr_mix_alpha_node = self.TREE_join_leaves(node, rerouter, leaves, 0, len(leaves), self.tree_depth)
+
+        self.connect_last_mix_color_nodes(node, group_out, curr_mix_color_node, self.prev_mix_nodes_loc)
+        if config.output_alpha:
+            self.connect_last_alpha_mix_node(node, group_out, curr_mix_alpha_node)
+
+    def prepare_atlas(self, config: Btxs_ConfigEntry) -> bool:
+        """Pack the images of all links into the node tree's atlas image. Only possible if every link has an image and its own index (see `get_link_lookup_index()`); returns whether or not it succeeded."""
+        if len(config.links) == 0:
+            return False
+
+        indices: list[int] = []
+        for idx, link in enumerate(config.links):
+            lookup_idx = self.get_link_lookup_index(config, idx, link)
+            if lookup_idx is None or link.img is None:
+                return False
+            indices.append(lookup_idx)
+
+        if len(set(indices)) != len(indices):
+            return False
+
+        # One cell for every index between the smallest and biggest one, so
+        # that the cell can be found by the value itself
+        self.atlas_min_idx = min(indices)
+        self.atlas_cell_count = max(indices) - self.atlas_min_idx + 1
+        cells: list[Image | None] = [None] * self.atlas_cell_count
+        for lookup_idx, link in zip(indices, config.links):
+            cells[lookup_idx - self.atlas_min_idx] = link.img
+
+        node: NodeTree = config.target_node_tree
+        packed = pack_images_to_atlas(cells, config.fallback_img, node.beantextures_props.atlas_img, name=node.name + "_atlas")
+        if packed is None:
+            return False
+
+        self.store_atlas(config, node, packed)
+        return True
+
+    def store_atlas(self, config: Btxs_ConfigEntry, node: NodeTree, packed: PackedAtlas):
+        """Keep a packed atlas image, and warn about what packing changed compared to sampling every image on its own."""
+        node.beantextures_props.atlas_img = packed.atlas
+        self.atlas_cols, self.atlas_rows = packed.cols, packed.rows
+
+        if len(packed.resized) > 0:
+            self.warnings.append(f"Resized {len(packed.resized)} image(s) to the atlas cell size ({', '.join(packed.resized[:5])}{', ...' if len(packed.resized) > 5 else ''}).")
+        if packed.mixed_color_data:
+            self.warnings.append("Color and non-color images are packed into one atlas image; non-color images may look off.")
+
+        # Cells always repeat (see `ATLAS_add_cell_sampler()`)
+        unsupported = sorted({link.image_node_properties.extension for link in config.links if link.image_node_properties.extension != 'REPEAT'})
+        if len(unsupported) > 0:
+            self.warnings.append(f"Image extension {', '.join(unsupported)} isn't supported by the atlas; images are repeated instead.")
+
+    def generate_atlas(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, rerouter: NodeReroute):
+        """Sample the atlas image (see `prepare_atlas()`) with a single image texture node. The value picks the atlas cell whose UV offset is added to the (wrapped) input UV.
+        Values without a cell use the fallback, just like the mix chain does.
+        """
+        x, y = self.prev_mix_inputs_loc[0], -200
+        link = config.links[0]
+
+        # ShaderNodeMath is a subclass of Node
+        idx_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "atlas_idx") # type: ignore
+        self.set_prop(idx_node, "operation", 'SUBTRACT')
+        self.set_prop(idx_node.inputs[1], "default_value", self.atlas_min_idx) # type: ignore
+        self.set_prop(idx_node, "location", (x, y))
+        self.connect(node, rerouter.outputs[0], idx_node.inputs[0])
+
+        img_node = self.ATLAS_add_cell_sampler(config, node, idx_node.outputs[0], (x + 200, y))
+
+        # in range: -1 < index < cell count
+        _, _, mult_node, _ = self.LINKLOOP_add_math_nodes(link, node, rerouter, (-1, self.atlas_cell_count), (x + 200, y - 20), name="atlas", value_socket=idx_node.outputs[0])
+
+        self.ATLAS_add_output(config, node, group_in, group_out, img_node, mult_node.outputs[0], (x + 1500, y))
+
+    def prepare_lookup(self, config: Btxs_ConfigEntry) -> bool:
+        """Pack every distinct linked image once into the node tree's atlas image, and map every whole number between the smallest and biggest matched value to its atlas cell with a lookup table image.
+        Overlapping ranges are resolved like the mix chain does (the last matching link wins). Only possible if the value is a whole number and every link has an image; returns whether or not it succeeded.
+        """
+        if not self.integer_value or len(config.links) == 0:
+            return False
+
+        # Atlas cell of every distinct image, by image pointer
+        cell_indices: dict[int, int] = {}
+        images: list[Image | None] = []
+        values: dict[int, int] = {}
+
+        for idx, link in enumerate(config.links):
+            if link.img is None:
+                return False
+
+            key = link.img.as_pointer()
+            if key not in cell_indices:
+                cell_indices[key] = len(images)
+                images.append(link.img)
+
+            gt, lt = self.get_link_range(config, idx, link)
+            # Rather fail early than enumerate a huge range that won't fit
+            # the lookup table anyway
+            if lt - gt - 1 > ATLAS_MAX_SIZE:
+                return False
+            for value in range(int(gt) + 1, int(lt)):
+                values[value] = cell_indices[key]
+
+        if len(values) == 0:
+            return False
+
+        self.lookup_min_value = min(values)
+        self.lookup_width = max(values) - self.lookup_min_value + 1
+        if self.lookup_width > ATLAS_MAX_SIZE:
+            return False
+
+        lookup_cells: list[int | None] = [None] * self.lookup_width
+        for value, cell in values.items():
+            lookup_cells[value - self.lookup_min_value] = cell
+
+        node: NodeTree = config.target_node_tree
+        packed = pack_images_to_atlas(images, None, node.beantextures_props.atlas_img, name=node.name + "_atlas")
+        if packed is None:
+            return False
+        self.store_atlas(config, node, packed)
+
+        lut = pack_lookup_table(lookup_cells, node.beantextures_props.lookup_img, name=node.name + "_lookup")
+        if lut is None:
+            return False
+        node.beantextures_props.lookup_img = lut
+
+        return True
+
+    def generate_lookup(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, rerouter: NodeReroute):
+        """Read the atlas cell of the value from the lookup table image (see `prepare_lookup()`), then sample the atlas image with a single image texture node.
+        The lookup table is transparent for values without a cell (and outside of it), which then use the fallback.
+        """
+        x, y = self.prev_mix_inputs_loc[0], -200
+
+        # Sample the middle of the value's pixel: (value - min + 0.5) / width
+        # ShaderNodeMath is a subclass of Node
+        u_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "lookup_u") # type: ignore
+        self.set_prop(u_node, "operation", 'MULTIPLY_ADD')
+        self.set_prop(u_node.inputs[1], "default_value", 1 / self.lookup_width) # type: ignore
+        self.set_prop(u_node.inputs[2], "default_value", (0.5 - self.lookup_min_value) / self.lookup_width) # type: ignore
+        self.set_prop(u_node, "location", (x, y))
+        self.connect(node, rerouter.outputs[0], u_node.inputs[0])
+
+        # ShaderNodeCombineXYZ is a subclass of Node
+        lookup_uv_node: bpy.types.ShaderNodeCombineXYZ = self.add_node(node, 'ShaderNodeCombineXYZ', "lookup_uv") # type: ignore
+        self.set_prop(lookup_uv_node.inputs['Y'], "default_value", 0.5) # type: ignore
+        self.set_prop(lookup_uv_node, "location", (x + 200, y))
+        self.connect(node, u_node.outputs[0], lookup_uv_node.inputs['X'])
+
+        # ShaderNodeTexImage is a subclass of Node
+        lut_node: bpy.types.ShaderNodeTexImage = self.add_node(node, 'ShaderNodeTexImage', "img_lookup") # type: ignore
+        self.set_prop(lut_node, "image", node.beantextures_props.lookup_img)
+        self.set_prop(lut_node, "location", (x + 400, y))
+        # No blending between neighbouring values, and transparent outside of the table
+        self.set_prop(lut_node, "interpolation", 'Closest')
+        self.set_prop(lut_node, "extension", 'CLIP')
+        self.set_prop(lut_node, "hide", True)
+        self.connect(node, lookup_uv_node.outputs[0], lut_node.inputs['Vector'])
+
+        # ShaderNodeSeparateColor is a subclass of Node
+        separate_node: bpy.types.ShaderNodeSeparateColor = self.add_node(node, 'ShaderNodeSeparateColor', "lookup_rgb") # type: ignore
+        self.set_prop(separate_node, "mode", 'RGB')
+        self.set_prop(separate_node, "location", (x + 600, y))
+        self.set_prop(separate_node, "hide", True)
+        self.connect(node, lut_node.outputs['Color'], separate_node.inputs[0])
+
+        # cell = red * 255 + green * 255 * 256 (see `pack_lookup_table()`)
+        # ShaderNodeMath is a subclass of Node
+        low_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "lookup_low") # type: ignore
+        self.set_prop(low_node, "operation", 'MULTIPLY')
+        self.set_prop(low_node.inputs[1], "default_value", 255) # type: ignore
+        self.set_prop(low_node, "location", (x + 800, y))
+        self.connect(node, separate_node.outputs['Red'], low_node.inputs[0])
+
+        # ShaderNodeMath is a subclass of Node
+        cell_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "lookup_cell") # type: ignore
+        self.set_prop(cell_node, "operation", 'MULTIPLY_ADD')
+        self.set_prop(cell_node.inputs[1], "default_value", 255 * 256) # type: ignore
+        self.set_prop(cell_node, "location", (x + 1000, y))
+        self.connect(node, separate_node.outputs['Green'], cell_node.inputs[0])
+        self.connect(node, low_node.outputs[0], cell_node.inputs[2])
+
+        # Get rid of precision errors of the 8-bit to float conversion
+        # ShaderNodeMath is a subclass of Node
+        round_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "lookup_round") # type: ignore
+        self.set_prop(round_node, "operation", 'ROUND')
+        self.set_prop(round_node, "location", (x + 1200, y))
+        self.connect(node, cell_node.outputs[0], round_node.inputs[0])
 
-        # The orange texture tag for Beantextures node group
-        node.color_tag = 'TEXTURE'
+        img_node = self.ATLAS_add_cell_sampler(config, node, round_node.outputs[0], (x + 1400, y))
+        self.ATLAS_add_output(config, node, group_in, group_out, img_node, lut_node.outputs['Alpha'], (x + 2700, y))
+
+    def prepare_sequence(self, config: Btxs_ConfigEntry) -> bool:
+        """Load the images of all links as one image sequence (the node tree's sequence image). Only possible if every link has its own index (see `get_link_lookup_index()`), the indices are contiguous,
+        and the link images are files on disk whose names only differ by a frame number that grows along with the index; returns whether or not it succeeded.
+        """
+        if len(config.links) == 0:
+            return False
+
+        frames: list[tuple[int, Image]] = []
+        for idx, link in enumerate(config.links):
+            lookup_idx = self.get_link_lookup_index(config, idx, link)
+            if lookup_idx is None or link.img is None:
+                return False
+            if link.img.source != 'FILE' or link.img.packed_file is not None or link.img.filepath == "":
+                return False
+            frames.append((lookup_idx, link.img))
+        frames.sort(key=lambda frame: frame[0])
+
+        first_split = split_sequence_filepath(bpy.path.abspath(frames[0][1].filepath, library=frames[0][1].library))
+        if first_split is None:
+            return False
+        head, first_number, tail = first_split
+        # Blender pads every frame number to the length of the first one
+        number_len = len(first_number)
+
+        for offset, (lookup_idx, img) in enumerate(frames):
+            split = split_sequence_filepath(bpy.path.abspath(img.filepath, library=img.library))
+            if lookup_idx != frames[0][0] + offset or split is None:
+                return False
+            if split != (head, str(int(first_number) + offset).zfill(number_len), tail):
+                return False
+
+        self.sequence_min_value = frames[0][0]
+        self.sequence_max_value = frames[-1][0]
+        # Frame offset that shows the file numbered `value + frame_delta`
+        self.sequence_frame_delta = int(first_number) - self.sequence_min_value
+
+        first_img = frames[0][1]
+        node: NodeTree = config.target_node_tree
+        sequence_img = node.beantextures_props.sequence_img
+        if sequence_img is None:
+            sequence_img = bpy.data.images.load(bpy.path.abspath(first_img.filepath, library=first_img.library), check_existing=False)
+            sequence_img.name = node.name + "_sequence"
+            sequence_img[IMAGE_TAG_PROP] = True
+            node.beantextures_props.sequence_img = sequence_img
+
+        if sequence_img.filepath != first_img.filepath:
+            sequence_img.filepath = first_img.filepath
+        if sequence_img.source != 'SEQUENCE':
+            sequence_img.source = 'SEQUENCE'
+        if sequence_img.colorspace_settings.name != first_img.colorspace_settings.name:
+            sequence_img.colorspace_settings.name = first_img.colorspace_settings.name
+        if sequence_img.alpha_mode != first_img.alpha_mode:
+            sequence_img.alpha_mode = first_img.alpha_mode
+
+        return True
+
+    def generate_sequence(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, rerouter: NodeReroute):
+        """Sample the sequence image (see `prepare_sequence()`) with a single image texture node, whose frame offset is driven by the value. Blender only loads the frame that is shown.
+        Image frames are picked on the CPU, not by the shader, so the driver reads the value of one instance of the node group (see `set_sequence_driver_target()`). Values without a link use the fallback, just like the mix chain does.
+        """
+        x, y = self.prev_mix_inputs_loc[0], -200
+        link = config.links[0]
+
+        # ShaderNodeTexImage is a subclass of Node
+        img_node: bpy.types.ShaderNodeTexImage = self.add_node(node, 'ShaderNodeTexImage', SEQUENCE_IMG_NODE_NAME) # type: ignore
+        self.set_prop(img_node, "image", node.beantextures_props.sequence_img)
+        self.set_prop(img_node, "location", (x + 200, y + 100))
+        self.set_prop(img_node, "interpolation", link.image_node_properties.interpolation)
+        self.set_prop(img_node, "projection", link.image_node_properties.projection)
+        self.set_prop(img_node, "extension", link.image_node_properties.extension)
+        if config.input_vector:
+            self.LINKLOOP_connect_vector_input_to_image_node(node, group_in, img_node)
+
+        # A single cyclic frame always shows frame 1 + offset, whatever the current scene frame is
+        image_user = img_node.image_user
+        for prop, value in (("frame_duration", 1), ("frame_start", 1), ("use_cyclic", True), ("use_auto_refresh", True)):
+            # Not `set_prop()`, as the image user isn't a node (or socket)
+            if getattr(image_user, prop) != value:
+                setattr(image_user, prop, value)
+                self.updated_nodes.add(img_node.name)
+
+        # Simple expressions (see Blender's driver documentation) don't need Python scripts to be allowed
+        # Clamped, so that no missing file is loaded for values without a link
+        expression = f"min(max(value, {self.sequence_min_value}), {self.sequence_max_value}) + {self.sequence_frame_delta - 1}"
+
+        fcurve = image_user.driver_add("frame_offset")
+        driver = fcurve.driver
+        if driver.type != 'SCRIPTED' or driver.expression != expression or len(driver.variables) != 1:
+            driver.type = 'SCRIPTED'
+            driver.expression = expression
+            while len(driver.variables) > 0:
+                driver.variables.remove(driver.variables[0])
+            driver.variables.new()
+            self.updated_nodes.add(img_node.name)
+
+        instance_count = set_sequence_driver_target(node, driver.variables[0])
+        if instance_count == 0:
+            self.warnings.append("The node group has no instances yet; the image sequence follows the default value until an instance is set (see 'Follow This Instance' in the node inspector).")
+        elif instance_count > 1:
+            self.warnings.append(f"All {instance_count} instances of the node group show the image of one of them.")
+
+        # in range: min - 1 < value < max + 1
+        _, _, mult_node, _ = self.LINKLOOP_add_math_nodes(link, node, rerouter, (self.sequence_min_value - 1, self.sequence_max_value + 1), (x + 200, y - 200), name="sequence")
+
+        self.ATLAS_add_output(config, node, group_in, group_out, img_node, mult_node.outputs[0], (x + 700, y))
+
+    def get_selector_signature(self, config: Btxs_ConfigEntry) -> str:
+        """Get a digest of everything that shapes the selector node group of a configuration (see `generate_instance()`); structurally identical configurations share it."""
+        ranges = [self.get_link_range(config, idx, link) for idx, link in enumerate(config.links)]
+        key = (config.linking_type, config.generation_mode, config.share_comparisons, config.output_alpha, tuple(self.get_value_range(config)), ranges)
+        return hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()
+
+    def generate_instance(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, rerouter: NodeReroute):
+        """Build the node tree as a thin wrapper around a selector node group, which holds the comparison and mix nodes and is shared by all structurally identical configurations (see `get_selector_node_tree()`).
+        The wrapper only holds the image texture nodes; their outputs (and the color inputs of links without an image) are passed to the selector's sockets, which are named after the link indices.
+        """
+        selector_tree = get_selector_node_tree(self, config)
+        # The selector may have fallen back to the mix chain
+        self.generation_mode = selector_tree.beantextures_props.last_build_stats.generation_mode or self.generation_mode
+
+        x, y = self.prev_mix_inputs_loc[0], self.prev_mix_inputs_loc[1]
+
+        # ShaderNodeGroup is a subclass of Node
+        selector_node: bpy.types.ShaderNodeGroup = self.add_node(node, 'ShaderNodeGroup', "selector") # type: ignore
+        self.set_prop(selector_node, "node_tree", selector_tree)
+        self.set_prop(selector_node, "location", (x + 400, 0))
+        selector_inputs = {socket.name: socket for socket in selector_node.inputs}
+        self.connect(node, rerouter.outputs[0], selector_inputs['Value'])
+
+        for idx, link in enumerate(config.links):
+            color_socket = selector_inputs[f"link_{idx}"]
+            alpha_socket = selector_inputs.get(f"link_{idx}_alpha")
+
+            if link.img is None:
+                # Links with reserved names don't get input sockets
+                if link.name in self.group_in_outputs:
+                    self.connect(node, self.group_in_outputs[link.name], color_socket)
+                if alpha_socket is not None and link.name + "_alpha" in self.group_in_outputs:
+                    self.connect(node, self.group_in_outputs[link.name + "_alpha"], alpha_socket)
+                continue
+
+            img_node, _ = self.LINKLOOP_add_img(link, node, (x, y))
+            self.connect(node, img_node.outputs['Color'], color_socket)
+            if alpha_socket is not None:
+                self.connect(node, img_node.outputs['Alpha'], alpha_socket)
+            if config.input_vector:
+                self.LINKLOOP_connect_vector_input_to_image_node(node, group_in, img_node)
+            y -= 40
+
+        if config.fallback_img is None:
+            self.set_prop(selector_inputs['fallback'], "default_value", (0, 0, 0, 1)) # type: ignore
+            if config.output_alpha:
+                self.set_prop(selector_inputs['fallback_alpha'], "default_value", 0.0) # type: ignore
+        else:
+            fallback_img_node = self.TREE_add_fallback_image(node, config.fallback_img)
+            self.connect(node, fallback_img_node.outputs['Color'], selector_inputs['fallback'])
+            if config.output_alpha:
+                self.connect(node, fallback_img_node.outputs['Alpha'], selector_inputs['fallback_alpha'])
+            if config.input_vector:
+                self.LINKLOOP_connect_vector_input_to_image_node(node, group_in, fallback_img_node)
+
+        self.prev_mix_inputs_loc = (x, y)
+        self.prev_mix_nodes_loc = (x + 400, 0)
+        self.set_prop(group_out, "location", (x + 650, 0))
+        self.connect(node, selector_node.outputs['Image'], group_out.inputs['Image'])
+        if config.output_alpha:
+            self.connect(node, selector_node.outputs['Alpha'], group_out.inputs['Alpha'])
+
+    ##### Methods shared by the texture atlas and lookup table modes #####
+    def ATLAS_add_cell_sampler(self, config: Btxs_ConfigEntry, node: NodeTree, cell_socket: bpy.types.NodeSocket, location: tuple[int, int]) -> ShaderNodeTexImage:
+        """Add the nodes sampling the atlas image at the cell whose index comes from `cell_socket`. Returns the atlas image texture node."""
+        x, y = location
+        link = config.links[0]
+
+        # ShaderNodeMath is a subclass of Node
+        col_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "atlas_col") # type: ignore
+        self.set_prop(col_node, "operation", 'MODULO')
+        self.set_prop(col_node.inputs[1], "default_value", self.atlas_cols) # type: ignore
+        self.set_prop(col_node, "location", (x, y))
+        self.connect(node, cell_socket, col_node.inputs[0])
+
+        # ShaderNodeMath is a subclass of Node
+        div_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "atlas_div") # type: ignore
+        self.set_prop(div_node, "operation", 'DIVIDE')
+        self.set_prop(div_node.inputs[1], "default_value", self.atlas_cols) # type: ignore
+        self.set_prop(div_node, "location", (x, y - 170))
+        self.connect(node, cell_socket, div_node.inputs[0])
+
+        # ShaderNodeMath is a subclass of Node
+        row_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "atlas_row") # type: ignore
+        self.set_prop(row_node, "operation", 'FLOOR')
+        self.set_prop(row_node, "location", (x + 200, y - 170))
+        self.connect(node, div_node.outputs[0], row_node.inputs[0])
+
+        # ShaderNodeCombineXYZ is a subclass of Node
+        offset_node: bpy.types.ShaderNodeCombineXYZ = self.add_node(node, 'ShaderNodeCombineXYZ', "atlas_offset") # type: ignore
+        self.set_prop(offset_node, "location", (x + 400, y))
+        self.connect(node, col_node.outputs[0], offset_node.inputs['X'])
+        self.connect(node, row_node.outputs[0], offset_node.inputs['Y'])
+
+        if config.input_vector:
+            uv_socket = self.group_in_outputs['Vector']
+        else:
+            # ShaderNodeTexCoord is a subclass of Node
+            uv_node: bpy.types.ShaderNodeTexCoord = self.add_node(node, 'ShaderNodeTexCoord', "atlas_uv") # type: ignore
+            self.set_prop(uv_node, "location", (x + 200, y + 300))
+            uv_socket = uv_node.outputs['UV']
+
+        # Wrap the UV, as every cell behaves like a repeating image
+        # ShaderNodeVectorMath is a subclass of Node
+        wrap_node: bpy.types.ShaderNodeVectorMath = self.add_node(node, 'ShaderNodeVectorMath', "atlas_wrap") # type: ignore
+        self.set_prop(wrap_node, "operation", 'FRACTION')
+        self.set_prop(wrap_node, "location", (x + 400, y + 200))
+        self.connect(node, uv_socket, wrap_node.inputs[0])
+
+        # ShaderNodeVectorMath is a subclass of Node
+        sum_node: bpy.types.ShaderNodeVectorMath = self.add_node(node, 'ShaderNodeVectorMath', "atlas_add") # type: ignore
+        self.set_prop(sum_node, "operation", 'ADD')
+        self.set_prop(sum_node, "location", (x + 600, y + 100))
+        self.connect(node, wrap_node.outputs[0], sum_node.inputs[0])
+        self.connect(node, offset_node.outputs[0], sum_node.inputs[1])
+
+        # ShaderNodeVectorMath is a subclass of Node
+        scale_node: bpy.types.ShaderNodeVectorMath = self.add_node(node, 'ShaderNodeVectorMath', "atlas_scale") # type: ignore
+        self.set_prop(scale_node, "operation", 'MULTIPLY')
+        self.set_prop(scale_node.inputs[1], "default_value", (1 / self.atlas_cols, 1 / self.atlas_rows, 1.0)) # type: ignore
+        self.set_prop(scale_node, "location", (x + 800, y + 100))
+        self.connect(node, sum_node.outputs[0], scale_node.inputs[0])
+
+        # ShaderNodeTexImage is a subclass of Node
+        img_node: bpy.types.ShaderNodeTexImage = self.add_node(node, 'ShaderNodeTexImage', "img_atlas") # type: ignore
+        self.set_prop(img_node, "image", node.beantextures_props.atlas_img)
+        self.set_prop(img_node, "location", (x + 1000, y + 100))
+        # Note: linear (or smarter) interpolation may bleed neighbouring cells at the edges
+        self.set_prop(img_node, "interpolation", link.image_node_properties.interpolation)
+        self.set_prop(img_node, "projection", link.image_node_properties.projection)
+        self.set_prop(img_node, "extension", 'EXTEND')
+        self.connect(node, scale_node.outputs[0], img_node.inputs['Vector'])
+
+        return img_node
+
+    def ATLAS_add_output(self, config: Btxs_ConfigEntry, node: NodeTree, group_in: NodeGroupInput, group_out: NodeGroupOutput, img_node: ShaderNodeTexImage, factor_socket: bpy.types.NodeSocket, location: tuple[int, int]):
+        """Mix the atlas image with the fallback by `factor_socket` (1 where the value has a cell), and connect the result to the outputs."""
+        # ShaderNodeMix is a subclass of Node
+        mix_color_node: bpy.types.ShaderNodeMix = self.add_node(node, 'ShaderNodeMix', "mix_atlas") # type: ignore
+        self.set_prop(mix_color_node, "data_type", 'RGBA')
+        self.set_prop(mix_color_node, "location", location)
+        self.set_prop(mix_color_node, "hide", True)
+        self.connect(node, factor_socket, mix_color_node.inputs[0])
+        self.LINKLOOP_connect_image_to_mix_node(node, img_node, mix_color_node)
+
+        mix_alpha_node: bpy.types.ShaderNodeMix | None = None
+        if config.output_alpha:
+            # ShaderNodeMix is a subclass of Node
+            mix_alpha_node = self.add_node(node, 'ShaderNodeMix', "mix_alpha_atlas") # type: ignore
+            self.set_prop(mix_alpha_node, "hide", True)
+            self.set_prop(mix_alpha_node, "data_type", 'FLOAT')
+            self.set_prop(mix_alpha_node, "location", (location[0], location[1] - 45))
+            self.connect(node, factor_socket, mix_alpha_node.inputs[0])
+            self.LINKLOOP_connect_image_alpha_to_mix_node(node, img_node, mix_alpha_node)
+
+        if config.fallback_img is None:
+            self.LINKLOOP_set_falback_color(mix_color_node)
+            if mix_alpha_node is not None:
+                self.LINKLOOP_set_fallback_alpha(mix_alpha_node)
+        else:
+            fallback_img_node = self.LINKLOOP_set_fallback_image(node, config.fallback_img, mix_color_node)
+            if config.input_vector:
+                self.LINKLOOP_connect_vector_input_to_image_node(node, group_in, fallback_img_node)
+            if mix_alpha_node is not None:
+                self.LINKLOOP_set_fallback_image_alpha(node, fallback_img_node, mix_alpha_node)
+
+        self.prev_mix_nodes_loc = mix_color_node.location
+        self.connect_last_mix_color_nodes(node, group_out, mix_color_node, self.prev_mix_nodes_loc)
+        if config.output_alpha:
+            self.connect_last_alpha_mix_node(node, group_out, mix_alpha_node)
+
+    def get_link_range(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> tuple[float, float]:
+        """Get the `(greater than, less than)` thresholds a value has to be between for the link to be active."""
+        return (link.int_simple_val - 1, link.int_simple_val + 1)
+
+    def get_link_lookup_index(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> int | None:
+        """Get the single value that activates the link, or `None` if the linking type uses ranges."""
+        return link.int_simple_val
 
     def adjust_final_node_locations(self, group_in, rerouter):
-        rerouter.location = (rerouter.location[0], (self.prev_mix_inputs_loc[1] - 360) // 2)
-        group_in.location = (group_in.location[0], (self.prev_mix_inputs_loc[1] - 290) // 2)
+        self.set_prop(rerouter, "location", (rerouter.location[0], (self.prev_mix_inputs_loc[1] - 360) // 2))
+        self.set_prop(group_in, "location", (group_in.location[0], (self.prev_mix_inputs_loc[1] - 290) // 2))
+
+    def add_node(self, node: NodeTree, node_type: str, name: str) -> bpy.types.Node:
+        """Get the node named `name` left by a previous generation, or add a new one if there's none (of the same type).
+        Nodes that aren't requested during a generation are removed at the end of it (see `remove_unused_nodes()`)."""
+        existing_node = node.nodes.get(name)
+
+        if existing_node is not None and name not in self.claimed_nodes:
+            if existing_node.bl_idname == node_type:
+                self.claimed_nodes.add(name)
+                return existing_node
+
+            node.nodes.remove(existing_node)
+            self.removed_nodes_count += 1
+            # Its links went with it; the new node has to be connected again
+            self.existing_links = {key for key in self.existing_links if name not in (key[0], key[2])}
+
+        # Note: name may still be taken (e.g. links with similar names), in
+        # which case Blender gives the node a unique name.
+        with self.measure("node_creation"):
+            new_node = node.nodes.new(node_type)
+            new_node.name = name
+        self.claimed_nodes.add(new_node.name)
+        self.created_nodes.add(new_node.name)
+        return new_node
+
+    def set_prop(self, target, prop: str, value):
+        """Set a property of a node (or one of its sockets), only if its value would actually change."""
+        if values_equal(getattr(target, prop), value):
+            return
+
+        setattr(target, prop, value)
+
+        if prop not in LAYOUT_PROPS:
+            self.updated_nodes.add(target.name if isinstance(target, bpy.types.Node) else target.node.name)
+
+    def connect(self, node: NodeTree, from_socket: bpy.types.NodeSocket, to_socket: bpy.types.NodeSocket):
+        """Link two sockets, only if they aren't linked already. Links that aren't requested during a generation are removed at the end of it."""
+        key = get_link_key(from_socket, to_socket)
+        self.claimed_links.add(key)
+
+        if key not in self.existing_links:
+            with self.measure("link_creation"):
+                node.links.new(from_socket, to_socket)
+            self.links_added += 1
+            self.updated_nodes.add(to_socket.node.name)
+
+    def remove_unused_nodes(self, node: NodeTree):
+        """Remove nodes and links left by a previous generation that are no longer needed."""
+        for unused_link in [l for l in node.links if get_link_key(l.from_socket, l.to_socket) not in self.claimed_links]:
+            self.updated_nodes.add(unused_link.to_node.name)
+            node.links.remove(unused_link)
+            self.links_removed += 1
+
+        unused_nodes = [n for n in node.nodes if n.name not in self.claimed_nodes]
+
+        # Drivers (e.g. of the image sequence node) outlive their node otherwise
+        if node.animation_data is not None and len(unused_nodes) > 0:
+            prefixes = tuple(f"nodes[\"{bpy.utils.escape_identifier(n.name)}\"]" for n in unused_nodes)
+            for fcurve in [f for f in node.animation_data.drivers if f.data_path.startswith(prefixes)]:
+                node.animation_data.drivers.remove(fcurve)
+
+        for unused_node in unused_nodes:
+            node.nodes.remove(unused_node)
+            self.removed_nodes_count += 1
 
     def init_node_tree(self, config) -> NodeTree:
-        """Clear node tree and mark it as a Beantextures-generated node tree."""
+        """Clear node tree (if not generating incrementally) and mark it as a Beantextures-generated node tree."""
         node: NodeTree = config.target_node_tree
-        node.nodes.clear()
+        if not self.incremental:
+            node.nodes.clear()
+
+        self.existing_links = {get_link_key(l.from_socket, l.to_socket) for l in node.links}
+
         node.is_beantextures = True # type: ignore
         node.beantextures_props.link_type = config.linking_type
         return node
 
-    def add_io_sockets(self, config, node: NodeTree):
-        """Add the base input and output sockets for the node tree. Only adds the sockets when they don't exist already, so that the user doesn't have to reconnect nodes themselves."""
-        if not 'Image' in node.interface.items_tree:
-            node.interface.new_socket("Image", in_out='OUTPUT', socket_type='NodeSocketColor')
+    def get_value_range(self, config: Btxs_ConfigEntry) -> tuple[float, float]:
+        """Get the `(min, max)` of the `Value` input socket."""
+        return (config.int_min, config.int_max)
 
+    def get_expected_sockets(self, config: Btxs_ConfigEntry) -> dict[str, tuple[str, str]]:
+        """Get every socket the node tree interface should have, as `{name: (in_out, socket_type)}`."""
+        sockets = {"Image": ('OUTPUT', 'NodeSocketColor')}
         if config.output_alpha:
-            if not 'Alpha' in node.interface.items_tree: 
-                node.interface.new_socket("Alpha", in_out='OUTPUT', socket_type='NodeSocketFloat')
-        elif 'Alpha' in node.interface.items_tree:
-            node.interface.remove(node.interface.items_tree['Alpha'])
-
+            sockets["Alpha"] = ('OUTPUT', 'NodeSocketFloat')
         if config.input_vector:
-            if not 'Vector' in node.interface.items_tree: 
-                node.interface.new_socket("Vector", in_out='INPUT', socket_type='NodeSocketVector')
-        elif 'Vector' in node.interface.items_tree:
-            node.interface.remove(node.interface.items_tree['Vector'])
-
-        if not 'Value' in node.interface.items_tree:
-            node.interface.new_socket("Value", in_out='INPUT', socket_type='NodeSocketInt')
-        elif not isinstance(node.interface.items_tree['Value'], bpy.types.NodeTreeInterfaceSocketInt):
-            node.interface.remove(node.interface.items_tree['Value'])
-            node.interface.new_socket("Value", in_out='INPUT', socket_type='NodeSocketInt')
+            sockets["Vector"] = ('INPUT', 'NodeSocketVector')
+        sockets["Value"] = ('INPUT', self.value_socket_type)
 
-        node.interface.items_tree['Value'].min_value = config.int_min # type: ignore
-        node.interface.items_tree['Value'].max_value = config.int_max # type: ignore
+        # Links without an image get color (and alpha) input sockets instead.
+        # Base sockets win over links with reserved names.
+        for link in config.links:
+            if link.img is not None:
+                continue
+            sockets.setdefault(link.name, ('INPUT', 'NodeSocketColor'))
+            if config.output_alpha:
+                sockets.setdefault(link.name + "_alpha", ('INPUT', 'NodeSocketFloat'))
 
+        return sockets
 
     def delete_redundant_sockets(self, config: Btxs_ConfigEntry, node: NodeTree):
-        """Delete input sockets other than the important ones, as this can be problematic with node re-generation."""
-        items = [i.name for i in node.interface.items_tree]
-        for i in items:
-            idx_to_del = node.interface.items_tree.find(i)
-
-            # FIXME: convoluted logic
-
-            # if valid index
-            if idx_to_del != -1:
-                obj_to_del = node.interface.items_tree[idx_to_del]
-
-                # if is alpha socket
-                if i in [c.name + "_alpha" for c in config.links]:
-                    # but configured to not output alpha
-                    if not config.output_alpha:
-                        node.interface.remove(obj_to_del)
-                        continue
-                    # configured to output alpha, so all good
-                    else:
-                        continue
-
-                # other cases
-                if not (idx_to_del == -1 or i == 'Value' or i == 'Image' or i == 'Alpha' or i == 'Vector' or (i in [*[c.name for c in config.links]])): # type: ignore
-                    node.interface.remove(obj_to_del)
-
-    def sort_input_sockets(self, node: NodeTree):
-        offset = len([i for i in node.interface.items_tree if i.in_out == 'OUTPUT'])
-        to_sort = sorted([i.name for i in node.interface.items_tree if i.in_out == 'INPUT' and not(i.name == 'Value' or i.name == 'Vector')], reverse=True)
-
-        # FIXME: i have no idea why i can't just move to the target index I
-        # want. it doesn't do the trick for me, so i keep putting them to the
-        # first index available instead.
-        for socket_name in to_sort:
-            idx_to_sort = node.interface.items_tree.find(socket_name)
-            if idx_to_sort != -1:
-                obj_to_move = node.interface.items_tree[idx_to_sort]
-                node.interface.move(obj_to_move, offset)
-
-        if 'Vector' in node.interface.items_tree:
-            node.interface.move(node.interface.items_tree['Vector'], offset)
-
-        if 'Value' in node.interface.items_tree:
-            node.interface.move(node.interface.items_tree['Value'], offset)
+        """Delete interface items that aren't expected (see `get_expected_sockets()`) or have the wrong direction/type, in a single pass, as they can be problematic with node re-generation.
+        The sockets that are kept are indexed by name in `self.sockets`."""
+        self.expected_sockets = self.get_expected_sockets(config)
+        self.sockets: dict[str, bpy.types.NodeTreeInterfaceSocket] = {}
+
+        for item in list(node.interface.items_tree):
+            expected = self.expected_sockets.get(item.name)
+            # Duplicates (by name) of a kept socket are deleted as well
+            if item.item_type == 'SOCKET' and expected == (item.in_out, item.socket_type) and item.name not in self.sockets:
+                self.sockets[item.name] = item
+            else:
+                node.interface.remove(item)
+                self.sockets_removed += 1
+
+    def new_socket(self, node: NodeTree, name: str, in_out: str, socket_type: str) -> bpy.types.NodeTreeInterfaceSocket:
+        """Add a socket to the node tree interface (and to `self.sockets`)."""
+        socket = node.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+        self.sockets[name] = socket
+        self.sockets_added += 1
+        return socket
+
+    def add_io_sockets(self, config, node: NodeTree):
+        """Add the base input and output sockets for the node tree, as well as the input sockets of links without an image. Only adds the sockets when they don't exist already, so that the user doesn't have to reconnect nodes themselves."""
+        for name in ("Image", "Alpha", "Vector", "Value"):
+            if name in self.expected_sockets and name not in self.sockets:
+                in_out, socket_type = self.expected_sockets[name]
+                self.new_socket(node, name, in_out, socket_type)
+
+        value_min, value_max = self.get_value_range(config)
+        self.sockets['Value'].min_value = value_min # type: ignore
+        self.sockets['Value'].max_value = value_max # type: ignore
+
+        for link in config.links:
+            if link.img is not None:
+                continue
+            if not link.name in self.sockets:
+                self.LINKLOOP_add_color_input_socket(link, node)
+            if config.output_alpha and not link.name + "_alpha" in self.sockets:
+                self.LINKLOOP_add_alpha_input_socket(node, link)
+
+    def get_input_socket_order(self, config: Btxs_ConfigEntry, names: list[str]) -> list[str]:
+        """Get the target order of input sockets: `Value`, `Vector`, then the rest sorted by name (see `socket_sort_mode` of configs)."""
+        fixed = [name for name in ("Value", "Vector") if name in names]
+        others = [name for name in names if name not in ("Value", "Vector")]
+        return fixed + sorted(others, key=natural_sort_key if config.socket_sort_mode == 'NATURAL' else None)
+
+    def sort_input_sockets(self, config: Btxs_ConfigEntry, node: NodeTree):
+        """Sort the input sockets (see `get_input_socket_order()`) with as few moves as possible: the longest run of sockets that are already in order stays in place, and every other socket is moved right after the socket that should precede it."""
+        items = list(node.interface.items_tree)
+        inputs = {item.name: item for item in items if item.in_out == 'INPUT'}
+        names = list(inputs.keys())
+        target = self.get_input_socket_order(config, names)
+        if names == target:
+            return
+
+        # Outputs always come before inputs
+        offset = len(items) - len(inputs)
+        target_idx = {name: idx for idx, name in enumerate(target)}
+        in_place = {names[idx] for idx in get_longest_increasing_subsequence([target_idx[name] for name in names])}
+
+        # Current order of the inputs, kept in sync with the moves
+        order = names
+        for idx, name in enumerate(target):
+            if name in in_place:
+                continue
+
+            # interface.move() inserts the item before the one at the given
+            # position, as counted before the item is taken out
+            prev_idx = order.index(target[idx - 1]) if idx > 0 else -1
+            node.interface.move(inputs[name], offset + prev_idx + 1)
+            self.socket_moves += 1
+
+            order.remove(name)
+            order.insert(order.index(target[idx - 1]) + 1 if idx > 0 else 0, name)
 
     def add_io_nodes(self, node: NodeTree) -> tuple[NodeGroupInput, NodeGroupOutput]:
         """Add the Group Input and Group Output nodes to the node tree."""
 
         # Note: using NodeGroupInput and NodeGroupOutput confuses my pyright, but
         # bpy.types.NodeGroupInput is actually derived from bpy.types.Node.
-        group_in: NodeGroupInput = node.nodes.new('NodeGroupInput') # type: ignore
-        group_in.location = (0, 0)
-        group_in.name = "group_in"
+        group_in: NodeGroupInput = self.add_node(node, 'NodeGroupInput', "group_in") # type: ignore
+        self.set_prop(group_in, "location", (0, 0))
 
-        group_out: NodeGroupOutput = node.nodes.new('NodeGroupOutput') # type: ignore
-        group_out.location = (1000, 0)
-        group_out.name = "group_out"
+        group_out: NodeGroupOutput = self.add_node(node, 'NodeGroupOutput', "group_out") # type: ignore
+        self.set_prop(group_out, "location", (1000, 0))
+
+        # Looking sockets up by name goes through every socket, so index them
+        self.group_in_outputs: dict[str, bpy.types.NodeSocket] = {socket.name: socket for socket in group_in.outputs}
 
         return (group_in, group_out)
 
     def add_maths_rerouter(self, node: NodeTree, group_in_node: NodeGroupInput) -> NodeReroute:
         """Add the reroute node to clear up our node tree network."""
 
-        # Again, NodeReroute is a subclass of bpy.types.Node. node.nodes.new() returns bpy.types.Node.
-        maths_reroute_node: NodeReroute = node.nodes.new('NodeReroute') # type: ignore
-        maths_reroute_node.location = (group_in_node.location[0] + 200, group_in_node.location[1] - 35)
+        # Again, NodeReroute is a subclass of bpy.types.Node. self.add_node() returns bpy.types.Node.
+        maths_reroute_node: NodeReroute = self.add_node(node, 'NodeReroute', "maths_reroute") # type: ignore
+        self.set_prop(maths_reroute_node, "location", (group_in_node.location[0] + 200, group_in_node.location[1] - 35))
 
-        node.links.new(group_in_node.outputs['Value'], maths_reroute_node.inputs[0])
+        self.connect(node, self.group_in_outputs['Value'], maths_reroute_node.inputs[0])
         return maths_reroute_node
 
     ##### Methods used for the link loop (for link in config.links) #####
-    def LINKLOOP_add_math_nodes(self, link: Btxs_LinkItem, node: NodeTree, maths_reroute_node: NodeReroute, prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeMath, ShaderNodeMath, ShaderNodeMath, tuple[int, int]]:
+    def LINKLOOP_add_match_nodes(self, link: Btxs_LinkItem, node: NodeTree, maths_reroute_node: NodeReroute, link_range: tuple[float, float], prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeMath, tuple[int, int]]:
+        """Add the math nodes that check whether or not the value is within `link_range`. Returns the node whose output is 1.0 if it is (0.0 otherwise)."""
+        if self.share_comparisons:
+            return self.LINKLOOP_add_shared_math_nodes(node, maths_reroute_node, link_range, prev_mix_inputs_loc)
+
+        _, _, mult_node, prev_mix_inputs_loc = self.LINKLOOP_add_math_nodes(link, node, maths_reroute_node, link_range, prev_mix_inputs_loc)
+        return (mult_node, prev_mix_inputs_loc)
+
+    def get_shared_compare_node(self, node: NodeTree, maths_reroute_node: NodeReroute, operation: str, threshold: float, location: tuple[int, int]) -> ShaderNodeMath:
+        """Get the math node comparing the value against `threshold` with `operation`; it's only added once per generation (the first `location` is kept)."""
+        key = (operation, threshold)
+        if key in self.shared_nodes:
+            return self.shared_nodes[key]
+
+        # ShaderNodeMath is a subclass of Node
+        compare_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', f"shared_{operation.lower()}_{threshold:.17g}") # type: ignore
+        self.set_prop(compare_node, "operation", operation)
+        self.set_prop(compare_node.inputs[1], "default_value", threshold) # type: ignore
+        if operation == 'COMPARE':
+            # Only whole numbers are compared, so anything closer than 0.5 is equal
+            self.set_prop(compare_node.inputs[2], "default_value", 0.5) # type: ignore
+        self.set_prop(compare_node, "location", location)
+        self.connect(node, maths_reroute_node.outputs[0], compare_node.inputs[0])
+
+        self.shared_nodes[key] = compare_node
+        return compare_node
+
+    def LINKLOOP_add_shared_math_nodes(self, node: NodeTree, maths_reroute_node: NodeReroute, link_range: tuple[float, float], prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeMath, tuple[int, int]]:
+        """Like `LINKLOOP_add_math_nodes()`, but the comparisons are shared between links (see `get_shared_compare_node()`):
+        - a single whole number is matched with one `Compare` node,
+        - other whole number ranges as (`input` > `gt threshold`) - (`input` > `lt threshold` - 1), so that a link's upper bound shares its node with the lower bound of the next link,
+        - float ranges as (`input` > `gt threshold`) * (`input` < `lt threshold`).
+        Links with the same range share their nodes entirely. Returns the node whose output is 1.0 if the value is within `link_range` (0.0 otherwise).
+        """
+        gt, lt = link_range
+        location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 470)
+
+        key = ('MATCH', gt, lt)
+        if key in self.shared_nodes:
+            return (self.shared_nodes[key], location)
+
+        if self.integer_value and lt - gt == 2:
+            match_node = self.get_shared_compare_node(node, maths_reroute_node, 'COMPARE', gt + 1, location)
+            self.shared_nodes[key] = match_node
+            return (match_node, location)
+
+        # Empty whole number ranges go the float way, which never matches
+        # them; the difference of comparisons would be negative instead
+        if self.integer_value and not is_range_empty(link_range, True):
+            lower_node = self.get_shared_compare_node(node, maths_reroute_node, 'GREATER_THAN', gt, location)
+            upper_node = self.get_shared_compare_node(node, maths_reroute_node, 'GREATER_THAN', lt - 1, (location[0], location[1] - 170))
+            operation = 'SUBTRACT'
+        else:
+            lower_node = self.get_shared_compare_node(node, maths_reroute_node, 'GREATER_THAN', gt, location)
+            upper_node = self.get_shared_compare_node(node, maths_reroute_node, 'LESS_THAN', lt, (location[0], location[1] - 170))
+            operation = 'MULTIPLY'
+
+        # ShaderNodeMath is a subclass of Node
+        match_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', f"match_{gt:.17g}_{lt:.17g}") # type: ignore
+        self.set_prop(match_node, "operation", operation)
+        self.set_prop(match_node, "location", (location[0] + 180, location[1] - 100))
+        self.connect(node, lower_node.outputs[0], match_node.inputs[0])
+        self.connect(node, upper_node.outputs[0], match_node.inputs[1])
+
+        self.shared_nodes[key] = match_node
+        return (match_node, location)
+
+    def LINKLOOP_add_math_nodes(self, link: Btxs_LinkItem, node: NodeTree, maths_reroute_node: NodeReroute, link_range: tuple[float, float], prev_mix_inputs_loc: tuple[int, int], name: str | None = None, value_socket: bpy.types.NodeSocket | None = None) -> tuple[ShaderNodeMath, ShaderNodeMath, ShaderNodeMath, tuple[int, int]]:
         """Add greater than node, less than node, and multiply node for the link. Also connect them together properly.
-        To be exact, the logic is: if `input` > `gt threshold` `and` `input` < `lt threshold` then `true`.
+        To be exact, the logic is: if `input` > `gt threshold` `and` `input` < `lt threshold` then `true`, where the thresholds come from `link_range`.
+        The nodes are named after `name` (defaults to the link name). The input is `value_socket` if it's set, otherwise the value from the rerouter.
         The `and` here is replaced with the `Multiply` math node which is similar to a boolean `AND` with two boolean (0.00/1.00) inputs.
         Of course, everything is a float in Blender's shader node system.
         """
         # ShaderNodeMath is a subclass of Node
-        gt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        gt_node.name = "gt_" + link.name
-        gt_node.operation = 'GREATER_THAN'
-        gt_node.inputs[1].default_value = link.int_simple_val - 1 # type: ignore
-        gt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 470)
-        node.links.new(maths_reroute_node.outputs[0], gt_node.inputs[0])
+        gt_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "gt_" + (name or link.name)) # type: ignore
+        self.set_prop(gt_node, "operation", 'GREATER_THAN')
+        self.set_prop(gt_node.inputs[1], "default_value", link_range[0]) # type: ignore
+        self.set_prop(gt_node, "location", (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 470))
+        input_socket = maths_reroute_node.outputs[0] if value_socket is None else value_socket
+        self.connect(node, input_socket, gt_node.inputs[0])
         prev_mix_inputs_loc = gt_node.location
 
         # ShaderNodeMath is a subclass of Node
-        lt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        lt_node.name = "lt_" + link.name
-        lt_node.operation = 'LESS_THAN'
-        lt_node.inputs[1].default_value = link.int_simple_val + 1 # type: ignore
-        lt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 170)
-        node.links.new(maths_reroute_node.outputs[0], lt_node.inputs[0])
+        lt_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "lt_" + (name or link.name)) # type: ignore
+        self.set_prop(lt_node, "operation", 'LESS_THAN')
+        self.set_prop(lt_node.inputs[1], "default_value", link_range[1]) # type: ignore
+        self.set_prop(lt_node, "location", (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 170))
+        self.connect(node, input_socket, lt_node.inputs[0])
 
         # ShaderNodeMath is a subclass of Node
-        mult_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-
-        mult_node.name = "mult_" + link.name
-        mult_node.operation = 'MULTIPLY'
-        mult_node.location = (prev_mix_inputs_loc[0] + 180, prev_mix_inputs_loc[1] - 100)
-        node.links.new(gt_node.outputs[0], mult_node.inputs[0])
-        node.links.new(lt_node.outputs[0], mult_node.inputs[1])
+        mult_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', "mult_" + (name or link.name)) # type: ignore
+        self.set_prop(mult_node, "operation", 'MULTIPLY')
+        self.set_prop(mult_node, "location", (prev_mix_inputs_loc[0] + 180, prev_mix_inputs_loc[1] - 100))
+        self.connect(node, gt_node.outputs[0], mult_node.inputs[0])
+        self.connect(node, lt_node.outputs[0], mult_node.inputs[1])
 
         return (gt_node, lt_node, mult_node, prev_mix_inputs_loc)
 
+    def LINKLOOP_connect_link_inputs(self, config: Btxs_ConfigEntry, link: Btxs_LinkItem, node: NodeTree, group_in: NodeGroupInput, mix_color_node: ShaderNodeMix, mix_alpha_node: ShaderNodeMix | None):
+        """Connect the link's image texture node (or color/alpha input sockets if no image is supplied) to its mix nodes."""
+        img_node: None | ShaderNodeTexImage = None
+
+        # Input sockets of links without an image are added by add_io_sockets()
+        if link.img is None:
+            self.LINKLOOP_connect_color_input_socket(link, node, group_in, mix_color_node)
+
+            if config.output_alpha:
+                self.LINKLOOP_connect_alpha_input_socket(link, node, group_in, mix_alpha_node)
+        else:
+            img_node, self.prev_mix_inputs_loc = self.LINKLOOP_add_img(link, node, self.prev_mix_inputs_loc)
+            self.LINKLOOP_connect_image_to_mix_node(node, img_node, mix_color_node)
+
+            if config.output_alpha:
+                self.LINKLOOP_connect_image_alpha_to_mix_node(node, img_node, mix_alpha_node) 
+
+            if config.input_vector:
+                self.LINKLOOP_connect_vector_input_to_image_node(node, group_in, img_node)
+
     def LINKLOOP_add_img(self, link: Btxs_LinkItem, node: NodeTree, prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeTexImage, tuple[int, int]]:
-        """(Only if an image is supplied for the link) add and configure an image texture node."""
+        """(Only if an image is supplied for the link) add and configure an image texture node. Links with the same image (and image node properties) get the same node, whose output is then shared by their mix nodes."""
+        props = link.image_node_properties
+        key = (link.img.as_pointer(), props.interpolation, props.projection, props.extension)
+        if key in self.img_nodes:
+            return (self.img_nodes[key], prev_mix_inputs_loc)
+
         # ShaderNodeTexImage is a subclass of Node
-        img_node: ShaderNodeTexImage = node.nodes.new('ShaderNodeTexImage') # type: ignore
-
-        img_node.image = link.img
-        img_node.name = "img_" + link.name
-        img_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 360)
-        img_node.hide = True
-        img_node.interpolation = link.image_node_properties.interpolation
-        img_node.projection = link.image_node_properties.projection
-        img_node.extension = link.image_node_properties.extension
+        img_node: ShaderNodeTexImage = self.add_node(node, 'ShaderNodeTexImage', "img_" + link.name) # type: ignore
+
+        self.set_prop(img_node, "image", link.img)
+        self.set_prop(img_node, "location", (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 360))
+        self.set_prop(img_node, "hide", True)
+        self.set_prop(img_node, "interpolation", link.image_node_properties.interpolation)
+        self.set_prop(img_node, "projection", link.image_node_properties.projection)
+        self.set_prop(img_node, "extension", link.image_node_properties.extension)
+        self.img_nodes[key] = img_node
         return (img_node, prev_mix_inputs_loc)
 
     def LINKLOOP_add_color_input_socket(self, link: Btxs_LinkItem, node: NodeTree) -> None:
         """(Only if no image is supplied for the link) add a color input socket for the node tree."""
-        node.interface.new_socket(link.name, in_out='INPUT', socket_type='NodeSocketColor')
+        self.new_socket(node, link.name, 'INPUT', 'NodeSocketColor')
 
     def LINKLOOP_connect_color_input_socket(self, link: Btxs_LinkItem, node: NodeTree, group_in: NodeGroupInput, mix_node: ShaderNodeMix):
         """(Only if no image is supplied for the link) Link the color input socket to a mix color node."""
-        node.links.new(group_in.outputs[link.name], mix_node.inputs['B'])
+        try:
+            self.connect(node, self.group_in_outputs[link.name], mix_node.inputs['B'])
+        except KeyError:
+            return
 
     def LINKLOOP_add_mix_color_node(self, link: Btxs_LinkItem, node: NodeTree, multiply_node: ShaderNodeMath, prev_mix_nodes_loc: tuple[int, int]) -> tuple[ShaderNodeMix, tuple[int, int]]:
         """Add a mix color node."""
         # ShaderNodeMix is a subclass of Node
-        mix_node: bpy.types.ShaderNodeMix = node.nodes.new('ShaderNodeMix') # type: ignore
-
-        mix_node.name = "mix_" + link.name
-        mix_node.data_type = 'RGBA'
-        mix_node.location = (prev_mix_nodes_loc[0] + 210, prev_mix_nodes_loc[1])
-        mix_node.hide = True
-        node.links.new(multiply_node.outputs[0], mix_node.inputs[0])
+        mix_node: bpy.types.ShaderNodeMix = self.add_node(node, 'ShaderNodeMix', "mix_" + link.name) # type: ignore
+        self.set_prop(mix_node, "data_type", 'RGBA')
+        self.set_prop(mix_node, "location", (prev_mix_nodes_loc[0] + 210, prev_mix_nodes_loc[1]))
+        self.set_prop(mix_node, "hide", True)
+        self.connect(node, multiply_node.outputs[0], mix_node.inputs[0])
         return (mix_node, mix_node.location)
 
     def LINKLOOP_connect_previous_mix_color_node(self, node: NodeTree, current_node: ShaderNodeMix, previous_node: ShaderNodeMix | None):
         """Connect the previous mix color node with the current one (if `previous_node` is not `None`)"""
         if previous_node is not None:
-            node.links.new(previous_node.outputs['Result'], current_node.inputs['A'])
+            self.connect(node, previous_node.outputs['Result'], current_node.inputs['A'])
 
-    def LINKLOOP_add_mix_alpha_node(self, link: Btxs_LinkItem, node: NodeTree, mix_color_node: ShaderNodeMix, multiply_node: ShaderNodeMath) -> ShaderNodeMix:
-        """Add a mix node (for the alpha channel)."""
+    def LINKLOOP_add_mix_alpha_node(self, link: Btxs_LinkItem, node: NodeTree, mix_color_node: ShaderNodeMix, multiply_node: ShaderNodeMath, name: str | None = None) -> ShaderNodeMix:
+        """Add a mix node (for the alpha channel). The node is named after `name` (defaults to the link name)."""
         # ShaderNodeMix is a subclass of Node
-        alpha_mix_node: bpy.types.ShaderNodeMix = node.nodes.new('ShaderNodeMix') # type: ignore
-        alpha_mix_node.name = "mix_alpha_" + link.name
-        alpha_mix_node.hide = True
-        alpha_mix_node.data_type = 'FLOAT'
-        alpha_mix_node.location = (mix_color_node.location[0], mix_color_node.location[1] - 45)
-        node.links.new(multiply_node.outputs[0], alpha_mix_node.inputs[0])
+        alpha_mix_node: bpy.types.ShaderNodeMix = self.add_node(node, 'ShaderNodeMix', "mix_alpha_" + (name or link.name)) # type: ignore
+        self.set_prop(alpha_mix_node, "hide", True)
+        self.set_prop(alpha_mix_node, "data_type", 'FLOAT')
+        self.set_prop(alpha_mix_node, "location", (mix_color_node.location[0], mix_color_node.location[1] - 45))
+        self.connect(node, multiply_node.outputs[0], alpha_mix_node.inputs[0])
 
         return alpha_mix_node
 
     def LINKLOOP_connect_previous_mix_alpha_node(self, node: NodeTree, current_node: ShaderNodeMix, previous_node: ShaderNodeMix | None):
         """Connect the previous mix node (for the alpha channel) with the current one (if `previous_node` is not `None`)"""
         if previous_node is not None:
-            node.links.new(previous_node.outputs['Result'], current_node.inputs['A'])
+            self.connect(node, previous_node.outputs['Result'], current_node.inputs['A'])
 
     def LINKLOOP_connect_image_to_mix_node(self, node: NodeTree, img_node: ShaderNodeTexImage, mix_node: ShaderNodeMix):
         """Connect the image texture node to its mix color node."""
-        node.links.new(img_node.outputs['Color'], mix_node.inputs['B'])
+        self.connect(node, img_node.outputs['Color'], mix_node.inputs['B'])
 
     def LINKLOOP_connect_image_alpha_to_mix_node(self, node: NodeTree, img_node: ShaderNodeTexImage, mix_node: ShaderNodeMix):
         """(Only if `output_alpha` is set to True under `config`) Connect the alpha channel of an image node to its mix node."""
         try:
-            node.links.new(img_node.outputs['Alpha'], mix_node.inputs['B'])
+            self.connect(node, img_node.outputs['Alpha'], mix_node.inputs['B'])
         except AttributeError:
             return
 
     def LINKLOOP_add_alpha_input_socket(self, node: NodeTree, link: Btxs_LinkItem):
         """(Only if no image is supplied for the link) add an alpha channel input socket for the node tree."""
-        node.interface.new_socket(link.name + "_alpha", in_out='INPUT', socket_type='NodeSocketFloat')
-        node.interface.items_tree[link.name + "_alpha"].max_value = 1.0
-        node.interface.items_tree[link.name + "_alpha"].min_value = 0.0
-        node.interface.items_tree[link.name + "_alpha"].default_value = 1.0
+        socket: bpy.types.NodeTreeInterfaceSocketFloat = self.new_socket(node, link.name + "_alpha", 'INPUT', 'NodeSocketFloat') # type: ignore
+        socket.max_value = 1.0
+        socket.min_value = 0.0
+        socket.default_value = 1.0
 
     def LINKLOOP_connect_alpha_input_socket(self, link: Btxs_LinkItem, node: NodeTree, group_in: NodeGroupInput, mix_node: ShaderNodeMix):
         """(Only if no image is supplied for the link) Link the alpha channel input socket to a mix node."""
         try:
-            node.links.new(group_in.outputs[link.name + "_alpha"], mix_node.inputs['B'])
-        except AttributeError:
+            self.connect(node, self.group_in_outputs[link.name + "_alpha"], mix_node.inputs['B'])
+        except (AttributeError, KeyError):
             return
 
     def LINKLOOP_connect_vector_input_to_image_node(self, node: NodeTree, group_in: NodeGroupInput, node_to_connect: ShaderNodeTexImage):
         try:
-            node.links.new(group_in.outputs['Vector'], node_to_connect.inputs['Vector'])
-        except AttributeError:
+            self.connect(node, self.group_in_outputs['Vector'], node_to_connect.inputs['Vector'])
+        except (AttributeError, KeyError):
             return
 
     def LINKLOOP_set_fallback_image(self, node: NodeTree, fallback_img: Image, color_mix_node: ShaderNodeMix) -> ShaderNodeTexImage:
         """(Only for index 0 of links) set fallback image"""
         # ShaderNodeTexImage is a subclass of Node
-        fallback_img_node: bpy.types.ShaderNodeTexImage = node.nodes.new('ShaderNodeTexImage') # type: ignore
-        fallback_img_node.name = "fallback_img"
-        fallback_img_node.location = (color_mix_node.location[0] - 350, color_mix_node.location[1])
-        fallback_img_node.image = fallback_img
-        fallback_img_node.hide = True
-        node.links.new(fallback_img_node.outputs['Color'], color_mix_node.inputs['A'])
+        fallback_img_node: bpy.types.ShaderNodeTexImage = self.add_node(node, 'ShaderNodeTexImage', "fallback_img") # type: ignore
+        self.set_prop(fallback_img_node, "location", (color_mix_node.location[0] - 350, color_mix_node.location[1]))
+        self.set_prop(fallback_img_node, "image", fallback_img)
+        self.set_prop(fallback_img_node, "hide", True)
+        self.connect(node, fallback_img_node.outputs['Color'], color_mix_node.inputs['A'])
         return fallback_img_node
 
     def LINKLOOP_set_fallback_image_alpha(self, node: NodeTree, fallback_img_node: ShaderNodeTexImage, alpha_mix_node: ShaderNodeMix):
         """Set a fallback image (alpha channel)."""
         try:
-            node.links.new(fallback_img_node.outputs['Alpha'], alpha_mix_node.inputs['A'])
+            self.connect(node, fallback_img_node.outputs['Alpha'], alpha_mix_node.inputs['A'])
         except AttributeError:
             return
 
     def LINKLOOP_set_falback_color(self, color_mix_node: ShaderNodeMix):
         """(Only if no fallback image is supplied under `config` Set a fallback color."""
-        color_mix_node.inputs['A'].default_value = (0, 0, 0, 1) # type: ignore
+        self.set_prop(color_mix_node.inputs['A'], "default_value", (0, 0, 0, 1)) # type: ignore
 
     def connect_last_mix_color_nodes(self, node: NodeTree, group_out: NodeGroupOutput, curr_mix_color_node: ShaderNodeMix, prev_mix_nodes_loc: tuple[int, int]):
         try:
-            group_out.location = (prev_mix_nodes_loc[0] + 200, prev_mix_nodes_loc[1])
-            node.links.new(curr_mix_color_node.outputs['Result'], group_out.inputs['Image'])
+            self.set_prop(group_out, "location", (prev_mix_nodes_loc[0] + 200, prev_mix_nodes_loc[1]))
+            self.connect(node, curr_mix_color_node.outputs['Result'], group_out.inputs['Image'])
         except AttributeError:
             return
 
     def connect_last_alpha_mix_node(self, node: NodeTree, group_out: NodeGroupOutput, curr_alpha_mix_node: ShaderNodeMix):
         try:
-            node.links.new(curr_alpha_mix_node.outputs['Result'], group_out.inputs['Alpha'])
+            self.connect(node, curr_alpha_mix_node.outputs['Result'], group_out.inputs['Alpha'])
         except AttributeError:
             return
 
     def LINKLOOP_set_fallback_alpha(self, alpha_mix_node: ShaderNodeMix):
         """(Only if no fallback image is supplied under `config` Set a fallback alpha color."""
         try:
-            alpha_mix_node.inputs['A'].default_value = 0.0 # type: ignore
+            self.set_prop(alpha_mix_node.inputs['A'], "default_value", 0.0) # type: ignore
         except AttributeError:
             return
 
-    def setup_node_tree_attributes(self, config, node):
-        node.interface.items_tree['Value'].default_value = config.int_min # type: ignore
-        node.interface.items_tree['Value'].subtype = 'FACTOR'
+    ##### Methods used for the balanced tree (generation_mode == 'TREE') #####
+    def TREE_add_fallback_image(self, node: NodeTree, fallback_img: Image) -> ShaderNodeTexImage:
+        """Add a single fallback image texture node, shared by all leaves of the tree."""
+        # ShaderNodeTexImage is a subclass of Node
+        fallback_img_node: bpy.types.ShaderNodeTexImage = self.add_node(node, 'ShaderNodeTexImage', "fallback_img") # type: ignore
+        self.set_prop(fallback_img_node, "location", (self.prev_mix_inputs_loc[0] + 200, self.prev_mix_inputs_loc[1]))
+        self.set_prop(fallback_img_node, "image", fallback_img)
+        self.set_prop(fallback_img_node, "hide", True)
+        return fallback_img_node
 
-class IntSimpleNodeTreeBuilder(BtxsNodeTreeBuilder):
-    def __init__(self, config: Btxs_ConfigEntry):
-        super().__init__(config)
+    def TREE_add_fallback_only(self, config: Btxs_ConfigEntry, node: NodeTree, fallback_img_node: ShaderNodeTexImage | None) -> tuple[ShaderNodeMix, ShaderNodeMix | None]:
+        """Add mix nodes that always pick the fallback (factor 0), used when no link can be matched at all."""
+        # ShaderNodeMix is a subclass of Node
+        mix_color_node: bpy.types.ShaderNodeMix = self.add_node(node, 'ShaderNodeMix', "mix_fallback") # type: ignore
+        self.set_prop(mix_color_node, "data_type", 'RGBA')
+        self.set_prop(mix_color_node.inputs[0], "default_value", 0.0) # type: ignore
+        self.set_prop(mix_color_node, "location", self.prev_mix_nodes_loc)
+        self.set_prop(mix_color_node, "hide", True)
 
-class IntNodeTreeBuilder(BtxsNodeTreeBuilder):
-    def __init__(self, config: Btxs_ConfigEntry):
-        super().__init__(config)
+        mix_alpha_node: ShaderNodeMix | None = None
+        if config.output_alpha:
+            # ShaderNodeMix is a subclass of Node
+            mix_alpha_node = self.add_node(node, 'ShaderNodeMix', "mix_alpha_fallback") # type: ignore
+            self.set_prop(mix_alpha_node, "data_type", 'FLOAT')
+            self.set_prop(mix_alpha_node.inputs[0], "default_value", 0.0) # type: ignore
+            self.set_prop(mix_alpha_node, "location", (self.prev_mix_nodes_loc[0], self.prev_mix_nodes_loc[1] - 45))
+            self.set_prop(mix_alpha_node, "hide", True)
+
+        if fallback_img_node is None:
+            self.LINKLOOP_set_falback_color(mix_color_node)
+            if mix_alpha_node is not None:
+                self.LINKLOOP_set_fallback_alpha(mix_alpha_node)
+        else:
+            self.connect(node, fallback_img_node.outputs['Color'], mix_color_node.inputs['A'])
+            if mix_alpha_node is not None:
+                self.LINKLOOP_set_fallback_image_alpha(node, fallback_img_node, mix_alpha_node)
 
-    def LINKLOOP_add_math_nodes(self, link: Btxs_LinkItem, node: NodeTree, maths_reroute_node: NodeReroute, prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeMath, ShaderNodeMath, ShaderNodeMath, tuple[int, int]]:
-        # ShaderNodeMath is a subclass of Node
-        gt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        gt_node.name = "gt_" + link.name
-        gt_node.operation = 'GREATER_THAN'
-        gt_node.inputs[1].default_value = link.int_gt # type: ignore
-        gt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 470)
-        node.links.new(maths_reroute_node.outputs[0], gt_node.inputs[0])
-        prev_mix_inputs_loc = gt_node.location
+        return (mix_color_node, mix_alpha_node)
 
-        # ShaderNodeMath is a subclass of Node
-        lt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        lt_node.name = "lt_" + link.name
-        lt_node.operation = 'LESS_THAN'
-        lt_node.inputs[1].default_value = link.int_lt # type: ignore
-        lt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 170)
-        node.links.new(maths_reroute_node.outputs[0], lt_node.inputs[0])
+    def TREE_join_leaves(self, node: NodeTree, maths_reroute_node: NodeReroute, leaves: list[tuple[float, ShaderNodeMix, ShaderNodeMix | None]], start: int, end: int, depth: int) -> tuple[ShaderNodeMix, ShaderNodeMix | None]:
+        """Join `leaves[start:end]` (sorted by threshold) into one pair of mix nodes, recursively. `depth` is the amount of tree levels left below the returned nodes."""
+        if end - start == 1:
+            return (leaves[start][1], leaves[start][2])
 
-        # ShaderNodeMath is a subclass of Node
-        mult_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
+        mid = (start + end) // 2
+        left_color_node, left_alpha_node = self.TREE_join_leaves(node, maths_reroute_node, leaves, start, mid, depth - 1)
+        right_color_node, right_alpha_node = self.TREE_join_leaves(node, maths_reroute_node, leaves, mid, end, depth - 1)
+        location = (self.prev_mix_nodes_loc[0] - 220 * (self.tree_depth - depth), (left_color_node.location[1] + right_color_node.location[1]) // 2)
 
-        mult_node.name = "mult_" + link.name
-        mult_node.operation = 'MULTIPLY'
-        mult_node.location = (prev_mix_inputs_loc[0] + 180, prev_mix_inputs_loc[1] - 100)
-        node.links.new(gt_node.outputs[0], mult_node.inputs[0])
-        node.links.new(lt_node.outputs[0], mult_node.inputs[1])
+        if self.share_comparisons:
+            gt_node = self.get_shared_compare_node(node, maths_reroute_node, 'GREATER_THAN', leaves[mid][0], (location[0] - 200, location[1] + 120))
+        else:
+            # ShaderNodeMath is a subclass of Node
+            gt_node: bpy.types.ShaderNodeMath = self.add_node(node, 'ShaderNodeMath', f"tree_gt_{start}_{end}") # type: ignore
+            self.set_prop(gt_node, "operation", 'GREATER_THAN')
+            self.set_prop(gt_node.inputs[1], "default_value", leaves[mid][0]) # type: ignore
+            self.set_prop(gt_node, "location", (location[0] - 200, location[1] + 120))
+            self.set_prop(gt_node, "hide", True)
+            self.connect(node, maths_reroute_node.outputs[0], gt_node.inputs[0])
 
-        return (gt_node, lt_node, mult_node, prev_mix_inputs_loc)
+        # ShaderNodeMix is a subclass of Node
+        mix_color_node: bpy.types.ShaderNodeMix = self.add_node(node, 'ShaderNodeMix', f"tree_mix_{start}_{end}") # type: ignore
+        self.set_prop(mix_color_node, "data_type", 'RGBA')
+        self.set_prop(mix_color_node, "location", location)
+        self.set_prop(mix_color_node, "hide", True)
+        self.connect(node, gt_node.outputs[0], mix_color_node.inputs[0])
+        self.connect(node, left_color_node.outputs['Result'], mix_color_node.inputs['A'])
+        self.connect(node, right_color_node.outputs['Result'], mix_color_node.inputs['B'])
+
+        mix_alpha_node: bpy.types.ShaderNodeMix | None = None
+        if left_alpha_node is not None and right_alpha_node is not None:
+            # ShaderNodeMix is a subclass of Node
+            mix_alpha_node = self.add_node(node, 'ShaderNodeMix', f"tree_mix_alpha_{start}_{end}") # type: ignore
+            self.set_prop(mix_alpha_node, "data_type", 'FLOAT')
+            self.set_prop(mix_alpha_node, "location", (location[0], location[1] - 45))
+            self.set_prop(mix_alpha_node, "hide", True)
+            self.connect(node, gt_node.outputs[0], mix_alpha_node.inputs[0])
+            self.connect(node, left_alpha_node.outputs['Result'], mix_alpha_node.inputs['A'])
+            self.connect(node, right_alpha_node.outputs['Result'], mix_alpha_node.inputs['B'])
+
+        return (mix_color_node, mix_alpha_node)
 
     def setup_node_tree_attributes(self, config, node):
-        node.interface.items_tree['Value'].default_value = config.int_min # type: ignore
-        node.interface.items_tree['Value'].subtype = 'NONE'
-
-class FloatNodeTreeBuilder(BtxsNodeTreeBuilder):
-    def __init__(self, config: Btxs_ConfigEntry):
-        super().__init__(config)
-
-    def add_io_sockets(self, config, node: NodeTree):
-        """Add the base input and output sockets for the node tree. Only adds the sockets when they don't exist already, so that the user doesn't have to reconnect nodes themselves."""
-        if not 'Image' in node.interface.items_tree:
-            node.interface.new_socket("Image", in_out='OUTPUT', socket_type='NodeSocketColor')
+        self.sockets['Value'].default_value = config.int_min # type: ignore
+        self.sockets['Value'].subtype = 'FACTOR'
 
-        if config.output_alpha:
-            if not 'Alpha' in node.interface.items_tree: 
-                node.interface.new_socket("Alpha", in_out='OUTPUT', socket_type='NodeSocketFloat')
-        elif 'Alpha' in node.interface.items_tree:
-            node.interface.remove(node.interface.items_tree['Alpha'])
+class IntSimpleNodeTreeBuilder(BtxsNodeTreeBuilder):
+    def __init__(self, config: Btxs_ConfigEntry, incremental: bool = True, profile: bool = False):
+        super().__init__(config, incremental, profile)
 
-        if config.input_vector:
-            if not 'Vector' in node.interface.items_tree: 
-                node.interface.new_socket("Vector", in_out='INPUT', socket_type='NodeSocketVector')
-        elif 'Vector' in node.interface.items_tree:
-            node.interface.remove(node.interface.items_tree['Vector'])
+class IntNodeTreeBuilder(BtxsNodeTreeBuilder):
+    def __init__(self, config: Btxs_ConfigEntry, incremental: bool = True, profile: bool = False):
+        super().__init__(config, incremental, profile)
 
-        if not 'Value' in node.interface.items_tree:
-            node.interface.new_socket("Value", in_out='INPUT', socket_type='NodeSocketFloat')
-        elif not isinstance(node.interface.items_tree['Value'], bpy.types.NodeTreeInterfaceSocketFloat):
-            node.interface.remove(node.interface.items_tree['Value'])
-            node.interface.new_socket("Value", in_out='INPUT', socket_type='NodeSocketFloat')
+    def get_link_range(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> tuple[float, float]:
+        return (link.int_gt, link.int_lt)
 
-        node.interface.items_tree['Value'].min_value = config.float_min # type: ignore
-        node.interface.items_tree['Value'].max_value = config.float_max # type: ignore
+    def get_link_lookup_index(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> int | None:
+        return None
 
+    def setup_node_tree_attributes(self, config, node):
+        self.sockets['Value'].default_value = config.int_min # type: ignore
+        self.sockets['Value'].subtype = 'NONE'
 
-    def LINKLOOP_add_math_nodes(self, link: Btxs_LinkItem, node: NodeTree, maths_reroute_node: NodeReroute, prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeMath, ShaderNodeMath, ShaderNodeMath, tuple[int, int]]:
-        # ShaderNodeMath is a subclass of Node
-        gt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        gt_node.name = "gt_" + link.name
-        gt_node.operation = 'GREATER_THAN'
-        gt_node.inputs[1].default_value = link.float_gt # type: ignore
-        gt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 470)
-        node.links.new(maths_reroute_node.outputs[0], gt_node.inputs[0])
-        prev_mix_inputs_loc = gt_node.location
+class FloatNodeTreeBuilder(BtxsNodeTreeBuilder):
+    integer_value = False
+    value_socket_type = 'NodeSocketFloat'
 
-        # ShaderNodeMath is a subclass of Node
-        lt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        lt_node.name = "lt_" + link.name
-        lt_node.operation = 'LESS_THAN'
-        lt_node.inputs[1].default_value = link.float_lt # type: ignore
-        lt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 170)
-        node.links.new(maths_reroute_node.outputs[0], lt_node.inputs[0])
+    def __init__(self, config: Btxs_ConfigEntry, incremental: bool = True, profile: bool = False):
+        super().__init__(config, incremental, profile)
 
-        # ShaderNodeMath is a subclass of Node
-        mult_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
+    def get_value_range(self, config: Btxs_ConfigEntry) -> tuple[float, float]:
+        return (config.float_min, config.float_max)
 
-        mult_node.name = "mult_" + link.name
-        mult_node.operation = 'MULTIPLY'
-        mult_node.location = (prev_mix_inputs_loc[0] + 180, prev_mix_inputs_loc[1] - 100)
-        node.links.new(gt_node.outputs[0], mult_node.inputs[0])
-        node.links.new(lt_node.outputs[0], mult_node.inputs[1])
+    def get_link_range(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> tuple[float, float]:
+        return (link.float_gt, link.float_lt)
 
-        return (gt_node, lt_node, mult_node, prev_mix_inputs_loc)
+    def get_link_lookup_index(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> int | None:
+        return None
 
     def setup_node_tree_attributes(self, config, node):
-        node.interface.items_tree['Value'].default_value = config.float_min 
-        node.interface.items_tree['Value'].subtype = 'FACTOR'
+        self.sockets['Value'].default_value = config.float_min 
+        self.sockets['Value'].subtype = 'FACTOR'
 
 class EnumNodeTreeBuilder(BtxsNodeTreeBuilder):
-    def __init__(self, config) -> None:
-        self.enum_idx = 0
-        super().__init__(config)
+    def __init__(self, config, incremental: bool = True, profile: bool = False) -> None:
+        super().__init__(config, incremental, profile)
 
     def init_node_tree(self, config) -> NodeTree:
-        """Clear node tree and mark it as a Beantextures-generated node tree."""
+        """Clear node tree and mark it as a Beantextures-generated node tree. Also (re)number the enum items after the links, if they changed."""
         super().init_node_tree(config)
         node: NodeTree = config.target_node_tree
-        node.beantextures_props.enum_items.clear()
+        props = node.beantextures_props
+
+        names = [link.name for link in config.links]
+        if [item.name for item in props.enum_items] == names and all(item.idx == idx for idx, item in enumerate(props.enum_items)):
+            return node
+
+        props.enum_items.clear()
+        for idx, name in enumerate(names):
+            enum_item = props.enum_items.add()
+            enum_item.name = name
+            enum_item.idx = idx
+
+        # Invalidates the cached items of the instances' enum property
+        props.enum_revision += 1
         return node
 
-    def add_io_sockets(self, config, node: NodeTree):
-        """Add the base input and output sockets for the node tree. Only adds the sockets when they don't exist already, so that the user doesn't have to reconnect nodes themselves."""
-        if not 'Image' in node.interface.items_tree:
-            node.interface.new_socket("Image", in_out='OUTPUT', socket_type='NodeSocketColor')
+    def get_value_range(self, config: Btxs_ConfigEntry) -> tuple[float, float]:
+        return (0, len(config.links) - 1)
+
+    def get_link_range(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> tuple[float, float]:
+        # Enum items are numbered by the order of the links
+        return (idx - 1, idx + 1)
 
+    def get_link_lookup_index(self, config: Btxs_ConfigEntry, idx: int, link: Btxs_LinkItem) -> int | None:
+        return idx
+
+    def setup_node_tree_attributes(self, config, node):
+        self.sockets['Value'].default_value = 0 # type: ignore
+        self.sockets['Value'].subtype = 'FACTOR'
+
+class SelectorLink:
+    """Stand-in for a link while building a selector node group: it never has an image, and its sockets are named after its index."""
+    def __init__(self, link: Btxs_LinkItem, idx: int):
+        self.link = link
+        self.name = f"link_{idx}"
+        self.img = None
+
+    def __getattr__(self, name: str):
+        return getattr(self.link, name)
+
+class SelectorConfig:
+    """Stand-in for a configuration while building its selector node group (see `SelectorBuilderMixin`)."""
+    input_vector = False
+    fallback_img = None
+    share_node_group = False
+    socket_sort_mode = 'NATURAL'
+
+    def __init__(self, config: Btxs_ConfigEntry, node: NodeTree):
+        self.config = config
+        self.target_node_tree = node
+        self.links = [SelectorLink(link, idx) for idx, link in enumerate(config.links)]
+
+    def __getattr__(self, name: str):
+        return getattr(self.config, name)
+
+class SelectorBuilderMixin:
+    """Builds the selector node group of a configuration (see `BtxsNodeTreeBuilder.generate_instance()`): the comparison and mix nodes of its links, with the colors of the links and the fallback as inputs."""
+    def init_node_tree(self, config) -> NodeTree:
+        # Not the Enum builder's, as the selector has no enum items of its own
+        node = BtxsNodeTreeBuilder.init_node_tree(self, config) # type: ignore
+        # Selectors aren't meant to be used directly
+        node.is_beantextures = False # type: ignore
+        self.selector_tree = node
+        return node
+
+    def get_expected_sockets(self, config) -> dict[str, tuple[str, str]]:
+        sockets = super().get_expected_sockets(config) # type: ignore
+        sockets["fallback"] = ('INPUT', 'NodeSocketColor')
         if config.output_alpha:
-            if not 'Alpha' in node.interface.items_tree: 
-                node.interface.new_socket("Alpha", in_out='OUTPUT', socket_type='NodeSocketFloat')
-        elif 'Alpha' in node.interface.items_tree:
-            node.interface.remove(node.interface.items_tree['Alpha'])
+            sockets["fallback_alpha"] = ('INPUT', 'NodeSocketFloat')
+        return sockets
 
-        if config.input_vector:
-            if not 'Vector' in node.interface.items_tree: 
-                node.interface.new_socket("Vector", in_out='INPUT', socket_type='NodeSocketVector')
-        elif 'Vector' in node.interface.items_tree:
-            node.interface.remove(node.interface.items_tree['Vector'])
+    def add_io_sockets(self, config, node: NodeTree):
+        super().add_io_sockets(config, node) # type: ignore
+        for name in ("fallback", "fallback_alpha"):
+            if name in self.expected_sockets and name not in self.sockets: # type: ignore
+                in_out, socket_type = self.expected_sockets[name] # type: ignore
+                self.new_socket(node, name, in_out, socket_type) # type: ignore
 
-        if not 'Value' in node.interface.items_tree:
-            node.interface.new_socket("Value", in_out='INPUT', socket_type='NodeSocketInt')
-        elif not isinstance(node.interface.items_tree['Value'], bpy.types.NodeTreeInterfaceSocketInt):
-            node.interface.remove(node.interface.items_tree['Value'])
-            node.interface.new_socket("Value", in_out='INPUT', socket_type='NodeSocketInt')
+    def LINKLOOP_set_falback_color(self, color_mix_node: ShaderNodeMix):
+        self.connect(self.selector_tree, self.group_in_outputs['fallback'], color_mix_node.inputs['A']) # type: ignore
 
-        node.interface.items_tree['Value'].min_value = 0 # type: ignore
-        node.interface.items_tree['Value'].max_value = len(config.links) - 1 # type: ignore
+    def LINKLOOP_set_fallback_alpha(self, alpha_mix_node: ShaderNodeMix):
+        self.connect(self.selector_tree, self.group_in_outputs['fallback_alpha'], alpha_mix_node.inputs['A']) # type: ignore
 
-    def LINKLOOP_add_math_nodes(self, link: Btxs_LinkItem, node: NodeTree, maths_reroute_node: NodeReroute, prev_mix_inputs_loc: tuple[int, int]) -> tuple[ShaderNodeMath, ShaderNodeMath, ShaderNodeMath, tuple[int, int]]:
-        enum_item = node.beantextures_props.enum_items.add()
-        enum_item.name = link.name
-        enum_item.idx = self.enum_idx
+class SelectorIntSimpleNodeTreeBuilder(SelectorBuilderMixin, IntSimpleNodeTreeBuilder):
+    pass
 
-        # ShaderNodeMath is a subclass of Node
-        gt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        gt_node.name = "gt_" + link.name
-        gt_node.operation = 'GREATER_THAN'
-        gt_node.inputs[1].default_value = self.enum_idx - 1 # type: ignore
-        gt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 470)
-        node.links.new(maths_reroute_node.outputs[0], gt_node.inputs[0])
-        prev_mix_inputs_loc = gt_node.location
+class SelectorIntNodeTreeBuilder(SelectorBuilderMixin, IntNodeTreeBuilder):
+    pass
 
-        # ShaderNodeMath is a subclass of Node
-        lt_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
-        lt_node.name = "lt_" + link.name
-        lt_node.operation = 'LESS_THAN'
-        lt_node.inputs[1].default_value = self.enum_idx + 1 # type: ignore
-        lt_node.location = (prev_mix_inputs_loc[0], prev_mix_inputs_loc[1] - 170)
-        node.links.new(maths_reroute_node.outputs[0], lt_node.inputs[0])
+class SelectorFloatNodeTreeBuilder(SelectorBuilderMixin, FloatNodeTreeBuilder):
+    pass
 
-        # ShaderNodeMath is a subclass of Node
-        mult_node: bpy.types.ShaderNodeMath = node.nodes.new('ShaderNodeMath') # type: ignore
+class SelectorEnumNodeTreeBuilder(SelectorBuilderMixin, EnumNodeTreeBuilder):
+    pass
 
-        mult_node.name = "mult_" + link.name
-        mult_node.operation = 'MULTIPLY'
-        mult_node.location = (prev_mix_inputs_loc[0] + 180, prev_mix_inputs_loc[1] - 100)
-        node.links.new(gt_node.outputs[0], mult_node.inputs[0])
-        node.links.new(lt_node.outputs[0], mult_node.inputs[1])
+# Selector node group names by signature (see `get_selector_node_tree()`)
+BTXS_CACHE_SELECTOR_NODE_TREES: dict[str, str] = {}
 
-        self.enum_idx += 1
-        return (gt_node, lt_node, mult_node, prev_mix_inputs_loc)
+def find_selector_node_tree(signature: str) -> NodeTree | None:
+    """Find the selector node group with the given signature."""
+    name = BTXS_CACHE_SELECTOR_NODE_TREES.get(signature)
+    node = bpy.data.node_groups.get(name) if name is not None else None
+    if node is not None and node.beantextures_props.selector_signature == signature:
+        return node
 
-    def setup_node_tree_attributes(self, config, node):
-        node.interface.items_tree['Value'].default_value = 0 # type: ignore
-        node.interface.items_tree['Value'].subtype = 'FACTOR'
+    for node in bpy.data.node_groups:
+        if node.beantextures_props.selector_signature == signature:
+            BTXS_CACHE_SELECTOR_NODE_TREES[signature] = node.name
+            return node
+    return None
+
+def get_selector_node_tree(builder: BtxsNodeTreeBuilder, config: Btxs_ConfigEntry) -> NodeTree:
+    """Get the selector node group of a configuration, building it if no structurally identical configuration has one yet. Existing selectors are only built again on full rebuilds."""
+    signature = builder.get_selector_signature(config)
+    node = find_selector_node_tree(signature)
+    if node is not None and builder.incremental:
+        return node
+
+    if node is None:
+        # Names starting with a dot are hidden from ID search menus
+        node = bpy.data.node_groups.new(".btxs_selector_" + signature[:12], 'ShaderNodeTree')
+        node.beantextures_props.selector_signature = signature
+        BTXS_CACHE_SELECTOR_NODE_TREES[signature] = node.name
+
+    selector_config = SelectorConfig(config, node)
+    match config.linking_type:
+        case 'INT_SIMPLE':
+            SelectorIntSimpleNodeTreeBuilder(selector_config, builder.incremental) # type: ignore
+        case 'INT':
+            SelectorIntNodeTreeBuilder(selector_config, builder.incremental) # type: ignore
+        case 'FLOAT':
+            SelectorFloatNodeTreeBuilder(selector_config, builder.incremental) # type: ignore
+        case 'ENUM':
+            SelectorEnumNodeTreeBuilder(selector_config, builder.incremental) # type: ignore
+    return node
+
+# Name of the image texture node of the image sequence mode (see `BtxsNodeTreeBuilder.generate_sequence()`)
+SEQUENCE_IMG_NODE_NAME = "img_sequence"
+
+def get_instance_value_path(node_name: str) -> str:
+    """Get the path (from the material) of the `Value` input of a node group instance."""
+    return f"node_tree.nodes[\"{bpy.utils.escape_identifier(node_name)}\"].inputs[\"Value\"].default_value"
+
+def get_sequence_driver(node_tree: NodeTree) -> bpy.types.Driver | None:
+    """Get the driver of the frame offset of an image sequence node tree, or `None` if there's none."""
+    if node_tree.animation_data is None:
+        return None
+    fcurve = node_tree.animation_data.drivers.find(f"nodes[\"{SEQUENCE_IMG_NODE_NAME}\"].image_user.frame_offset")
+    if fcurve is None or len(fcurve.driver.variables) == 0:
+        return None
+    return fcurve.driver
+
+def set_sequence_driver_target(node_tree: NodeTree, var: bpy.types.DriverVariable, material: bpy.types.Material | None = None, node_name: str = "") -> int:
+    """Make the frame driver variable of an image sequence node tree read the `Value` input of an instance: the given one, or else the first one (by material and node name).
+    Without any instance, it reads the default value of the node group's `Value` socket. Returns the number of instances."""
+    users = sorted(node_index.get_users(node_tree))
+    if material is None and len(users) > 0:
+        material = bpy.data.materials.get(users[0][0])
+        node_name = users[0][1]
+
+    if material is not None:
+        id_type, target_id, data_path = ('MATERIAL', material, get_instance_value_path(node_name))
+    else:
+        id_type, target_id, data_path = ('NODETREE', node_tree, "interface.items_tree[\"Value\"].default_value")
+
+    var.name = "value"
+    var.type = 'SINGLE_PROP'
+    target = var.targets[0]
+    if target.id_type != id_type:
+        target.id_type = id_type
+    if target.id != target_id:
+        target.id = target_id
+    if target.data_path != data_path:
+        target.data_path = data_path
+    return len(users)
+
+def is_sequence_node_tree(node_tree: NodeTree | None) -> bool:
+    return node_tree is not None and node_tree.is_beantextures and node_tree.beantextures_props.last_build_stats.generation_mode == 'SEQUENCE'
+
+def build_node_tree(config: Btxs_ConfigEntry, incremental: bool = True, profile: bool = False) -> BtxsNodeTreeBuilder | None:
+    """Generate the target node tree of a configuration with the builder of its linking type. Returns the builder, or `None` if the linking type is unknown."""
+    match config.linking_type:
+        case 'INT_SIMPLE':
+            return IntSimpleNodeTreeBuilder(config, incremental, profile)
+        case 'INT':
+            return IntNodeTreeBuilder(config, incremental, profile)
+        case 'FLOAT':
+            return FloatNodeTreeBuilder(config, incremental, profile)
+        case 'ENUM':
+            return EnumNodeTreeBuilder(config, incremental, profile)
+    return None
+
+def is_valid_target(config: Btxs_ConfigEntry) -> bool:
+    """Check if the configuration's target node tree can be generated."""
+    return bool(config.target_node_tree) and isinstance(config.target_node_tree, bpy.types.ShaderNodeTree)
+
+def generate_config(config: Btxs_ConfigEntry, incremental: bool = True, profile: bool = False) -> dict:
+    """Generate the node tree of a configuration. Doesn't depend on the context, so it can be used by scripts (e.g. in background mode).
+    Returns a dictionary of statistics (JSON serializable); `generated` is `False` if the configuration has no valid target. The builder's statistics (see `BtxsNodeTreeBuilder.get_stats()`) are under `build`.
+    """
+    warnings = [f"On {location}: {msg}" for location, msgs in collect_config_warnings(config).items() for msg in msgs]
+    stats = {
+        "config": config.name,
+        "node_tree": config.target_node_tree.name if config.target_node_tree else None,
+        "linking_type": config.linking_type,
+        "generation_mode": None,
+        "generated": False,
+        "nodes_added": 0,
+        "nodes_updated": 0,
+        "nodes_removed": 0,
+        "warnings": warnings,
+        "build": None,
+    }
+
+    if not is_valid_target(config):
+        return stats
+
+    builder = build_node_tree(config, incremental, profile)
+    if builder is None:
+        return stats
+
+    if builder.generation_mode != config.generation_mode:
+        warnings.append("Can't be generated with the selected mode; used a mix chain instead.")
+    warnings.extend(builder.warnings)
+
+    stats.update({
+        "generation_mode": builder.generation_mode,
+        "generated": True,
+        "nodes_added": len(builder.created_nodes),
+        "nodes_updated": len(builder.updated_nodes - builder.created_nodes),
+        "nodes_removed": builder.removed_nodes_count,
+        "build": builder.get_stats(),
+    })
+    return stats
+
+def generate_scene_configs(scene: bpy.types.Scene, name_filter: str = "", incremental: bool = True, profile: bool = False) -> list[dict]:
+    """Generate the node trees of all configurations of a scene (optionally only those with a name matching `name_filter`). Returns the statistics of every generated configuration (see `generate_config()`)."""
+    return [
+        generate_config(config, incremental, profile) for config in scene.beantextures_settings.configs
+        if is_valid_target(config) and (name_filter == "" or fnmatch.fnmatchcase(config.name, name_filter))
+    ]
 
 class BtxsOp_GenerateNode(Operator):
     """Generate node tree using active configuration"""
     bl_label = "Generate Node Tree"
     bl_idname = "beantextures.generate_node_tree"
 
+    full_rebuild: bpy.props.BoolProperty(default=False, name="Full Rebuild", description="Clear the node tree and build every node again, instead of only updating the nodes that changed")
+    profile: bpy.props.BoolProperty(default=False, name="Profile", description="Measure the time of every generation step and the depth of the resulting node tree")
+
     @classmethod
     def poll(cls, context):
         settings = context.scene.beantextures_settings
@@ -560,7 +1668,7 @@ class BtxsOp_GenerateNode(Operator):
                 cls.poll_message_set("Specify a shader node group as the target!")
             if not bool(config.target_node_tree):
                 cls.poll_message_set("Set a valid shader node group as a target first!")
-            return bool(config.target_node_tree) and isinstance(config.target_node_tree, bpy.types.ShaderNodeTree)
+            return is_valid_target(config)
         return False
 
     def draw(self, context):
@@ -569,31 +1677,8 @@ class BtxsOp_GenerateNode(Operator):
 
         settings = context.scene.beantextures_settings
         config = settings.configs[settings.active_config_idx]
-        errors: dict[str, list[str]] = {} # {location: ["error1", "error2"], ...}
-
-        match config.linking_type:
-            # FIXME: python momen
-            case 'INT_SIMPLE':
-                warning_checker = check_warnings_int_simple
-            case 'INT':
-                warning_checker = check_warnings_int
-            case 'FLOAT':
-                warning_checker = check_warnings_float
-            case 'ENUM':
-                warning_checker = check_warnings_enum
-            case _:
-                warning_checker = check_warnings_int_simple
-
-        if len(config.links) == 0:
-            # TODO: if more config checking is needed, consider making a separate function that
-            # does something similar to check_warnings_<type>
-            errors.update({'configuration': ["There is no link available."]})
-
-        for link in config.links:
-            warnings = []
-            warnings.extend(check_warnings_general(context, link, config))
-            warnings.extend(warning_checker(context, link, config))
-            errors.update({f"link '{link.name}'": warnings})
+        report = get_validation_report(config)
+        errors = collect_config_warnings(config, report) # {location: ["error1", "error2"], ...}
 
         err_detected = False
         for err_key in errors.keys():
@@ -610,21 +1695,31 @@ class BtxsOp_GenerateNode(Operator):
         else:
             column.label(icon='CHECKMARK', text="No warnings found; hit OK to proceed.")
 
+        # Values without a link show the fallback, which may well be intended
+        if len(report.infos) > 0:
+            box = layout.box()
+            for info in report.infos[:5]:
+                box.label(icon='INFO', text=info)
+            if len(report.infos) > 5:
+                box.label(icon='DOT', text=f"... and {len(report.infos) - 5} more")
+
+        layout.prop(self, "full_rebuild")
+        layout.prop(self, "profile")
+
         
     def execute(self, context):
         settings = context.scene.beantextures_settings
         config = settings.configs[settings.active_config_idx]
-        match config.linking_type:
-            case 'INT_SIMPLE':
-                IntSimpleNodeTreeBuilder(config)
-            case 'INT':
-                IntNodeTreeBuilder(config)
-            case 'FLOAT':
-                FloatNodeTreeBuilder(config)
-            case 'ENUM':
-                EnumNodeTreeBuilder(config)
-
-        self.report({'INFO'}, f"Generated tree with config '{config.name}'")
+        builder = build_node_tree(config, incremental=not self.full_rebuild, profile=self.profile)
+        if builder is None:
+            return {'CANCELLED'}
+
+        if builder.generation_mode != config.generation_mode:
+            self.report({'WARNING'}, f"Config '{config.name}' can't be generated with the selected mode; used a mix chain instead")
+        if len(builder.warnings) > 0:
+            self.report({'WARNING'}, "\n".join([f"Config '{config.name}':", *builder.warnings]))
+
+        self.report({'INFO'}, f"Generated tree with config '{config.name}' ({builder.get_summary()})")
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -633,8 +1728,176 @@ class BtxsOp_GenerateNode(Operator):
 
     
 
+class BtxsOp_GenerateAllNodes(Operator):
+    """Generate node trees of all configurations (that have a valid target node group)"""
+    bl_label = "Generate All Node Trees"
+    bl_idname = "beantextures.generate_all_node_trees"
+
+    name_filter: bpy.props.StringProperty(name="Name Filter", description="Only generate configurations with a matching name (wildcards like * are supported); leave empty to generate all of them")
+    full_rebuild: bpy.props.BoolProperty(default=False, name="Full Rebuild", description="Clear the node trees and build every node again, instead of only updating the nodes that changed")
+    profile: bpy.props.BoolProperty(default=False, name="Profile", description="Measure the time of every generation step and the depth of the resulting node tree")
+
+    # Set when invoked from the UI, so that configurations are generated one
+    # at a time without blocking it
+    use_modal: bpy.props.BoolProperty(default=False, options={'HIDDEN', 'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.scene.beantextures_settings.configs) > 0
+
+    def get_config_indices(self, context) -> list[int]:
+        """Get the indices of configurations to generate."""
+        settings = context.scene.beantextures_settings
+        return [
+            idx for idx, config in enumerate(settings.configs)
+            if is_valid_target(config) and (self.name_filter == "" or fnmatch.fnmatchcase(config.name, self.name_filter))
+        ]
+
+    def generate_config(self, config: Btxs_ConfigEntry):
+        """Generate one configuration, and keep its warnings for the final report."""
+        stats = generate_config(config, incremental=not self.full_rebuild, profile=self.profile)
+        self.warnings.extend(f"'{config.name}': {msg}" for msg in stats["warnings"])
+
+        if stats["generated"]:
+            self.generated_count += 1
+            self.touched_count += stats["nodes_added"] + stats["nodes_updated"] + stats["nodes_removed"]
+            self.total_time += stats["build"]["total_time"]
+
+    def report_results(self):
+        if len(self.warnings) > 0:
+            self.report({'WARNING'}, "\n".join([f"{len(self.warnings)} warning(s) found while generating:", *self.warnings]))
+        took = f" in {self.total_time * 1000:.1f} ms" if self.profile else ""
+        self.report({'INFO'}, f"Generated {self.generated_count} node tree(s){took} ({self.touched_count} node(s) touched)")
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        col = layout.column()
+        col.prop(self, "name_filter")
+        col.prop(self, "full_rebuild")
+        col.prop(self, "profile")
+        col.label(text=f"{len(self.get_config_indices(context))} configuration(s) will be generated.", icon='INFO')
+
+    def execute(self, context):
+        self.queue = self.get_config_indices(context)
+        self.done = 0
+        self.warnings: list[str] = []
+        self.generated_count = 0
+        self.touched_count = 0
+        self.total_time = 0.0
+
+        if not self.use_modal:
+            settings = context.scene.beantextures_settings
+            for idx in self.queue:
+                self.generate_config(settings.configs[idx])
+            self.report_results()
+            return {'FINISHED'}
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(self.queue))
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.finish(context)
+            self.report({'WARNING'}, f"Cancelled after {self.done} out of {len(self.queue)} configuration(s)")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # One configuration per timer event, so that the UI gets to update
+        # in between
+        if self.done < len(self.queue):
+            settings = context.scene.beantextures_settings
+            idx = self.queue[self.done]
+            if idx < len(settings.configs):
+                self.generate_config(settings.configs[idx])
+
+            self.done += 1
+            context.window_manager.progress_update(self.done)
+            return {'RUNNING_MODAL'}
+
+        self.finish(context)
+        self.report_results()
+        return {'FINISHED'}
+
+    def finish(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+
+    def invoke(self, context, event):
+        self.use_modal = True
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+class BtxsOp_FollowSequenceInstance(Operator):
+    """Make the image sequence of the active node's node group follow the value of this instance. All instances of the node group show the same image"""
+    bl_label = "Follow This Instance"
+    bl_idname = "beantextures.follow_sequence_instance"
+
+    @classmethod
+    def poll(cls, context):
+        node = getattr(context, "active_node", None)
+        return (getattr(context, "material", None) is not None and isinstance(node, bpy.types.ShaderNodeGroup) and is_sequence_node_tree(node.node_tree))
+
+    def execute(self, context):
+        node = context.active_node
+        driver = get_sequence_driver(node.node_tree)
+        if driver is None:
+            self.report({'WARNING'}, f"Node group '{node.node_tree.name}' has no frame driver; generate it again")
+            return {'CANCELLED'}
+
+        instance_count = set_sequence_driver_target(node.node_tree, driver.variables[0], context.material, node.name)
+        shared = f"; {instance_count - 1} other instance(s) show the same image" if instance_count > 1 else ""
+        self.report({'INFO'}, f"Image sequence of '{node.node_tree.name}' follows '{node.name}'{shared}")
+        return {'FINISHED'}
+
+class BtxsOp_ExportBuildStats(Operator, ExportHelper):
+    """Export the last build statistics of all Beantextures node trees to a JSON file"""
+    bl_label = "Export Build Statistics"
+    bl_idname = "beantextures.export_build_stats"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return any(node_tree.is_beantextures for node_tree in bpy.data.node_groups)
+
+    def execute(self, context):
+        node_trees = {}
+        for node_tree in bpy.data.node_groups:
+            build_stats = node_tree.beantextures_props.last_build_stats
+            if not node_tree.is_beantextures or build_stats.generation_mode == "":
+                continue
+            node_trees[node_tree.name] = {
+                key: getattr(build_stats, key) for key in build_stats.bl_rna.properties.keys()
+                if key not in {"rna_type", "name"}
+            }
+
+        data = {
+            "addon_version": ".".join(str(n) for n in bl_info["version"]),
+            "blender_version": bpy.app.version_string,
+            "node_trees": node_trees,
+        }
+        with open(self.filepath, "w") as f:
+            json.dump(data, f, indent=1)
+
+        self.report({'INFO'}, f"Exported build statistics of {len(node_trees)} node tree(s)")
+        return {'FINISHED'}
+
 def register():
     bpy.utils.register_class(BtxsOp_GenerateNode)
+    bpy.utils.register_class(BtxsOp_GenerateAllNodes)
+    bpy.utils.register_class(BtxsOp_ExportBuildStats)
+    bpy.utils.register_class(BtxsOp_FollowSequenceInstance)
 
 def unregister():
     bpy.utils.unregister_class(BtxsOp_GenerateNode)
+    bpy.utils.unregister_class(BtxsOp_GenerateAllNodes)
+    bpy.utils.unregister_class(BtxsOp_ExportBuildStats)
+    bpy.utils.unregister_class(BtxsOp_FollowSequenceInstance)
@@ -0,0 +1,300 @@
+"""Operators to export configurations to (and import them from) JSON files."""
+import os
+import json
+import bpy
+import numpy as np
+from bpy.types import Operator
+from bpy_extras import image_utils
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+from . import bl_info
+from .props_settings import Btxs_ConfigEntry
+from .ops_settings import LINK_IMAGE_NODE_PROPS, LINK_THRESHOLD_PROPS, add_new_links
+from .utils_image import IMAGE_TAG_PROP
+from .utils_validation import clear_validation_cache
+
+FORMAT_NAME = "beantextures-configs"
+FORMAT_VERSION = 1
+
+# Configuration properties written as they are
+CONFIG_FIELDS = (
+    "linking_type",
+    "generation_mode",
+    "share_comparisons",
+    "share_node_group",
+    "output_alpha",
+    "input_vector",
+    "socket_sort_mode",
+    "int_min",
+    "int_max",
+    "float_min",
+    "float_max",
+)
+
+# Columns of every link row; `img` is an index into the file's image table
+LINK_FIELDS = ("name", "img", *LINK_THRESHOLD_PROPS, *LINK_IMAGE_NODE_PROPS)
+
+def get_image_filepath(img: bpy.types.Image) -> str:
+    """Get the absolute, normalized file path of an image (empty for generated images)."""
+    if img.filepath == "":
+        return ""
+    return os.path.normpath(bpy.path.abspath(img.filepath, library=img.library))
+
+class ImageTable:
+    """Images referenced by a configuration file, stored once each and referred to by index."""
+    def __init__(self):
+        self.entries: list[dict[str, str]] = []
+        self.indices: dict[int, int] = {}
+
+    def add(self, img: bpy.types.Image | None) -> int | None:
+        if img is None:
+            return None
+        key = img.as_pointer()
+        if key not in self.indices:
+            self.indices[key] = len(self.entries)
+            self.entries.append({"name": img.name, "filepath": get_image_filepath(img)})
+        return self.indices[key]
+
+def serialize_config(config: Btxs_ConfigEntry, images: ImageTable) -> dict:
+    """Convert a configuration (and its links) to JSON serializable data. Images are added to `images`."""
+    data = {"name": config.name}
+    data.update({field: getattr(config, field) for field in CONFIG_FIELDS})
+    data["target_node_tree"] = config.target_node_tree.name if config.target_node_tree else None
+    data["fallback_img"] = images.add(config.fallback_img)
+
+    data["links"] = [
+        [
+            link.name,
+            images.add(link.img),
+            *(getattr(link, prop) for prop in LINK_THRESHOLD_PROPS),
+            *(getattr(link.image_node_properties, prop) for prop in LINK_IMAGE_NODE_PROPS),
+        ]
+        for link in config.links
+    ]
+    return data
+
+def serialize_configs(scene: bpy.types.Scene) -> dict:
+    """Convert all configurations of a scene to JSON serializable data."""
+    images = ImageTable()
+    configs = [serialize_config(config, images) for config in scene.beantextures_settings.configs]
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "addon_version": ".".join(str(n) for n in bl_info["version"]),
+        "link_fields": list(LINK_FIELDS),
+        "images": images.entries,
+        "configs": configs,
+    }
+
+def resolve_images(entries: list[dict[str, str]]) -> list[bpy.types.Image | None]:
+    """Find the images of an image table: by file path (loading the file if no image uses it yet), or else by name."""
+    by_filepath = {get_image_filepath(img): img for img in bpy.data.images if img.filepath != ""}
+
+    images: list[bpy.types.Image | None] = []
+    for entry in entries:
+        filepath = entry.get("filepath", "")
+        img = by_filepath.get(filepath) if filepath != "" else None
+        if img is None and filepath != "" and os.path.isfile(filepath):
+            img = image_utils.load_image(filepath)
+            if img is not None:
+                by_filepath[filepath] = img
+        if img is None:
+            img = bpy.data.images.get(entry.get("name", ""))
+        if img is not None and img.library is None:
+            # So that the images can be purged once unused (see `BtxsOp_PurgeUnusedImages`)
+            img[IMAGE_TAG_PROP] = True
+        images.append(img)
+    return images
+
+def check_configs_data(data) -> None:
+    """Check the structure and value types of data to be read by `deserialize_configs()`, so that nothing in the scene is changed for a malformed file. Raises `ValueError` describing the first problem found."""
+    def fail(msg: str):
+        raise ValueError(f"Malformed configuration file: {msg}")
+
+    def check_image_idx(idx, where: str):
+        if idx is not None and (type(idx) is not int or not 0 <= idx < len(images)):
+            fail(f"{where} refers to a non-existent image ({idx!r})")
+
+    if not isinstance(data, dict):
+        fail("not a JSON object")
+
+    images = data.get("images", [])
+    if not isinstance(images, list) or not all(isinstance(entry, dict) and all(isinstance(entry.get(key, ""), str) for key in ("name", "filepath")) for entry in images):
+        fail("'images' must be a list of objects with string 'name' and 'filepath'")
+
+    link_fields = data.get("link_fields", list(LINK_FIELDS))
+    if not isinstance(link_fields, list) or not all(isinstance(field, str) for field in link_fields):
+        fail("'link_fields' must be a list of strings")
+
+    configs = data.get("configs", [])
+    if not isinstance(configs, list):
+        fail("'configs' must be a list")
+
+    for config_idx, config_data in enumerate(configs):
+        if not isinstance(config_data, dict):
+            fail(f"configuration #{config_idx + 1} isn't an object")
+        name = config_data.get("name", "")
+        if not isinstance(name, str):
+            fail(f"configuration #{config_idx + 1} has a non-string name")
+        if not isinstance(config_data.get("target_node_tree"), (str, type(None))):
+            fail(f"'{name}': 'target_node_tree' must be a string")
+        check_image_idx(config_data.get("fallback_img"), f"'{name}': 'fallback_img'")
+
+        rows = config_data.get("links", [])
+        if not isinstance(rows, list):
+            fail(f"'{name}': 'links' must be a list")
+        for row_idx, row in enumerate(rows):
+            if not isinstance(row, list) or len(row) > len(link_fields):
+                fail(f"'{name}': link #{row_idx + 1} must be a list of at most {len(link_fields)} values")
+            for field, value in zip(link_fields, row):
+                if field == "img":
+                    check_image_idx(value, f"'{name}': link #{row_idx + 1}")
+                elif field in ("name", *LINK_IMAGE_NODE_PROPS) and not isinstance(value, str):
+                    fail(f"'{name}': '{field}' of link #{row_idx + 1} must be a string")
+                elif field in LINK_THRESHOLD_PROPS and (type(value) not in (int, float)):
+                    fail(f"'{name}': '{field}' of link #{row_idx + 1} must be a number")
+                elif field in LINK_THRESHOLD_PROPS and LINK_THRESHOLD_PROPS[field] is np.int32 and not -2**31 <= value < 2**31:
+                    fail(f"'{name}': '{field}' of link #{row_idx + 1} is out of range")
+
+def deserialize_config(config: Btxs_ConfigEntry, data: dict, link_fields: list[str], images: list[bpy.types.Image | None], image_entries: list[dict[str, str]]) -> list[str]:
+    """Fill an (empty) configuration from data written by `serialize_config()`; `images` are the resolved `image_entries` (see `resolve_images()`). Returns warnings about values that couldn't be set."""
+    warnings: list[str] = []
+
+    def get_image(idx: int | None) -> bpy.types.Image | None:
+        if idx is None:
+            return None
+        if images[idx] is None:
+            warnings.append(f"Image '{image_entries[idx].get('name')}' can't be found.")
+        return images[idx]
+
+    for field in CONFIG_FIELDS:
+        if field not in data:
+            continue
+        try:
+            setattr(config, field, data[field])
+        except (TypeError, ValueError):
+            warnings.append(f"Invalid value for '{field}': {data[field]!r}.")
+
+    if (target_name := data.get("target_node_tree")) is not None:
+        config.target_node_tree = bpy.data.node_groups.get(target_name)
+        if config.target_node_tree is None:
+            warnings.append(f"Node group '{target_name}' doesn't exist.")
+    config.fallback_img = get_image(data.get("fallback_img"))
+
+    specs = []
+    for row in data.get("links", []):
+        spec = dict(zip(link_fields, row))
+        spec["img"] = get_image(spec.get("img"))
+        for prop in LINK_IMAGE_NODE_PROPS:
+            if prop in spec and spec[prop] not in bpy.types.ShaderNodeTexImage.bl_rna.properties[prop].enum_items.keys():
+                warnings.append(f"Invalid value for '{prop}' of link '{spec.get('name')}': {spec[prop]!r}.")
+                del spec[prop]
+        specs.append(spec)
+
+    add_new_links(config, specs)
+    config.active_link_idx = 0
+
+    return warnings
+
+def deserialize_configs(scene: bpy.types.Scene, data: dict, replace_existing: bool = True) -> tuple[int, list[str]]:
+    """Add the configurations from data written by `serialize_configs()` to a scene. Existing configurations with the same name are replaced if `replace_existing` is set.
+    Returns the number of added configurations and warnings (prefixed with the configuration name)."""
+    if not isinstance(data, dict) or data.get("format") != FORMAT_NAME:
+        raise ValueError("Not a Beantextures configuration file")
+    if not isinstance(data.get("version", 0), int) or data.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported file version {data.get('version')} (newest supported is {FORMAT_VERSION})")
+    # Nothing is changed unless the whole file can be read
+    check_configs_data(data)
+
+    settings = scene.beantextures_settings
+    link_fields = data.get("link_fields", list(LINK_FIELDS))
+    image_entries = data.get("images", [])
+    images = resolve_images(image_entries)
+    warnings: list[str] = []
+
+    for config_data in data.get("configs", []):
+        name = config_data.get("name", "Imported Config")
+
+        if replace_existing and (existing_idx := settings.configs.find(name)) != -1:
+            settings.configs.remove(existing_idx)
+
+        config = settings.configs.add()
+        config.name = name
+        warnings.extend(f"{name}: {warning}" for warning in deserialize_config(config, config_data, link_fields, images, image_entries))
+
+    # Configs may have moved in memory
+    clear_validation_cache()
+    settings.active_config_idx = max(0, len(settings.configs) - 1)
+    return (len(data.get("configs", [])), warnings)
+
+def export_configs(scene: bpy.types.Scene, filepath: str, compact: bool = True):
+    """Write all configurations of a scene to a JSON file. Compact files have no whitespace; otherwise every value gets its own line, which is easier to diff."""
+    with open(filepath, "w") as f:
+        if compact:
+            json.dump(serialize_configs(scene), f, separators=(",", ":"))
+        else:
+            json.dump(serialize_configs(scene), f, indent=1)
+
+def import_configs(scene: bpy.types.Scene, filepath: str, replace_existing: bool = True) -> tuple[int, list[str]]:
+    """Add the configurations of a JSON file (see `export_configs()`) to a scene. See `deserialize_configs()` for the return value."""
+    with open(filepath) as f:
+        return deserialize_configs(scene, json.load(f), replace_existing)
+
+class BtxsOp_ExportConfigs(Operator, ExportHelper):
+    """Export all configurations of the scene to a JSON file"""
+    bl_label = "Export Configurations"
+    bl_idname = "beantextures.export_configs"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    compact: bpy.props.BoolProperty(default=True, name="Compact", description="Leave out all whitespace; disable to write every value on its own line, which is easier to diff")
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.scene.beantextures_settings.configs) > 0
+
+    def execute(self, context):
+        try:
+            export_configs(context.scene, self.filepath, self.compact)
+        except OSError as e:
+            self.report({'ERROR'}, f"Can't write file: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Exported {len(context.scene.beantextures_settings.configs)} configuration(s) to {bpy.path.basename(self.filepath)}")
+        return {'FINISHED'}
+
+class BtxsOp_ImportConfigs(Operator, ImportHelper):
+    """Import configurations from a JSON file into the scene"""
+    bl_label = "Import Configurations"
+    bl_idname = "beantextures.import_configs"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    replace_existing: bpy.props.BoolProperty(default=True, name="Replace Existing", description="Replace configurations with the same name, instead of adding the imported ones next to them")
+
+    @classmethod
+    def poll(cls, context):
+        return True
+
+    def execute(self, context):
+        try:
+            count, warnings = import_configs(context.scene, self.filepath, self.replace_existing)
+        except (OSError, ValueError, TypeError, KeyError, IndexError) as e:
+            # json.JSONDecodeError is a ValueError as well; the others are
+            # only raised by data that got past `check_configs_data()`
+            self.report({'ERROR'}, f"Can't import configurations: {e}")
+            return {'CANCELLED'}
+
+        if len(warnings) > 0:
+            self.report({'WARNING'}, "\n".join(["Some values couldn't be imported:", *warnings]))
+        self.report({'INFO'}, f"Imported {count} configuration(s)")
+        return {'FINISHED'}
+
+def register():
+    bpy.utils.register_class(BtxsOp_ExportConfigs)
+    bpy.utils.register_class(BtxsOp_ImportConfigs)
+
+def unregister():
+    bpy.utils.unregister_class(BtxsOp_ExportConfigs)
+    bpy.utils.unregister_class(BtxsOp_ImportConfigs)
@@ -1,15 +1,37 @@
 """Operators related to the node generator settings."""
 
 import bpy
+import numpy as np
 from bpy.types import Operator
 from bpy_extras import image_utils
-from .props_settings import Btxs_LinkItem, Btxs_ConfigEntry, get_builtin_image_texture_prop_description, get_builtin_image_texture_prop_enum_items, get_builtin_image_texture_prop_name
+from .props_settings import Btxs_LinkItem, Btxs_ConfigEntry, get_builtin_image_texture_prop_description, get_builtin_image_texture_prop_enum_items, get_builtin_image_texture_prop_name, bump_config_revision, batch_link_updates
+from .utils_image import IMAGE_TAG_PROP, ImageFileInfo, ImageReadJob, read_image_file_info
+from .utils_validation import clear_validation_cache
+
+# Custom property holding the content hash of images imported by Beantextures
+IMAGE_HASH_PROP = "beantextures_hash"
+
+# Threshold properties of links (see `add_new_links()`), with the array type
+# used to fill them
+LINK_THRESHOLD_PROPS = {
+    "int_simple_val": np.int32,
+    "int_gt": np.int32,
+    "int_lt": np.int32,
+    "float_gt": np.float32,
+    "float_lt": np.float32,
+}
+
+# Image texture node properties of links (see `add_new_links()`)
+LINK_IMAGE_NODE_PROPS = ("interpolation", "projection", "extension")
 
 def add_new_config(context, name: str):
     settings = context.scene.beantextures_settings
     config = settings.configs.add()
     config.name = name
+    bump_config_revision(config)
     settings.active_config_idx = len(settings.configs) - 1
+    # Adding may have moved all configs in memory
+    clear_validation_cache()
 
 def remove_config(context, idx: int):
     settings = context.scene.beantextures_settings
@@ -18,33 +40,72 @@ def remove_config(context, idx: int):
         settings.active_config_idx -= 1
 
     settings.configs.remove(idx)
+    # Configs after the removed one have moved
+    clear_validation_cache()
+
+def get_default_link_thresholds(indices: np.ndarray) -> dict[str, np.ndarray]:
+    """Get the thresholds new links at the given indices get by default: every link is one step after the previous one."""
+    return {
+        "int_simple_val": indices + 1,
+        "int_gt": indices,
+        "int_lt": indices + 2,
+        "float_gt": indices + 1.0,
+        "float_lt": indices + 2.1,
+    }
+
+def get_next_link_name(prev_name: str | None, idx: int) -> str:
+    """Get the default name of the link at `idx`: one more than the previous link's name if it's a number, else the link's position."""
+    if prev_name is not None and prev_name.isdigit():
+        return str(int(prev_name) + 1)
+    return str(idx + 1)
+
+def add_new_links(config: Btxs_ConfigEntry, specs: list[dict] | dict[str, dict]) -> list[Btxs_LinkItem]:
+    """Add a link for every spec to a configuration at once. A spec is a dictionary of link properties: `name`, `img`, the thresholds (see `LINK_THRESHOLD_PROPS`) and the image node properties (see `LINK_IMAGE_NODE_PROPS`); specs may also be given as `{name: spec}`.
+    Missing names and thresholds get their defaults (see `get_next_link_name()` and `get_default_link_thresholds()`). The thresholds of all links are written in one go, the configuration is only marked as changed once, and the last new link becomes the active one. Returns the new links.
+    """
+    if isinstance(specs, dict):
+        specs = [{**spec, "name": name} for name, spec in specs.items()]
+    if len(specs) == 0:
+        return []
+
+    links = config.links
+    start = len(links)
+
+    with batch_link_updates(config):
+        for _ in specs:
+            links.add()
+        total = len(links)
+
+        for prop, values in get_default_link_thresholds(np.arange(start, total)).items():
+            # foreach_set() needs the values of every link, not just the new ones
+            data = np.empty(total, dtype=LINK_THRESHOLD_PROPS[prop])
+            links.foreach_get(prop, data)
+            data[start:] = values
+            for offset, spec in enumerate(specs):
+                if prop in spec:
+                    data[start + offset] = spec[prop]
+            links.foreach_set(prop, data)
+
+        new_links = links[start:]
+        prev_name = links[start - 1].name if start > 0 else None
+        for idx, (link, spec) in enumerate(zip(new_links, specs), start):
+            link.name = spec.get("name") or get_next_link_name(prev_name, idx)
+            prev_name = link.name
+
+            if "img" in spec:
+                link.img = spec["img"]
+            for prop in LINK_IMAGE_NODE_PROPS:
+                if prop in spec:
+                    setattr(link.image_node_properties, prop, spec[prop])
+
+        config.active_link_idx = total - 1
+
+    return new_links
 
 def add_new_link(context) -> Btxs_LinkItem:
     settings = context.scene.beantextures_settings
-    config_idx = settings.active_config_idx
-    config = settings.configs[config_idx]
-    link = config.links.add()
-
-    proper_idx = len(config.links) - 1
-    try:
-        if config.links[-2].name.isdigit():
-            name = int(config.links[-2].name) + 1
-        else:
-            name = proper_idx + 1
-    except IndexError:
-        name = proper_idx + 1
-
-    link.name = str(name)
-    
-    link.int_simple_val = proper_idx + 1
-    link.int_gt = proper_idx
-    link.int_lt = proper_idx + 2
-    link.float_gt = proper_idx + 1
-    link.float_lt = proper_idx + 2.1
-
-    config.active_link_idx = proper_idx
-
-    return link
+    config = settings.configs[settings.active_config_idx]
+    return add_new_links(config, [{}])[0]
 
 def remove_link(context, idx: int):
     settings = context.scene.beantextures_settings
@@ -55,32 +116,92 @@ def remove_link(context, idx: int):
         config.active_link_idx -= 1
 
     config.links.remove(idx)
-
-def auto_import_images(context, directory: bpy.types.StringProperty, files: bpy.types.CollectionProperty, prefix: bpy.types.StringProperty, suffix: bpy.types.StringProperty, interpolation: str, projection: str, extension: str):
-    for file_name in sorted(files.keys()):
-        if len(file_name) > 0:
-            link = add_new_link(context)
-            link.img = image_utils.load_image(directory + file_name)
-            link.name = str(prefix) + bpy.path.display_name_from_filepath(file_name) + str(suffix)
-            link.image_node_properties.interpolation = interpolation
-            link.image_node_properties.projection = projection
-            link.image_node_properties.extension = extension
-
-def import_image(link: Btxs_LinkItem, directory: bpy.types.StringProperty, file: bpy.types.OperatorFileListElement):
-    link.img = image_utils.load_image(directory + file.name) # type: ignore
-
-def purge_image(context, img: bpy.types.Image):
-    """Purge image if image has no user"""
-
-    if img and img.users == 0:
-        context.blend_data.images.remove(img)
-
-def delete_all_links(context, config: Btxs_ConfigEntry, purge_images: bool):
-    for _ in range(0, len(config.links)):
-        img = config.links[0].img
-        config.links.remove(0)
-        if purge_images:
-            purge_image(context, img) 
+    bump_config_revision(config)
+
+def get_image_file_names(files: bpy.types.CollectionProperty) -> list[str]:
+    """Get the (sorted) names of selected files."""
+    return [file_name for file_name in sorted(files.keys()) if len(file_name) > 0]
+
+def get_hashed_images() -> dict[str, bpy.types.Image]:
+    """Map content hashes to the images imported (with hashing) by Beantextures."""
+    return {img[IMAGE_HASH_PROP]: img for img in bpy.data.images if IMAGE_HASH_PROP in img}
+
+def load_image_deduplicated(info: ImageFileInfo, hashed_images: dict[str, bpy.types.Image] | None) -> bpy.types.Image | None:
+    """Load an image file, unless an image with identical contents has already been imported (requires `info.content_hash`); that image is returned instead.
+    Newly loaded images are added to `hashed_images`."""
+    if hashed_images is not None and info.content_hash is not None and (img := hashed_images.get(info.content_hash)) is not None:
+        return img
+
+    img = image_utils.load_image(info.filepath)
+    if img is None:
+        return None
+
+    img[IMAGE_TAG_PROP] = True
+    if hashed_images is not None and info.content_hash is not None:
+        img[IMAGE_HASH_PROP] = info.content_hash
+        hashed_images[info.content_hash] = img
+    return img
+
+def set_link_image(link: Btxs_LinkItem, info: ImageFileInfo, hashed_images: dict[str, bpy.types.Image] | None, deferred: bool = True) -> str | None:
+    """Load an image file (see `load_image_deduplicated()`) into a link, and record the size/alpha presence read from its header.
+    Blender only loads pixel data once an image is used, so unless `deferred` is unset, nothing here touches it. Otherwise the pixels are loaded right away; returns an error message if that fails."""
+    link.img = load_image_deduplicated(info, hashed_images)
+    link.img_size = (info.width or 0, info.height or 0)
+    link.img_has_alpha = bool(info.has_alpha)
+
+    if link.img is None:
+        return "can't be loaded"
+
+    # Image.size needs the pixel data, so reading it loads the image
+    if not deferred and tuple(link.img.size) == (0, 0):
+        return "can't be loaded"
+    return None
+
+def import_images_as_links(config: Btxs_ConfigEntry, infos: list[ImageFileInfo], prefix: str, suffix: str, interpolation: str, projection: str, extension: str, hashed_images: dict[str, bpy.types.Image] | None = None, deferred: bool = True) -> list[tuple[Btxs_LinkItem, str | None]]:
+    """Create links (see `add_new_links()`) for image files read by `ImageReadJob`. Must be run on the main thread.
+    If `hashed_images` is given (see `get_hashed_images()`), identical images share a single data-block. Returns every link with an error message, if any (see `set_link_image()`)."""
+    specs = [{
+        "name": str(prefix) + bpy.path.display_name_from_filepath(info.filepath) + str(suffix),
+        "interpolation": interpolation,
+        "projection": projection,
+        "extension": extension,
+    } for info in infos]
+    links = add_new_links(config, specs)
+    # The header info is already known; the image update callback mustn't read it again
+    with batch_link_updates(config):
+        return [(link, set_link_image(link, info, hashed_images, deferred)) for link, info in zip(links, infos)]
+
+def auto_import_images(context, directory: bpy.types.StringProperty, files: bpy.types.CollectionProperty, prefix: bpy.types.StringProperty, suffix: bpy.types.StringProperty, interpolation: str, projection: str, extension: str, deduplicate: bool = True, deferred: bool = True):
+    """Import images as links, all at once. File reading is done in a thread pool; see `BtxsOp_AutoImportImages` for the non-blocking version."""
+    settings = context.scene.beantextures_settings
+    config = settings.configs[settings.active_config_idx]
+    job = ImageReadJob([directory + file_name for file_name in get_image_file_names(files)], hash_contents=deduplicate)
+    hashed_images = get_hashed_images() if deduplicate else None
+    infos = [info for info in job.wait() if info.error is None]
+    import_images_as_links(config, infos, prefix, suffix, interpolation, projection, extension, hashed_images, deferred)
+
+def import_image(link: Btxs_LinkItem, directory: bpy.types.StringProperty, file: bpy.types.OperatorFileListElement, deduplicate: bool = True):
+    info = read_image_file_info(directory + file.name, hash_contents=deduplicate) # type: ignore
+    set_link_image(link, info, get_hashed_images() if deduplicate else None)
+
+def purge_images(images) -> int:
+    """Remove the images that have no users left, all at once. Returns the number of removed images."""
+    orphaned = [img for img in images if img.users == 0]
+    if len(orphaned) > 0:
+        bpy.data.batch_remove(orphaned)
+    return len(orphaned)
+
+def is_beantextures_image(img: bpy.types.Image) -> bool:
+    """Check if an image was created by Beantextures (imported as a link, or generated)."""
+    return IMAGE_TAG_PROP in img or IMAGE_HASH_PROP in img
+
+def delete_all_links(context, config: Btxs_ConfigEntry, purge: bool) -> int:
+    """Remove all links of a configuration at once. If `purge` is set, their images are removed too if they have no users left; returns the number of removed images."""
+    images = {link.img for link in config.links if link.img is not None}
+    config.links.clear()
+    config.active_link_idx = 0
+    bump_config_revision(config)
+    return purge_images(images) if purge else 0
 
 # Operator Classes
 
@@ -140,6 +261,7 @@ class BtxsOp_RemoveAllConfigs(Operator):
     def execute(self, context):
         settings = context.scene.beantextures_settings
         settings.configs.clear()
+        clear_validation_cache()
         return {'FINISHED'}
 
     def draw(self, context):
@@ -206,16 +328,98 @@ class BtxsOp_AutoImportImages(Operator):
     projection: bpy.props.EnumProperty(items=get_builtin_image_texture_prop_enum_items("projection"), name=get_builtin_image_texture_prop_name("projection"), description=get_builtin_image_texture_prop_description("projection"))
     extension: bpy.props.EnumProperty(items=get_builtin_image_texture_prop_enum_items("extension"), name=get_builtin_image_texture_prop_name("extension"), description=get_builtin_image_texture_prop_description("extension"))
 
+    deduplicate: bpy.props.BoolProperty(default=True, name="Merge Identical Images", description="Use a single image data-block for files with identical contents (e.g. repeated frames), including previously imported ones")
+    deferred_loading: bpy.props.BoolProperty(default=True, name="Deferred Loading", description="Only read the file headers on import; pixel data is loaded once an image is first displayed or rendered. Disable to load (and check) every image right away")
+
+    # Set when invoked from the UI, so that files are imported without
+    # blocking it; scripts import synchronously
+    use_modal: bpy.props.BoolProperty(default=False, options={'HIDDEN', 'SKIP_SAVE'})
+
     @classmethod
     def poll(cls, context):
         return True
 
+    def get_target_config(self, context) -> Btxs_ConfigEntry | None:
+        """Get the configuration the import started on, which may have been removed since (the UI isn't blocked while importing)."""
+        settings = context.scene.beantextures_settings
+        idx = settings.configs.find(self.config_name)
+        return settings.configs[idx] if idx != -1 else None
+
     def execute(self, context):
-        auto_import_images(context, self.directory, self.files, self.name_prefix, self.name_suffix, self.interpolation, self.projection, self.extension)
+        if not self.use_modal:
+            auto_import_images(context, self.directory, self.files, self.name_prefix, self.name_suffix, self.interpolation, self.projection, self.extension, self.deduplicate, self.deferred_loading)
+            return {'FINISHED'}
+
+        # The active configuration may change while importing
+        settings = context.scene.beantextures_settings
+        self.config_name = settings.configs[settings.active_config_idx].name
+
+        # Files are read in a thread pool, while the image data-blocks and
+        # links (bpy data) are created here on the main thread as the files
+        # become ready.
+        file_names = get_image_file_names(self.files)
+        self.job = ImageReadJob([self.directory + file_name for file_name in file_names], hash_contents=self.deduplicate)
+        self.hashed_images = get_hashed_images() if self.deduplicate else None
+        self.failed: list[str] = []
+        self.imported_count = 0
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(file_names))
+        self._timer = wm.event_timer_add(0.05, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
 
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.job.cancel()
+            self.finish(context)
+            self.report({'WARNING'}, f"Cancelled; imported {self.imported_count} image(s)")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # Links for all files that are ready are added in one go
+        infos = []
+        for info in self.job.poll():
+            if info.error is not None:
+                self.failed.append(f"{bpy.path.basename(info.filepath)}: {info.error}")
+            else:
+                infos.append(info)
+
+        config = self.get_target_config(context)
+        if config is None:
+            self.job.cancel()
+            self.finish(context)
+            self.report({'WARNING'}, f"Configuration '{self.config_name}' was removed; imported {self.imported_count} image(s)")
+            return {'CANCELLED'}
+
+        results = import_images_as_links(config, infos, self.name_prefix, self.name_suffix, self.interpolation, self.projection, self.extension, self.hashed_images, self.deferred_loading)
+        for info, (_, error) in zip(infos, results):
+            if error is not None:
+                self.failed.append(f"{bpy.path.basename(info.filepath)}: {error}")
+            self.imported_count += 1
+
+        context.window_manager.progress_update(self.job.done_count)
+
+        if not self.job.is_finished:
+            return {'RUNNING_MODAL'}
+
+        self.finish(context)
+        if len(self.failed) > 0:
+            self.report({'WARNING'}, "\n".join(["Some files couldn't be read:", *self.failed]))
+        self.report({'INFO'}, f"Imported {self.imported_count} image(s)")
         return {'FINISHED'}
 
+    def finish(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        if context.area is not None:
+            context.area.tag_redraw()
+
     def invoke(self, context, event):
+        self.use_modal = True
         wm = context.window_manager
         wm.fileselect_add(self)
         return {'RUNNING_MODAL'}
@@ -269,7 +473,9 @@ class BtxsOp_ClearLinks(Operator):
         settings = context.scene.beantextures_settings
         config = settings.configs[settings.active_config_idx]
 
-        delete_all_links(context, config, self.remove_data_blocks)
+        purged = delete_all_links(context, config, self.remove_data_blocks)
+        if purged > 0:
+            self.report({'INFO'}, f"Removed {purged} unused image(s)")
 
         return {'FINISHED'}
 
@@ -283,6 +489,99 @@ class BtxsOp_ClearLinks(Operator):
         wm = context.window_manager
         return wm.invoke_props_dialog(self)
 
+class BtxsOp_PurgeUnusedImages(Operator):
+    """Remove images imported or generated by Beantextures that aren't used anymore (by any configuration, node or other data-block). Only tagged images are considered: images imported by older versions of Beantextures are left alone"""
+    bl_label = "Purge Unused Beantextures Images"
+    bl_idname = "beantextures.purge_unused_images"
+
+    @classmethod
+    def poll(cls, context):
+        return True
+
+    def execute(self, context):
+        purged = purge_images([img for img in bpy.data.images if is_beantextures_image(img)])
+        untagged = sum(1 for img in bpy.data.images if img.users == 0 and not is_beantextures_image(img))
+        skipped = f"; {untagged} unused image(s) not tagged by Beantextures were left alone" if untagged > 0 else ""
+        self.report({'INFO'}, f"Removed {purged} unused tagged image(s){skipped}")
+        return {'FINISHED'}
+
+ENUM_DRIVER_VAR_NAME = "enum_item"
+
+def is_enum_node(node: bpy.types.Node) -> bool:
+    """Check if a node is an instance of an enum Beantextures node group."""
+    return (isinstance(node, bpy.types.ShaderNodeGroup) and node.node_tree is not None and node.node_tree.is_beantextures
+            and node.node_tree.beantextures_props.link_type == 'ENUM' and "Value" in node.inputs)
+
+def get_enum_prop_path(node: bpy.types.Node) -> str:
+    """Get the path (from the material) of the enum property of a node."""
+    return f"node_tree.nodes[\"{bpy.utils.escape_identifier(node.name)}\"].beantxs_enum_prop"
+
+def is_identity_generator(modifier: bpy.types.FModifier) -> bool:
+    """Check if an F-curve modifier is the Generator that `driver_add()` gives new drivers, which passes the driver value through unchanged."""
+    return (modifier.type == 'GENERATOR' and modifier.mode == 'POLYNOMIAL' and modifier.poly_order == 1 and not modifier.use_additive
+            and not modifier.mute and not modifier.use_restricted_range and not modifier.use_influence and tuple(modifier.coefficients) == (0.0, 1.0))
+
+def is_enum_driver_valid(fcurve: bpy.types.FCurve, material: bpy.types.Material, node: bpy.types.Node) -> bool:
+    """Check if a driver reads the enum property of `node` (and nothing else)."""
+    driver = fcurve.driver
+    if not driver.is_valid or driver.type != 'AVERAGE' or len(driver.variables) != 1 or len(fcurve.keyframe_points) > 0:
+        return False
+    # Drivers created by older versions keep their default Generator
+    if not all(is_identity_generator(modifier) for modifier in fcurve.modifiers):
+        return False
+
+    var = driver.variables[0]
+    target = var.targets[0]
+    return (var.type == 'SINGLE_PROP' and target.id_type == 'MATERIAL' and target.id == material
+            and target.data_path == get_enum_prop_path(node))
+
+def add_enum_driver(material: bpy.types.Material, node: bpy.types.Node) -> bpy.types.FCurve:
+    """(Re)create the driver that sets the `Value` input of an enum node from its enum property."""
+    node.inputs['Value'].driver_remove("default_value")
+    fcurve = node.inputs['Value'].driver_add("default_value")
+    # Drivers added from Python get a Generator modifier that does nothing
+    while len(fcurve.modifiers) > 0:
+        fcurve.modifiers.remove(fcurve.modifiers[0])
+    fcurve.driver.type = 'AVERAGE'
+
+    var = fcurve.driver.variables.new()
+    var.name = ENUM_DRIVER_VAR_NAME
+    var.targets[0].id_type = 'MATERIAL'
+    var.targets[0].id = material
+    var.targets[0].data_path = get_enum_prop_path(node)
+    return fcurve
+
+def wire_enum_drivers(materials=None) -> tuple[int, int, int]:
+    """Add drivers to the enum nodes of `materials` (all materials of the file by default) that don't have one, and repair the ones that are set up wrong.
+    Returns the number of `(added, repaired, skipped)` drivers, where skipped ones were already correct."""
+    if materials is None:
+        materials = bpy.data.materials
+
+    added, repaired, skipped = 0, 0, 0
+    for material in materials:
+        if not material.use_nodes or material.node_tree is None:
+            continue
+
+        node_tree = material.node_tree
+        # Drivers of the node tree by data path, instead of searching them once per node
+        drivers = {fcurve.data_path: fcurve for fcurve in node_tree.animation_data.drivers} if node_tree.animation_data is not None else {}
+
+        for node in node_tree.nodes:
+            if not is_enum_node(node):
+                continue
+
+            fcurve = drivers.get(node.inputs['Value'].path_from_id("default_value"))
+            if fcurve is None:
+                add_enum_driver(material, node)
+                added += 1
+            elif is_enum_driver_valid(fcurve, material, node):
+                skipped += 1
+            else:
+                add_enum_driver(material, node)
+                repaired += 1
+
+    return (added, repaired, skipped)
+
 class BtxsOp_InitializeEnum(Operator):
     """Initialize driver for an enum Beantextures node"""
     bl_label = "Add Driver"
@@ -293,18 +592,24 @@ class BtxsOp_InitializeEnum(Operator):
         return ((context.area.type == 'NODE_EDITOR') and hasattr(context, "active_node") and hasattr(context, "material"))
 
     def execute(self, context):
-        node = context.active_node
-        material = context.material
-        driver = node.inputs['Value'].driver_remove("default_value")
-        driver = node.inputs['Value'].driver_add("default_value")
-        driver.driver.type = 'AVERAGE'
-
-        var = driver.driver.variables.new()
-        var.name = "enum_item"
-        var.targets[0].id_type = 'MATERIAL'
-        var.targets[0].id = material
-        var.targets[0].data_path = f"node_tree.nodes[\"{node.name}\"].beantxs_enum_prop"
+        add_enum_driver(context.material, context.active_node)
+        return {'FINISHED'}
 
+class BtxsOp_InitializeAllEnums(Operator):
+    """Add or repair the drivers of all enum Beantextures nodes in every material of the file"""
+    bl_label = "Add All Drivers"
+    bl_idname = "beantextures.init_all_enum_drivers"
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return len(bpy.data.materials) > 0
+
+    def execute(self, context):
+        added, repaired, skipped = wire_enum_drivers()
+        if added + repaired + skipped == 0:
+            self.report({'INFO'}, "No enum Beantextures nodes found")
+        else:
+            self.report({'INFO'}, f"Added {added}, repaired {repaired} driver(s); {skipped} already set up")
         return {'FINISHED'}
 
 def register():
@@ -317,7 +622,9 @@ def register():
     bpy.utils.register_class(BtxsOp_AutoImportImages) 
     bpy.utils.register_class(BtxsOp_OpenImage) 
     bpy.utils.register_class(BtxsOp_ClearLinks) 
+    bpy.utils.register_class(BtxsOp_PurgeUnusedImages) 
     bpy.utils.register_class(BtxsOp_InitializeEnum) 
+    bpy.utils.register_class(BtxsOp_InitializeAllEnums) 
 
 def unregister():
     bpy.utils.unregister_class(BtxsOp_NewNodeGroup)
@@ -328,5 +635,7 @@ def unregister():
     bpy.utils.unregister_class(BtxsOp_RemoveAllConfigs) 
     bpy.utils.unregister_class(BtxsOp_AutoImportImages) 
     bpy.utils.unregister_class(BtxsOp_OpenImage) 
-    bpy.utils.unregister_class(BtxsOp_ClearLinks) 
-    bpy.utils.unregister_class(BtxsOp_InitializeEnum) 
+    bpy.utils.unregister_class(BtxsOp_ClearLinks)
+    bpy.utils.unregister_class(BtxsOp_PurgeUnusedImages) 
+    bpy.utils.unregister_class(BtxsOp_InitializeEnum)
+    bpy.utils.unregister_class(BtxsOp_InitializeAllEnums) 
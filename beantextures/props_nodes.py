@@ -1,25 +1,70 @@
 """Custom attributes for Blender node and node tree classes."""
 
 import bpy
+from bpy.app.handlers import persistent
 from .props_settings import beantextures_link_type
 
+# {node tree pointer: (enum revision, enum items)}
+#
+# FIXME: there seems to be a known Blender issue that causes some kinds of
+# strings like special characters to turn to garbage data (probably memory
+# management issues). It is stated here:
+# https://docs.blender.org/api/master/bpy.props.html#bpy.props.EnumProperty
+# as a workaround, the items are kept in this global cache so the strings
+# inside will never get GCed while they're in use.
+BTXS_CACHE_ENUM_ITEMS: dict[int, tuple[int, list[tuple[str, str, str, int]]]] = {}
+
 def generate_linking_enum_items(self: bpy.types.ShaderNodeGroup, context):
-    """Used by node group instances. This function returns a list of enum items based on the respecting node tree's (not the instance itself!) `enum_items` property."""
-    # FIXME: there seems to be a known Blender issue that causes some kinds of
-    # strings like special characters to turn to garbage data (probably memory
-    # management issues). It is stated here:
-    # https://docs.blender.org/api/master/bpy.props.html#bpy.props.EnumProperty
-    # as a workaround, a global variable is used so the strings inside will
-    # never get GCed.
-    global BTXS_CACHE_GENERATE_LINKING_ENUM_ITEMS_DATA
-    items = self.node_tree.beantextures_props.enum_items
-    BTXS_CACHE_GENERATE_LINKING_ENUM_ITEMS_DATA = [(str(item.idx), item.name, item.name, item.idx) for item in items]
-    return BTXS_CACHE_GENERATE_LINKING_ENUM_ITEMS_DATA
+    """Used by node group instances. This function returns a list of enum items based on the respecting node tree's (not the instance itself!) `enum_items` property.
+    The items are only built again when the node tree's `enum_revision` changes."""
+    if self.node_tree is None:
+        return []
+
+    props = self.node_tree.beantextures_props
+    key = self.node_tree.as_pointer()
+    cached = BTXS_CACHE_ENUM_ITEMS.get(key)
+    if cached is not None and cached[0] == props.enum_revision and len(cached[1]) == len(props.enum_items):
+        return cached[1]
+
+    items = [(str(item.idx), item.name, item.name, item.idx) for item in props.enum_items]
+    BTXS_CACHE_ENUM_ITEMS[key] = (props.enum_revision, items)
+    return items
+
+@persistent
+def clear_enum_items_cache(*args):
+    # Node trees may have moved in memory (or been replaced by other ones)
+    BTXS_CACHE_ENUM_ITEMS.clear()
 
 class Btxs_EnumItem(bpy.types.PropertyGroup):
     name: bpy.props.StringProperty(name="Enum item name", description="Human-readable name assigned by user")
     idx: bpy.props.IntProperty(name="Enum item index", description="Integer linked to enum item")
 
+class Btxs_BuildStats(bpy.types.PropertyGroup):
+    """Statistics of the last generation of a node tree. Times are in seconds, and only measured if the generation was profiled."""
+    generation_mode: bpy.props.StringProperty(name="Generation mode", description="Generation mode that was actually used (empty if never generated)")
+    profiled: bpy.props.BoolProperty(name="Profiled", description="Whether or not times and graph depth were measured")
+
+    nodes_added: bpy.props.IntProperty(name="Nodes added")
+    nodes_updated: bpy.props.IntProperty(name="Nodes updated")
+    nodes_removed: bpy.props.IntProperty(name="Nodes removed")
+    links_added: bpy.props.IntProperty(name="Links added")
+    links_removed: bpy.props.IntProperty(name="Links removed")
+    sockets_added: bpy.props.IntProperty(name="Sockets added")
+    sockets_removed: bpy.props.IntProperty(name="Sockets removed")
+    socket_moves: bpy.props.IntProperty(name="Socket moves", description="Amount of interface moves done to sort the input sockets")
+    node_count: bpy.props.IntProperty(name="Node count")
+    link_count: bpy.props.IntProperty(name="Link count")
+    graph_depth: bpy.props.IntProperty(name="Graph depth", description="Amount of nodes on the longest path through the node tree")
+
+    total_time: bpy.props.FloatProperty(name="Total time")
+    prepare_time: bpy.props.FloatProperty(name="Preparation time", description="Time spent checking the generation mode (and packing the atlas)")
+    sockets_time: bpy.props.FloatProperty(name="Socket reconciliation time")
+    build_time: bpy.props.FloatProperty(name="Build time", description="Time spent adding, updating and connecting nodes")
+    node_creation_time: bpy.props.FloatProperty(name="Node creation time", description="Part of the build time spent creating nodes")
+    link_creation_time: bpy.props.FloatProperty(name="Link creation time", description="Part of the build time spent creating links")
+    sort_time: bpy.props.FloatProperty(name="Socket sorting time")
+    cleanup_time: bpy.props.FloatProperty(name="Cleanup time", description="Time spent removing unused nodes and links")
+
 class Btxs_NodeTree_props(bpy.types.PropertyGroup):
     link_type: bpy.props.EnumProperty(items=beantextures_link_type, name="Linking type", description="Defines how Beantextures Node links values to images")
 
@@ -28,16 +73,38 @@ class Btxs_NodeTree_props(bpy.types.PropertyGroup):
     # Technically, our enum linking is just a fancy wrapper
     # to the int linking.
     enum_items: bpy.props.CollectionProperty(type=Btxs_EnumItem, name="Enum items", description="Available enum items; only used if linking type is set to enum")
+    enum_revision: bpy.props.IntProperty(name="Enum items revision", description="Changed whenever the enum items are rewritten, so that the items given to Blender can be cached", options={'HIDDEN'})
+
+    # Texture atlas (and lookup table) generation mode specific properties
+    atlas_img: bpy.props.PointerProperty(type=bpy.types.Image, name="Atlas image", description="Generated image holding all linked images; only used if the node tree is generated as a texture atlas or with a lookup table")
+    lookup_img: bpy.props.PointerProperty(type=bpy.types.Image, name="Lookup table image", description="Generated image mapping every value to its cell of the atlas image; only used if the node tree is generated with a lookup table")
+    sequence_img: bpy.props.PointerProperty(type=bpy.types.Image, name="Sequence image", description="Image sequence made of the linked images; only used if the node tree is generated as an image sequence")
+
+    # Shared selector node group specific properties
+    selector_signature: bpy.props.StringProperty(name="Selector signature", description="Structure of the configurations sharing this node group as their selector; only set on selector node groups")
+
+    last_build_stats: bpy.props.PointerProperty(type=Btxs_BuildStats, name="Last build statistics", description="Statistics of the last generation of the node tree")
 
 def register():
     bpy.utils.register_class(Btxs_EnumItem)
+    bpy.utils.register_class(Btxs_BuildStats)
     bpy.utils.register_class(Btxs_NodeTree_props)
 
     bpy.types.NodeTree.is_beantextures = bpy.props.BoolProperty(name="Whether or not node tree is a Beantextures node")
     bpy.types.NodeTree.beantextures_props = bpy.props.PointerProperty(type=Btxs_NodeTree_props)
     bpy.types.ShaderNodeGroup.beantxs_enum_prop = bpy.props.EnumProperty(items=generate_linking_enum_items, name="Beantextures enum driver property")
 
+    bpy.app.handlers.load_post.append(clear_enum_items_cache)
+    bpy.app.handlers.undo_post.append(clear_enum_items_cache)
+    bpy.app.handlers.redo_post.append(clear_enum_items_cache)
+
 
 def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if clear_enum_items_cache in handlers:
+            handlers.remove(clear_enum_items_cache)
+    BTXS_CACHE_ENUM_ITEMS.clear()
+
     bpy.utils.unregister_class(Btxs_EnumItem)
+    bpy.utils.unregister_class(Btxs_BuildStats)
     bpy.utils.unregister_class(Btxs_NodeTree_props)
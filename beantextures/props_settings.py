@@ -1,6 +1,8 @@
 """Custom attributes for node generation settings under the node editor sidebar."""
 
+from contextlib import contextmanager
 import bpy
+from .utils_image import read_image_file_info
 
 beantextures_link_type: list[tuple[str, str, str, int]] = [
         ('INT_SIMPLE', "Int (Simple)", "Simple integer linking", 0),
@@ -9,6 +11,19 @@ beantextures_link_type: list[tuple[str, str, str, int]] = [
         ('ENUM', "Enum", "Enum linking", 3),
 ]
 
+beantextures_generation_mode: list[tuple[str, str, str, int]] = [
+        ('CHAIN', "Mix Chain", "Chain one mix node per link; shader depth grows with the amount of links", 0),
+        ('TREE', "Balanced Tree", "Select links with a binary tree of compare/mix nodes; shader depth grows logarithmically with the amount of links", 1),
+        ('ATLAS', "Texture Atlas", "Pack all linked images into one image and offset its UV by the value (Int (Simple) and Enum linking only; every link needs an image)", 2),
+        ('LOOKUP', "Lookup Table", "Pack the distinct linked images into one image and pick the image of the value from a lookup table image; the shader cost doesn't grow with the amount of links (whole number values only, i.e. not Float linking; every link needs an image)", 3),
+        ('SEQUENCE', "Image Sequence", "Load the linked images as one image sequence and pick its frame by the value, so that only the shown image is loaded (Int (Simple) and Enum linking only; the links' images have to be contiguously numbered files; all instances of the node group show the same image)", 4),
+]
+
+beantextures_socket_sort_mode: list[tuple[str, str, str, int]] = [
+        ('NATURAL', "Natural", "Sort numbers in socket names by their value (e.g. \"2\" comes before \"10\")", 0),
+        ('ALPHABETICAL', "Alphabetical", "Sort socket names character by character (e.g. \"10\" comes before \"2\")", 1),
+]
+
 def get_builtin_image_texture_prop_enum_items(property_name: str) -> list[tuple[str, str, str, int]]:
     """Get the official image texture node's enum for given property name."""
     items = bpy.types.ShaderNodeTexImage.bl_rna.properties[property_name].enum_items #type: ignore
@@ -22,44 +37,99 @@ def get_builtin_image_texture_prop_description(property_name: str) -> str:
     """Get the official image texture node's (human readable) property description."""
     return bpy.types.ShaderNodeTexImage.bl_rna.properties[property_name].description
 
+def bump_config_revision(config):
+    """Mark a configuration as changed, so that results computed from it (e.g. validation reports) are computed again. Revisions are unique within a scene."""
+    settings = config.id_data.beantextures_settings
+    settings.config_revision += 1
+    config.revision = settings.config_revision
+
+# Nesting depth of `batch_link_updates()`; link updates don't bump
+# revisions while it's above zero
+link_updates_suppressed = 0
+
+@contextmanager
+def batch_link_updates(config):
+    """Mark a configuration as changed only once, after the `with` block, instead of on every link property change within it."""
+    global link_updates_suppressed
+    link_updates_suppressed += 1
+    try:
+        yield
+    finally:
+        link_updates_suppressed -= 1
+        bump_config_revision(config)
+
+def update_link(self, context):
+    if link_updates_suppressed > 0:
+        return
+    # Links are stored at `<config path>.links[<index>]`
+    path = self.path_from_id()
+    bump_config_revision(self.id_data.path_resolve(path[:path.rindex(".links[")]))
+
+def update_link_image(self, context):
+    """Read the size and alpha presence of a newly picked image from its file header, so that they don't describe the previous image."""
+    if link_updates_suppressed > 0:
+        # Set by the importer itself (see `ops_settings.set_link_image()`)
+        return
+
+    img = self.img
+    self.img_size = (0, 0)
+    self.img_has_alpha = False
+    if img is not None and img.source == 'FILE' and img.packed_file is None and img.filepath != "":
+        info = read_image_file_info(bpy.path.abspath(img.filepath, library=img.library))
+        if info.error is None and info.width is not None:
+            self.img_size = (info.width, info.height or 0)
+            self.img_has_alpha = bool(info.has_alpha)
+    update_link(self, context)
+
+def update_config(self, context):
+    bump_config_revision(self)
+
 class Btxs_LinkItem_ImageProps(bpy.types.PropertyGroup):
     interpolation: bpy.props.EnumProperty(items=get_builtin_image_texture_prop_enum_items("interpolation"), name=get_builtin_image_texture_prop_name("interpolation"), description=get_builtin_image_texture_prop_description("interpolation"))
     projection: bpy.props.EnumProperty(items=get_builtin_image_texture_prop_enum_items("projection"), name=get_builtin_image_texture_prop_name("projection"), description=get_builtin_image_texture_prop_description("projection"))
     extension: bpy.props.EnumProperty(items=get_builtin_image_texture_prop_enum_items("extension"), name=get_builtin_image_texture_prop_name("extension"), description=get_builtin_image_texture_prop_description("extension"))
 
 class Btxs_LinkItem(bpy.types.PropertyGroup):
-    name: bpy.props.StringProperty(name="Link Name", description="Name of a Beantextures image link")
-    img: bpy.props.PointerProperty(type=bpy.types.Image, name="Linked Image")
+    name: bpy.props.StringProperty(name="Link Name", description="Name of a Beantextures image link", update=update_link)
+    img: bpy.props.PointerProperty(type=bpy.types.Image, name="Linked Image", update=update_link_image)
+    img_size: bpy.props.IntVectorProperty(size=2, name="Image Size", description="Size of the linked image as read from its file header (zero if unknown)")
+    img_has_alpha: bpy.props.BoolProperty(name="Image Has Alpha", description="Whether or not the linked image file has an alpha channel, as read from its file header")
 
-    int_simple_val: bpy.props.IntProperty(name="Int Value")
-    int_lt: bpy.props.IntProperty(name="When Int is Less than")
-    int_gt: bpy.props.IntProperty(name="When Int is Greater than")
+    int_simple_val: bpy.props.IntProperty(name="Int Value", update=update_link)
+    int_lt: bpy.props.IntProperty(name="When Int is Less than", update=update_link)
+    int_gt: bpy.props.IntProperty(name="When Int is Greater than", update=update_link)
 
-    float_lt: bpy.props.FloatProperty(name="When Float is Less Than")
-    float_gt: bpy.props.FloatProperty(name="When Float is Greater Than")
+    float_lt: bpy.props.FloatProperty(name="When Float is Less Than", update=update_link)
+    float_gt: bpy.props.FloatProperty(name="When Float is Greater Than", update=update_link)
 
     image_node_properties: bpy.props.PointerProperty(type=Btxs_LinkItem_ImageProps, name="Image Node Properties", description="Properties to assign to image nodes")
 
 class Btxs_ConfigEntry(bpy.types.PropertyGroup):
     name: bpy.props.StringProperty(name="Config Name", description="Name of Beantextures configuration entry")
     fallback_img: bpy.props.PointerProperty(type=bpy.types.Image, name="Fallback Image", description="Image to use when user-defined value does not match any link and therefore image (will output black if this is not set)")
-    linking_type: bpy.props.EnumProperty(items=beantextures_link_type, name="Linking Type", description="Approach to link values to images")
+    linking_type: bpy.props.EnumProperty(items=beantextures_link_type, name="Linking Type", description="Approach to link values to images", update=update_config)
+    generation_mode: bpy.props.EnumProperty(items=beantextures_generation_mode, name="Generation Mode", description="Structure of the generated node tree")
+    share_comparisons: bpy.props.BoolProperty(default=False, name="Share Comparisons", description="Use one math node per distinct threshold (and a single Compare node for links bound to one whole number), instead of a full set of comparison nodes for every link. Not used by the texture atlas and lookup table modes")
+    share_node_group: bpy.props.BoolProperty(default=False, name="Share Node Group", description="Put the comparison and mix nodes into a node group that is shared with every configuration of the same structure (linking type, mode, options and link ranges); the node tree then only holds the images. Not used by the texture atlas and lookup table modes")
     target_node_tree: bpy.props.PointerProperty(type=bpy.types.NodeTree, name="Target Node Tree", description="Node tree to be configured")
     output_alpha: bpy.props.BoolProperty(default=False, name="Output Alpha", description="Whether or not the generated node should output alpha of the active image")
     input_vector: bpy.props.BoolProperty(default=False, name="Input Vector", description="Whether or not the generated node should have vector input (shared for all image textures)")
+    socket_sort_mode: bpy.props.EnumProperty(items=beantextures_socket_sort_mode, name="Socket Order", description="How the input sockets of links without an image are sorted")
     active_link_idx: bpy.props.IntProperty(name="Index of Active Link")
     links: bpy.props.CollectionProperty(type=Btxs_LinkItem, name="Configured Links", description="Collection of defined value-image links")
+    revision: bpy.props.IntProperty(name="Revision", description="Changed whenever the links or their settings change (see `bump_config_revision()`)", options={'HIDDEN'})
 
-    int_max: bpy.props.IntProperty(name="Maximum Int Value", default=2)
-    int_min: bpy.props.IntProperty(name="Maximum Int Value", default=1)
+    int_max: bpy.props.IntProperty(name="Maximum Int Value", default=2, update=update_config)
+    int_min: bpy.props.IntProperty(name="Maximum Int Value", default=1, update=update_config)
 
-    float_max: bpy.props.FloatProperty(name="Maximum Float Value", default=2.0)
-    float_min: bpy.props.FloatProperty(name="Minimum Float Value", default=0.9)
+    float_max: bpy.props.FloatProperty(name="Maximum Float Value", default=2.0, update=update_config)
+    float_min: bpy.props.FloatProperty(name="Minimum Float Value", default=0.9, update=update_config)
 
 class Btxs_GlobalSettings(bpy.types.PropertyGroup):
     node_group_adder_name: bpy.props.StringProperty(name="Node Group Name", description="Name to assign for the new group", default="Beantextures")
     configs: bpy.props.CollectionProperty(type=Btxs_ConfigEntry, name="Beantextures Configurations", description="List of stored configurations for active scene")
     active_config_idx: bpy.props.IntProperty(name="Index of Active Configuration")
+    config_revision: bpy.props.IntProperty(name="Configuration Revision Counter", description="Last revision given to a configuration", options={'HIDDEN'})
     #link_err_msg: bpy.props.Str
 
 def register():
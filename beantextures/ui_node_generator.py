@@ -1,116 +1,26 @@
 """User interface for the node generator."""
 import bpy
 from bpy.types import Panel, UIList
-from .ops_settings import BtxsOp_AutoImportImages, BtxsOp_ClearLinks, BtxsOp_NewNodeGroup, BtxsOp_InitializeEnum, BtxsOp_OpenImage, BtxsOp_NewLink, BtxsOp_RemoveLink
-from .props_settings import Btxs_LinkItem, Btxs_ConfigEntry
+from .ops_settings import BtxsOp_AutoImportImages, BtxsOp_ClearLinks, BtxsOp_PurgeUnusedImages, BtxsOp_NewNodeGroup, BtxsOp_InitializeEnum, BtxsOp_InitializeAllEnums, BtxsOp_OpenImage, BtxsOp_NewLink, BtxsOp_RemoveLink
+from .props_settings import Btxs_ConfigEntry
+from .utils_validation import ValidationReport, get_validation_report
 
 # Helper functions
 
-def search_for_duplicate_int_simple_link_value(context, link) -> tuple[bool, str]:
-    """Check if link value had been used by other link(s). Returns `(True, <name>)` if duplicate is found, where `name` is the name of the first matched link. Otherwise, returns `(False, 0)`."""
-    settings = context.scene.beantextures_settings
-    config = settings.configs[settings.active_config_idx]
-    for check_link in config.links:
-        if check_link == link:
-            continue
-        if check_link.int_simple_val == link.int_simple_val:
-            return (True, check_link.name)
-    return (False, "")
-
-def search_for_duplicate_int_link_value(context, link) -> tuple[bool, str]:
-    """Check if link range value overlaps other link(s). Returns `(True, <name>)` if duplicate is found, where `name` is the name of the first matched link. Otherwise, returns `(False, 0)`."""
-    settings = context.scene.beantextures_settings
-    config = settings.configs[settings.active_config_idx]
-    for check_link in config.links:
-        if check_link == link:
-            continue
-        if link.int_gt >= check_link.int_gt and link.int_lt <= check_link.int_lt:
-            return (True, check_link.name)
-    return (False, "")
-
-def search_for_duplicate_float_link_value(context, link) -> tuple[bool, str]:
-    """Check if link range value overlaps other link(s). Returns `(True, <name>)` if duplicate is found, where `name` is the name of the first matched link. Otherwise, returns `(False, 0)`."""
-    settings = context.scene.beantextures_settings
-    config = settings.configs[settings.active_config_idx]
-    for check_link in config.links:
-        if check_link == link:
-            continue
-        if link.float_gt >= check_link.float_gt and link.float_lt <= check_link.float_lt:
-            return (True, check_link.name)
-    return (False, "")
-
-def search_for_duplicate_enum_name(context, link) -> bool:
-    """Check if another link with the same name already exists."""
-    settings = context.scene.beantextures_settings
-    config = settings.configs[settings.active_config_idx]
-    for check_link in config.links:
-        if check_link == link:
-            continue
-        if link.name == check_link.name:
-            return True
-    return False
-
-# Warning checkers
-
-def check_warnings_general(context, link: Btxs_LinkItem, config: Btxs_ConfigEntry) -> list[str]:
-    warnings: list[str] = []
-    if link.name == 'Value' or link.name == 'Vector' or link.name == 'Image' or link.name == 'Alpha':
-        warnings.append("Please choose other non-reserved link name.")
-
-    return warnings
-
-def check_warnings_int_simple(context, link: Btxs_LinkItem, config: Btxs_ConfigEntry) -> list[str]:
-    warnings: list[str] = []
-    if (search_result := search_for_duplicate_int_simple_link_value(context, link))[0]:
-        warnings.append(f"Index has been used by link '{search_result[1]}'.")
-
-    if link.int_simple_val > config.int_max or link.int_simple_val < config.int_min:
-        warnings.append(f"Bound number is out of the set max/min range.")
-
-    if search_for_duplicate_enum_name(context, link):
-        warnings.append("Link with similar name already exists.")
-
-    return warnings
-
-def check_warnings_int(context, link: Btxs_LinkItem, config: Btxs_ConfigEntry) -> list[str]:
-    warnings: list[str] = []
-    if (search_result := search_for_duplicate_int_link_value(context, link))[0]:
-        warnings.append(f"Range overlaps with link '{search_result[1]}'.")
-
-    if link.int_lt < link.int_gt:
-        warnings.append("The assigned greater than digit is bigger than its less than!")
-
-    if link.int_lt > config.int_max + 1 or link.int_gt < config.int_min - 1:
-        warnings.append("Range is out of the set max/min range!")
-
-    if search_for_duplicate_enum_name(context, link):
-        warnings.append("Link with similar name already exists.")
-
-    return warnings
-
-def check_warnings_float(context, link: Btxs_LinkItem, config: Btxs_ConfigEntry) -> list[str]:
-    warnings: list[str] = []
-    if (search_result := search_for_duplicate_float_link_value(context, link))[0]:
-        warnings.append(f"Range overlaps with link '{search_result[1]}'.")
-
-    if link.float_lt < link.float_gt:
-        warnings.append("Range is invalid!")
-
-    if link.float_lt > config.float_max or link.float_gt < config.float_min:
-        warnings.append("Range is out of the set max/min range.")
-
-    if search_for_duplicate_enum_name(context, link):
-        warnings.append("Link with similar name already exists.")
-
-    return warnings
-
-def check_warnings_enum(context, link: Btxs_LinkItem, config: Btxs_ConfigEntry) -> list[str]:
-    warnings: list[str] = []
-
-    if search_for_duplicate_enum_name(context, link):
-        warnings.append("Link with similar name already exists.")
-
-    return warnings
+def collect_config_warnings(config: Btxs_ConfigEntry, report: ValidationReport | None = None) -> dict[str, list[str]]:
+    """Check the whole configuration (see `get_validation_report()`), unless its `report` is given. Returns `{location: ["warning1", "warning2"], ...}`; locations without warnings are left out."""
+    if report is None:
+        report = get_validation_report(config)
+    errors: dict[str, list[str]] = {}
+
+    if len(report.config_warnings) > 0:
+        errors.update({'configuration': report.config_warnings})
+
+    for link, warnings in zip(config.links, report.link_warnings):
+        if len(warnings) > 0:
+            errors.update({f"link '{link.name}'": warnings})
+
+    return errors
 
 # Panel definitions
 
@@ -161,6 +71,10 @@ class ConfigsPanel(BeantexturesNodePanel):
         col.operator("beantextures.remove_config", icon='REMOVE', text="")
         col.separator()
         col.operator("beantextures.remove_all_configs", icon='X', text="")
+        col.operator("beantextures.generate_all_node_trees", icon='FILE_REFRESH', text="")
+        col.separator()
+        col.operator("beantextures.export_configs", icon='EXPORT', text="")
+        col.operator("beantextures.import_configs", icon='IMPORT', text="")
 
         try:
             idx = settings.active_config_idx
@@ -168,10 +82,16 @@ class ConfigsPanel(BeantexturesNodePanel):
 
             col = layout.column()
             col.prop(item, "linking_type", text="Linking Type")
+            col.prop(item, "generation_mode", text="Generation Mode")
+            if item.generation_mode == 'SEQUENCE':
+                col.label(text="One image is shared by all instances of the node group.", icon='INFO')
+            col.prop(item, "share_comparisons", text="Share Comparisons")
+            col.prop(item, "share_node_group", text="Share Node Group")
             col.prop(item, "target_node_tree", text="Target Node Group")
             col.prop(item, "fallback_img", text="Fallback Image")
             col.prop(item, "output_alpha", text="Output Alpha")
             col.prop(item, "input_vector", text="Input Vector")
+            col.prop(item, "socket_sort_mode", text="Socket Order")
 
             match item.linking_type:
                 case 'INT_SIMPLE':
@@ -192,6 +112,15 @@ class ConfigsPanel(BeantexturesNodePanel):
             col.separator()
             if item.target_node_tree is not None and item.target_node_tree.is_beantextures:
                 col.operator("beantextures.generate_node_tree", text="Re-generate Node Tree", icon='FILE_REFRESH')
+
+                build_stats = item.target_node_tree.beantextures_props.last_build_stats
+                if build_stats.generation_mode != "":
+                    text = f"Last build: {build_stats.node_count} nodes, {build_stats.link_count} links"
+                    if build_stats.profiled:
+                        text += f", depth {build_stats.graph_depth}, {build_stats.total_time * 1000:.1f} ms"
+                    row = col.row()
+                    row.label(text=text, icon='INFO')
+                    row.operator("beantextures.export_build_stats", text="", icon='EXPORT')
             else:
                 col.operator("beantextures.generate_node_tree", text="Generate Node Tree", icon='NODETREE')
 
@@ -232,44 +161,32 @@ class LinksPanel(BeantexturesNodePanel):
             col.separator()
             col.operator(BtxsOp_ClearLinks.bl_idname, icon='X', text="")
             col.operator(BtxsOp_AutoImportImages.bl_idname, icon='FILE_FOLDER', text="")
+            col.operator(BtxsOp_PurgeUnusedImages.bl_idname, icon='ORPHAN_DATA', text="")
 
             layout.use_property_split = True
             col = layout.column()
             link_idx = active_config.active_link_idx
             active_link = active_config.links[link_idx]
 
+            if (warnings := get_validation_report(active_config).link_warnings[link_idx]):
+                for msg in warnings:
+                    col.label(text="Warning: " + msg, icon='ERROR')
+                col.separator()
+
             match active_config.linking_type:
                 case 'INT_SIMPLE':
-                    if (warnings := check_warnings_int_simple(context, active_link, active_config)):
-                        for msg in warnings:
-                            col.label(text="Warning: " + msg, icon='ERROR')
-                        col.separator()
-
                     col.prop(active_link, "int_simple_val", text="Bind to")
 
                 case 'INT':
-                    if (warnings := check_warnings_int(context, active_link, active_config)):
-                        for msg in warnings:
-                            col.label(text="Warning: " + msg, icon='ERROR')
-                        col.separator()
-
                     col.prop(active_link, "int_gt", text="Greater Than")
                     col.prop(active_link, "int_lt", text="Less Than")
 
                 case 'FLOAT':
-                    if (warnings := check_warnings_float(context, active_link, active_config)):
-                        for msg in warnings:
-                            col.label(text="Warning: " + msg, icon='ERROR')
-                        col.separator()
-
                     col.prop(active_link, "float_gt", text="Greater Than")
                     col.prop(active_link, "float_lt", text="Less Than")
 
                 case 'ENUM':
-                    if (warnings := check_warnings_enum(context, active_link, active_config)):
-                        for msg in warnings:
-                            col.label(text="Warning: " + msg, icon='ERROR')
-                        col.separator()
+                    pass
 
                 case _:
                     return
@@ -279,6 +196,11 @@ class LinksPanel(BeantexturesNodePanel):
             row.operator(BtxsOp_OpenImage.bl_idname, text="", icon='FILE_FOLDER')
 
             if active_link.img is not None:
+                # Read from the recorded header info, as querying the image
+                # itself would load its pixel data
+                if active_link.img_size[0] > 0:
+                    alpha_text = "with alpha" if active_link.img_has_alpha else "no alpha"
+                    col.label(text=f"{active_link.img_size[0]} × {active_link.img_size[1]} ({alpha_text})", icon='IMAGE_DATA')
                 col.prop(active_link.image_node_properties, "interpolation")
                 col.prop(active_link.image_node_properties, "projection")
                 col.prop(active_link.image_node_properties, "extension")
@@ -309,10 +231,17 @@ class InspectorPanel(BeantexturesNodePanel):
         # TODO: maybe use a more descriptive name
         col.label(text=f"Linking type: {node.node_tree.beantextures_props.link_type}")
 
+        if node.node_tree.beantextures_props.last_build_stats.generation_mode == 'SEQUENCE':
+            col.label(text="Image sequence: all instances show the same image.", icon='INFO')
+            col.operator("beantextures.follow_sequence_instance", text="Follow This Instance", icon='DRIVER')
+            col.separator()
+
         if node.node_tree.beantextures_props.link_type == 'ENUM':
             col.prop(node, "beantxs_enum_prop", text="Enum selection")
             col.separator()
-            col.operator(BtxsOp_InitializeEnum.bl_idname, text="Add Driver", icon='DRIVER')
+            row = col.row(align=True)
+            row.operator(BtxsOp_InitializeEnum.bl_idname, text="Add Driver", icon='DRIVER')
+            row.operator(BtxsOp_InitializeAllEnums.bl_idname, text="All Materials", icon='DRIVER')
 
 def register():
     bpy.utils.register_class(BEANTEXTURES_UL_ConfigsListRenderer)
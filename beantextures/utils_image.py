@@ -0,0 +1,317 @@
+"""Helper functions to work with image data."""
+import os
+import re
+import math
+import struct
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+import bpy
+import numpy as np
+from bpy.types import Image
+
+# Largest texture size (in pixels, per side) that can be expected to be supported by most GPUs
+ATLAS_MAX_SIZE = 16384
+
+# Custom property marking images created by Beantextures (imported as links or generated)
+IMAGE_TAG_PROP = "beantextures"
+
+def get_atlas_grid(cell_count: int) -> tuple[int, int]:
+    """Get the `(columns, rows)` of the most square-like grid that fits `cell_count` cells."""
+    cols = max(1, math.ceil(math.sqrt(cell_count)))
+    rows = max(1, math.ceil(cell_count / cols))
+    return (cols, rows)
+
+def read_image_pixels(img: Image) -> np.ndarray:
+    """Read the pixels of an image as a `(height, width, 4)` float array."""
+    width, height = img.size
+    channels = img.channels
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    img.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(height, width, channels)
+
+    if channels == 4:
+        return pixels
+
+    # Grayscale/RGB images: pad to RGBA with an opaque alpha channel
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    rgba[:, :, :3] = pixels[:, :, :3] if channels >= 3 else pixels[:, :, :1]
+    return rgba
+
+def resize_pixels_nearest(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize a `(height, width, 4)` pixel array with nearest neighbour sampling."""
+    src_height, src_width = pixels.shape[:2]
+    if (src_width, src_height) == (width, height):
+        return pixels
+
+    ys = np.arange(height) * src_height // height
+    xs = np.arange(width) * src_width // width
+    return pixels[ys[:, None], xs[None, :]]
+
+def srgb_to_linear(pixels: np.ndarray) -> np.ndarray:
+    """Convert sRGB encoded RGBA pixels to linear ones (alpha is left as-is)."""
+    rgb = pixels[..., :3]
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return np.concatenate((linear, pixels[..., 3:]), axis=-1).astype(np.float32)
+
+def is_srgb_encoded(img: Image) -> bool:
+    """Check if the pixels of an image (as read from `Image.pixels`) are sRGB encoded. Float images are always read as linear; byte images as stored."""
+    return not img.is_float and img.colorspace_settings.name == 'sRGB'
+
+class PackedAtlas(NamedTuple):
+    """Result of `pack_images_to_atlas()`."""
+    atlas: Image
+    cols: int
+    rows: int
+    # Names of images that were resized to fit their cell
+    resized: list[str]
+    # Set if color and non-color (data) images were packed together
+    mixed_color_data: bool = False
+
+def pack_images_to_atlas(cells: list[Image | None], fill: Image | None = None, atlas: Image | None = None, name: str = "Atlas") -> PackedAtlas | None:
+    """Pack images into a grid atlas image, where the image at index `i` is placed at column `i % columns` and row `i // columns` (counting from the bottom).
+    All cells share the size of the largest image; smaller ones are resized (nearest neighbour). Empty (`None`) cells are filled with `fill`, or transparent black if it isn't set.
+    The atlas is a float (linear) image if any of the images is a float image, in which case sRGB encoded images are converted to linear; otherwise it keeps the 8-bit sRGB encoded values.
+    The pixels of `atlas` are overwritten if it's set (it's replaced if its buffer type doesn't match); otherwise a new image named `name` is created.
+    Returns `None` if there's nothing to pack or the atlas would be too large.
+    """
+    sources = [img for img in (*cells, fill) if img is not None and img.size[0] > 0 and img.size[1] > 0]
+    sized = [img for img in cells if img is not None and img.size[0] > 0 and img.size[1] > 0]
+    if len(sized) == 0:
+        return None
+
+    cell_width = max(img.size[0] for img in sized)
+    cell_height = max(img.size[1] for img in sized)
+    cols, rows = get_atlas_grid(len(cells))
+
+    if cols * cell_width > ATLAS_MAX_SIZE or rows * cell_height > ATLAS_MAX_SIZE:
+        return None
+
+    float_buffer = any(img.is_float for img in sources)
+    data_images = [img.colorspace_settings.is_data for img in sources]
+    all_data = all(data_images)
+    resized: dict[int, str] = {}
+
+    def read_cell(img: Image) -> np.ndarray:
+        if tuple(img.size) != (cell_width, cell_height):
+            resized[img.as_pointer()] = img.name
+        pixels = read_image_pixels(img)
+        if float_buffer and is_srgb_encoded(img):
+            pixels = srgb_to_linear(pixels)
+        return resize_pixels_nearest(pixels, cell_width, cell_height)
+
+    fill_pixels = np.zeros((cell_height, cell_width, 4), dtype=np.float32)
+    if fill is not None and fill.size[0] > 0 and fill.size[1] > 0:
+        fill_pixels = read_cell(fill)
+
+    atlas_pixels = np.zeros((rows * cell_height, cols * cell_width, 4), dtype=np.float32)
+
+    # Images shared by multiple cells are only read once
+    cache: dict[int, np.ndarray] = {}
+    for i, img in enumerate(cells):
+        if img is None or img.size[0] == 0 or img.size[1] == 0:
+            cell_pixels = fill_pixels
+        else:
+            key = img.as_pointer()
+            if key not in cache:
+                cache[key] = read_cell(img)
+            cell_pixels = cache[key]
+
+        col, row = i % cols, i // cols
+        atlas_pixels[row * cell_height:(row + 1) * cell_height, col * cell_width:(col + 1) * cell_width] = cell_pixels
+
+    width, height = cols * cell_width, rows * cell_height
+    if atlas is not None and atlas.is_float != float_buffer:
+        # The buffer type of an existing image can't be changed
+        bpy.data.images.remove(atlas)
+        atlas = None
+
+    if atlas is None:
+        atlas = bpy.data.images.new(name, width, height, alpha=True, float_buffer=float_buffer)
+        atlas[IMAGE_TAG_PROP] = True
+    elif tuple(atlas.size) != (width, height):
+        atlas.scale(width, height)
+
+    if all_data:
+        colorspace = 'Non-Color'
+    else:
+        colorspace = 'Linear Rec.709' if float_buffer else 'sRGB'
+    if atlas.colorspace_settings.name != colorspace:
+        atlas.colorspace_settings.name = colorspace
+
+    atlas.pixels.foreach_set(atlas_pixels.ravel())
+    atlas.update()
+
+    # Generated images are lost on save unless they are packed
+    atlas.pack()
+
+    return PackedAtlas(atlas, cols, rows, list(resized.values()), mixed_color_data=not all_data and any(data_images))
+
+def pack_lookup_table(cells: list[int | None], lut: Image | None = None, name: str = "Lookup") -> Image | None:
+    """Encode atlas cell indices (below 65536) into a one pixel high image, where pixel `x` holds the cell of `cells[x]` as `red + green * 256` (in 8-bit values).
+    The alpha of pixels without a cell (`None`) is zero. The pixels of `lut` are overwritten if it's set; otherwise a new image named `name` is created.
+    Returns `None` if there's nothing to encode or the image would be too wide.
+    """
+    width = len(cells)
+    if width == 0 or width > ATLAS_MAX_SIZE:
+        return None
+
+    pixels = np.zeros((width, 4), dtype=np.float32)
+    for x, cell in enumerate(cells):
+        if cell is not None:
+            pixels[x] = (cell % 256 / 255, cell // 256 / 255, 0.0, 1.0)
+
+    if lut is None:
+        lut = bpy.data.images.new(name, width, 1, alpha=True)
+        lut[IMAGE_TAG_PROP] = True
+    elif tuple(lut.size) != (width, 1):
+        lut.scale(width, 1)
+
+    # The values are data, not colors; they are stored (and read back) as-is
+    lut.colorspace_settings.name = 'Non-Color'
+    lut.alpha_mode = 'CHANNEL_PACKED'
+    lut.pixels.foreach_set(pixels.ravel())
+    lut.update()
+    lut.pack()
+
+    return lut
+
+def split_sequence_filepath(filepath: str) -> tuple[str, str, str] | None:
+    """Split the path of an image sequence frame into `(head, number, tail)` the way Blender does: the number is the last group of digits in the file name, before its extension.
+    Returns `None` if there's no such number."""
+    directory, filename = os.path.split(filepath)
+    stem, ext = os.path.splitext(filename)
+    match = re.match(r"^(.*?)(\d+)(\D*)$", stem)
+    if match is None:
+        return None
+    return (os.path.join(directory, match.group(1)), match.group(2), match.group(3) + ext)
+
+# Image file reading. Nothing below touches bpy, so it's safe to run in
+# worker threads.
+
+class ImageFileInfo(NamedTuple):
+    """Information read from an image file without decoding its pixels."""
+    filepath: str
+    # Size and alpha presence are `None` if the file format isn't recognized
+    width: int | None = None
+    height: int | None = None
+    has_alpha: bool | None = None
+    content_hash: str | None = None
+    # Set if the file couldn't be read
+    error: str | None = None
+
+def probe_png(f) -> tuple[int, int, bool] | None:
+    """Read size and alpha presence of a PNG file (the file position must be right after the signature)."""
+    length, chunk_type = struct.unpack(">I4s", f.read(8))
+    if chunk_type != b"IHDR":
+        return None
+
+    width, height, _, color_type = struct.unpack(">IIBB", f.read(10))
+    if color_type in (4, 6):
+        return (width, height, True)
+
+    # Other color types may still have transparency with a tRNS chunk, which
+    # comes before the image data
+    f.seek(length - 10 + 4, os.SEEK_CUR)
+    while (header := f.read(8)) and len(header) == 8:
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type == b"tRNS":
+            return (width, height, True)
+        if chunk_type in (b"IDAT", b"IEND"):
+            break
+        f.seek(length + 4, os.SEEK_CUR)
+
+    return (width, height, False)
+
+def probe_jpeg(f) -> tuple[int, int, bool] | None:
+    """Read size of a JPEG file (the file position must be right after the SOI marker). JPEG has no alpha channel."""
+    while (marker := f.read(2)) and len(marker) == 2:
+        if marker[0] != 0xFF:
+            return None
+        # Start of frame markers (excluding DHT, JPG and DAC)
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            _, _, height, width = struct.unpack(">HBHH", f.read(7))
+            return (width, height, False)
+        length, = struct.unpack(">H", f.read(2))
+        f.seek(length - 2, os.SEEK_CUR)
+    return None
+
+def probe_bmp(f) -> tuple[int, int, bool] | None:
+    """Read size and alpha presence of a BMP file (the file position must be right after the signature)."""
+    f.seek(18)
+    width, height, _, bits_per_pixel = struct.unpack("<iiHH", f.read(12))
+    return (width, abs(height), bits_per_pixel == 32)
+
+def probe_image_file(filepath: str) -> tuple[int, int, bool] | None:
+    """Read the `(width, height, has_alpha)` of an image from its header. Returns `None` for formats that aren't recognized (Blender may still be able to load them)."""
+    with open(filepath, "rb") as f:
+        signature = f.read(8)
+        try:
+            if signature == b"\x89PNG\r\n\x1a\n":
+                return probe_png(f)
+            if signature[:2] == b"\xff\xd8":
+                f.seek(2)
+                return probe_jpeg(f)
+            if signature[:2] == b"BM":
+                return probe_bmp(f)
+        except struct.error:
+            # Truncated file
+            return None
+    return None
+
+def hash_file(filepath: str, chunk_size: int = 1 << 20) -> str:
+    """Hash the contents of a file, reading it in chunks."""
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as f:
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def read_image_file_info(filepath: str, hash_contents: bool = False) -> ImageFileInfo:
+    """Read the header (and optionally hash the contents) of an image file."""
+    try:
+        header = probe_image_file(filepath)
+        content_hash = hash_file(filepath) if hash_contents else None
+    except OSError as e:
+        return ImageFileInfo(filepath, error=str(e))
+
+    if header is None:
+        return ImageFileInfo(filepath, content_hash=content_hash)
+    return ImageFileInfo(filepath, *header, content_hash=content_hash)
+
+class ImageReadJob:
+    """Read image files (see `read_image_file_info()`) in a thread pool. Results are handed out in the order of `filepaths`."""
+    def __init__(self, filepaths: list[str], hash_contents: bool = False):
+        self.executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        self.futures: list[Future] = [self.executor.submit(read_image_file_info, path, hash_contents) for path in filepaths]
+        self.next_idx = 0
+
+    @property
+    def done_count(self) -> int:
+        return self.next_idx
+
+    @property
+    def is_finished(self) -> bool:
+        return self.next_idx >= len(self.futures)
+
+    def poll(self) -> list[ImageFileInfo]:
+        """Get the results that are ready (in order), without waiting."""
+        results: list[ImageFileInfo] = []
+        while not self.is_finished and self.futures[self.next_idx].done():
+            results.append(self.futures[self.next_idx].result())
+            self.next_idx += 1
+
+        if self.is_finished:
+            self.executor.shutdown(wait=False)
+        return results
+
+    def wait(self):
+        """Get all remaining results, waiting for them as needed."""
+        while not self.is_finished:
+            yield self.futures[self.next_idx].result()
+            self.next_idx += 1
+        self.executor.shutdown(wait=False)
+
+    def cancel(self):
+        """Cancel all reads that haven't started yet."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
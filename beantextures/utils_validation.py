@@ -0,0 +1,232 @@
+"""Validation of configurations: range overlaps, gaps, inverted ranges and name clashes of links."""
+import heapq
+from typing import NamedTuple
+import bpy
+from bpy.app.handlers import persistent
+from .props_settings import Btxs_ConfigEntry
+
+# Names of the node group sockets that are always there
+RESERVED_LINK_NAMES = {"Value", "Vector", "Image", "Alpha"}
+
+class RangeOverlap(NamedTuple):
+    """Overlap of a link's range with the ranges of other links."""
+    # Index of (one of) the overlapping link(s)
+    other_idx: int
+    # Number of links overlapping this one
+    count: int
+
+def is_range_empty(link_range: tuple[float, float], integer: bool) -> bool:
+    """Check if a `(greater than, less than)` range can never be matched. For integer ranges only whole numbers are considered."""
+    gt, lt = link_range
+    return (lt - gt <= 1) if integer else (lt <= gt)
+
+def sweep_ranges(ranges: list[tuple[float, float]], integer: bool, domain: tuple[float, float] | None = None) -> tuple[dict[int, RangeOverlap], list[tuple[float, float]]]:
+    """Find overlaps and gaps between `(greater than, less than)` ranges (both bounds exclusive) in one sweep, in O(N log N).
+    Returns `({range index: overlap}, gaps)`. Empty ranges are ignored. Gaps are only searched for within `domain` (`(min, max)`, inclusive), if it's set;
+    for integer ranges a gap `(low, high)` holds the whole numbers from `low` to `high`, otherwise it's the open interval between them.
+    """
+    # Two ranges overlap if the smaller `lt` is more than this above the bigger `gt`
+    margin = 1 if integer else 0
+
+    order = sorted((gt, lt, idx) for idx, (gt, lt) in enumerate(ranges) if not is_range_empty((gt, lt), integer))
+
+    # Active ranges as (lt, idx), i.e. the ones that may still overlap with
+    # ranges that start later
+    active: list[tuple[float, int]] = []
+    start_pos: dict[int, int] = {}
+    counts: dict[int, int] = {}
+    partners: dict[int, int] = {}
+    # Active ranges without a known overlapping range
+    waiting: set[int] = set()
+
+    gaps: list[tuple[float, float]] = []
+    # Lowest value that isn't covered by the ranges swept so far
+    covered = domain[0] if domain is not None else None
+
+    def add_gap(low: float, high: float):
+        # Ranges may reach past the domain
+        if domain is not None:
+            low, high = max(low, domain[0]), min(high, domain[1])
+        if high + margin > low:
+            gaps.append((low, high))
+
+    def finish(idx: int, end_pos: int):
+        # Every range that started while this one was active overlaps it
+        counts[idx] += end_pos - start_pos[idx] - 1
+        waiting.discard(idx)
+
+    for pos, (gt, lt, idx) in enumerate(order):
+        while len(active) > 0 and active[0][0] - gt <= margin:
+            _, ended_idx = heapq.heappop(active)
+            finish(ended_idx, pos)
+
+        if covered is not None and gt + margin > covered:
+            add_gap(covered, gt)
+        covered = lt if covered is None else max(covered, lt)
+
+        # All ranges that are still active overlap with this one
+        start_pos[idx] = pos
+        counts[idx] = len(active)
+        if len(active) > 0:
+            partners[idx] = active[0][1]
+            for waiting_idx in waiting:
+                partners[waiting_idx] = idx
+            waiting.clear()
+        else:
+            waiting.add(idx)
+        heapq.heappush(active, (lt, idx))
+
+    for _, idx in active:
+        finish(idx, len(order))
+
+    if domain is not None and covered is not None and domain[1] + margin > covered:
+        add_gap(covered, domain[1])
+
+    overlaps = {idx: RangeOverlap(partners[idx], count) for idx, count in counts.items() if count > 0}
+    return (overlaps, gaps)
+
+def has_overlaps(ranges: list[tuple[float, float]], integer: bool) -> bool:
+    """Check if any two (non-empty) `(greater than, less than)` ranges can be matched by the same value."""
+    return len(sweep_ranges(ranges, integer)[0]) > 0
+
+def get_link_ranges(config: Btxs_ConfigEntry) -> list[tuple[float, float]] | None:
+    """Get the `(greater than, less than)` range of every link, or `None` if links of the config's linking type don't have ranges."""
+    match config.linking_type:
+        case 'INT_SIMPLE':
+            return [(link.int_simple_val - 1, link.int_simple_val + 1) for link in config.links]
+        case 'INT':
+            return [(link.int_gt, link.int_lt) for link in config.links]
+        case 'FLOAT':
+            return [(link.float_gt, link.float_lt) for link in config.links]
+        case _:
+            return None
+
+def format_gap(gap: tuple[float, float], integer: bool) -> str:
+    low, high = gap
+    if not integer:
+        return f"Values between {low:g} and {high:g} aren't matched by any link."
+    if low == high:
+        return f"Value {low:g} isn't matched by any link."
+    return f"Values {low:g} to {high:g} aren't matched by any link."
+
+class ValidationReport:
+    """Result of validating a configuration (see `validate_config()`)."""
+    def __init__(self, link_count: int):
+        self.config_warnings: list[str] = []
+        # Warnings of every link, by link index
+        self.link_warnings: list[list[str]] = [[] for _ in range(link_count)]
+        # Informational messages (ranges not covered by any link)
+        self.infos: list[str] = []
+
+        self.overlaps: dict[int, RangeOverlap] = {}
+        self.gaps: list[tuple[float, float]] = []
+        self.inverted: list[int] = []
+        self.empty: list[int] = []
+        self.out_of_bounds: list[int] = []
+        self.duplicate_names: dict[str, list[int]] = {}
+
+    @property
+    def has_warnings(self) -> bool:
+        return len(self.config_warnings) > 0 or any(len(warnings) > 0 for warnings in self.link_warnings)
+
+def validate_config(config: Btxs_ConfigEntry) -> ValidationReport:
+    """Check the whole configuration in one pass over its links (plus a sort for ranged linking types)."""
+    links = config.links
+    report = ValidationReport(len(links))
+
+    if len(links) == 0:
+        report.config_warnings.append("There is no link available.")
+        return report
+
+    indices_by_name: dict[str, list[int]] = {}
+    for idx, link in enumerate(links):
+        indices_by_name.setdefault(link.name, []).append(idx)
+        if link.name in RESERVED_LINK_NAMES:
+            report.link_warnings[idx].append("Please choose other non-reserved link name.")
+
+    report.duplicate_names = {name: indices for name, indices in indices_by_name.items() if len(indices) > 1}
+    for indices in report.duplicate_names.values():
+        for idx in indices:
+            report.link_warnings[idx].append("Link with similar name already exists.")
+
+    ranges = get_link_ranges(config)
+    if ranges is None:
+        return report
+
+    integer = config.linking_type != 'FLOAT'
+    if integer:
+        domain = (config.int_min, config.int_max)
+    else:
+        domain = (config.float_min, config.float_max)
+
+    for idx, (gt, lt) in enumerate(ranges):
+        # INT_SIMPLE ranges can't be inverted nor empty
+        if lt < gt:
+            report.inverted.append(idx)
+            if integer:
+                report.link_warnings[idx].append("The assigned greater than digit is bigger than its less than!")
+            else:
+                report.link_warnings[idx].append("Range is invalid!")
+        elif is_range_empty((gt, lt), integer):
+            report.empty.append(idx)
+            report.link_warnings[idx].append("Range doesn't contain any whole number." if integer else "Range is empty.")
+
+        if config.linking_type == 'INT_SIMPLE':
+            out_of_bounds = gt + 1 > domain[1] or gt + 1 < domain[0]
+        elif integer:
+            out_of_bounds = lt > domain[1] + 1 or gt < domain[0] - 1
+        else:
+            out_of_bounds = lt > domain[1] or gt < domain[0]
+        if out_of_bounds:
+            report.out_of_bounds.append(idx)
+            report.link_warnings[idx].append("Bound number is out of the set max/min range." if config.linking_type == 'INT_SIMPLE' else "Range is out of the set max/min range.")
+
+    report.overlaps, report.gaps = sweep_ranges(ranges, integer, domain)
+
+    for idx, overlap in report.overlaps.items():
+        other_name = links[overlap.other_idx].name
+        more = f" (and {overlap.count - 1} more)" if overlap.count > 1 else ""
+        if config.linking_type == 'INT_SIMPLE':
+            report.link_warnings[idx].append(f"Index has been used by link '{other_name}'{more}.")
+        else:
+            report.link_warnings[idx].append(f"Range overlaps with link '{other_name}'{more}.")
+
+    report.infos = [format_gap(gap, integer) for gap in report.gaps]
+    return report
+
+# Validation reports by config pointer, as (revision, link count, report).
+# Removing links doesn't go through update callbacks, so the link count is
+# checked too.
+BTXS_CACHE_VALIDATION_REPORTS: dict[int, tuple[int, int, ValidationReport]] = {}
+
+def get_validation_report(config: Btxs_ConfigEntry) -> ValidationReport:
+    """Get the validation report of a configuration; it's only validated again if it changed since (see `props_settings.bump_config_revision()`)."""
+    key = config.as_pointer()
+    cached = BTXS_CACHE_VALIDATION_REPORTS.get(key)
+    if cached is not None and cached[0] == config.revision and cached[1] == len(config.links):
+        return cached[2]
+
+    report = validate_config(config)
+    BTXS_CACHE_VALIDATION_REPORTS[key] = (config.revision, len(config.links), report)
+    return report
+
+def clear_validation_cache():
+    """Forget all validation reports. Needed whenever configs may have moved in memory or got their revisions reverted (file load, undo, addition and removal of configs)."""
+    BTXS_CACHE_VALIDATION_REPORTS.clear()
+
+@persistent
+def clear_validation_cache_handler(*args):
+    clear_validation_cache()
+
+def get_cache_handlers() -> list[list]:
+    return [bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post]
+
+def register():
+    for handlers in get_cache_handlers():
+        handlers.append(clear_validation_cache_handler)
+
+def unregister():
+    for handlers in get_cache_handlers():
+        if clear_validation_cache_handler in handlers:
+            handlers.remove(clear_validation_cache_handler)
+    clear_validation_cache()
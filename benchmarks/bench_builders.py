@@ -0,0 +1,159 @@
+"""Benchmark the Beantextures node tree builders and validators on synthetic configurations, without the UI.
+
+The add-on has to be installed (and is enabled by this script if it isn't already). Usage:
+
+    blender -b --factory-startup --python benchmarks/bench_builders.py -- [options]
+
+Options:
+    --sizes N,N,...     amounts of links to benchmark (default: 10,100,1000,5000)
+    --types T,T,...     linking types to benchmark (default: INT_SIMPLE,INT,FLOAT,ENUM)
+    --mode MODE         generation mode (default: CHAIN)
+    --no-images         leave the links without images (i.e. color/alpha input sockets)
+    --repeat N          run every measurement N times and keep the fastest and median times (default: 3)
+    --output FILE       write the results to FILE (JSON)
+    --compare FILE      print how the results compare to a previous output file
+
+Every linking type is benchmarked with alpha output and vector input both on and off. For every case, a full build (over an empty
+node tree), an incremental re-generation over the existing tree (with nothing changed) and the validation are measured.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import addon_utils
+import bpy
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender -b --python bench_builders.py --", description="Benchmark the Beantextures node tree builders.")
+    parser.add_argument("--sizes", default="10,100,1000,5000", help="amounts of links to benchmark")
+    parser.add_argument("--types", default="INT_SIMPLE,INT,FLOAT,ENUM", help="linking types to benchmark")
+    parser.add_argument("--mode", default="CHAIN", help="generation mode")
+    parser.add_argument("--no-images", action="store_true", help="leave the links without images")
+    parser.add_argument("--repeat", type=int, default=3, help="times to run every measurement")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="previous output file to compare with")
+    return parser.parse_args(argv)
+
+def enable_beantextures():
+    """Enable the add-on (installed either as a legacy add-on or as an extension) and return its module."""
+    for mod in addon_utils.modules(refresh=False):
+        if mod.__name__.split(".")[-1] == "beantextures":
+            return addon_utils.enable(mod.__name__, default_set=False, persistent=True)
+    return None
+
+def get_images(count: int) -> list[bpy.types.Image]:
+    """Get `count` distinct (tiny) images, creating them as needed."""
+    images = [img for img in bpy.data.images if img.name.startswith("btxs_bench_")]
+    for idx in range(len(images), count):
+        images.append(bpy.data.images.new(f"btxs_bench_{idx}", 1, 1))
+    return images[:count]
+
+def make_config(scene: bpy.types.Scene, linking_type: str, size: int, output_alpha: bool, input_vector: bool, mode: str, with_images: bool):
+    """Add a configuration with `size` non-overlapping links (and a new target node tree) to the scene."""
+    config = scene.beantextures_settings.configs.add()
+    config.name = f"{linking_type}_{size}_{int(output_alpha)}{int(input_vector)}"
+    config.linking_type = linking_type
+    config.generation_mode = mode
+    config.output_alpha = output_alpha
+    config.input_vector = input_vector
+    config.target_node_tree = bpy.data.node_groups.new(config.name, 'ShaderNodeTree')
+    config.int_min, config.int_max = 1, size
+    config.float_min, config.float_max = 0.0, float(size)
+
+    images = get_images(size) if with_images else [None] * size
+    for idx in range(size):
+        link = config.links.add()
+        link.name = str(idx + 1)
+        link.img = images[idx]
+        link.int_simple_val = idx + 1
+        link.int_gt, link.int_lt = idx, idx + 2
+        link.float_gt, link.float_lt = float(idx), float(idx + 1)
+    return config
+
+def measure(func, repeat: int) -> dict:
+    """Run `func` `repeat` times; returns the fastest and median times (in seconds) and the result of the last run."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "result": result}
+
+def run_case(beantextures, scene, linking_type: str, size: int, output_alpha: bool, input_vector: bool, args) -> dict:
+    ops_generation = beantextures.ops_generation
+    validation = beantextures.utils_validation
+    config = make_config(scene, linking_type, size, output_alpha, input_vector, args.mode, not args.no_images)
+
+    build = measure(lambda: ops_generation.build_node_tree(config, incremental=False, profile=True), args.repeat)
+    regenerate = measure(lambda: ops_generation.build_node_tree(config, incremental=True, profile=True), args.repeat)
+    # Bypasses the validation cache on purpose
+    validate = measure(lambda: validation.validate_config(config), args.repeat)
+
+    bpy.data.node_groups.remove(config.target_node_tree)
+    scene.beantextures_settings.configs.remove(len(scene.beantextures_settings.configs) - 1)
+
+    return {
+        "linking_type": linking_type,
+        "links": size,
+        "output_alpha": output_alpha,
+        "input_vector": input_vector,
+        "build": {"min": build["min"], "median": build["median"], "stats": build["result"].get_stats()},
+        "regenerate": {"min": regenerate["min"], "median": regenerate["median"], "stats": regenerate["result"].get_stats()},
+        "validate": {"min": validate["min"], "median": validate["median"]},
+    }
+
+def get_case_key(case: dict) -> tuple:
+    return (case["linking_type"], case["links"], case["output_alpha"], case["input_vector"])
+
+def print_results(results: list[dict], previous: dict[tuple, dict] | None):
+    print(f"{'case':<26} {'build (ms)':>12} {'regen (ms)':>12} {'validate (ms)':>14} {'nodes':>7} {'depth':>6}")
+    for case in results:
+        name = f"{case['linking_type']} x{case['links']} a{int(case['output_alpha'])} v{int(case['input_vector'])}"
+        line = f"{name:<26} {case['build']['min'] * 1000:>12.1f} {case['regenerate']['min'] * 1000:>12.1f} {case['validate']['min'] * 1000:>14.2f} {case['build']['stats']['node_count']:>7} {case['build']['stats']['graph_depth']:>6}"
+
+        old = previous.get(get_case_key(case)) if previous is not None else None
+        if old is not None:
+            ratios = [case[part]["min"] / old[part]["min"] if old[part]["min"] > 0 else float("nan") for part in ("build", "regenerate", "validate")]
+            line += "   vs. previous: " + " / ".join(f"{ratio:.2f}x" for ratio in ratios)
+        print(line)
+
+def main() -> int:
+    args = parse_args()
+    beantextures = enable_beantextures()
+    if beantextures is None:
+        print("Beantextures add-on is not installed.", file=sys.stderr)
+        return 1
+
+    previous = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            previous = {get_case_key(case): case for case in json.load(f)["results"]}
+
+    scene = bpy.data.scenes.new("Beantextures Benchmark")
+    results = []
+    for linking_type in args.types.split(","):
+        for size in (int(n) for n in args.sizes.split(",")):
+            for output_alpha in (False, True):
+                for input_vector in (False, True):
+                    results.append(run_case(beantextures, scene, linking_type, size, output_alpha, input_vector, args))
+                    print(f"done: {linking_type} x{size} (alpha: {output_alpha}, vector: {input_vector})", file=sys.stderr)
+
+    print_results(results, previous)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({
+                "addon_version": ".".join(str(n) for n in beantextures.bl_info["version"]),
+                "blender_version": bpy.app.version_string,
+                "mode": args.mode,
+                "images": not args.no_images,
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=1)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Regenerate every Beantextures node tree in one or more .blend files, without the UI.
+
+The add-on has to be installed (and is enabled by this script if it isn't already). Usage:
+
+    blender -b --python scripts/generate_all.py -- [options] file1.blend [file2.blend ...]
+
+Options:
+    --filter PATTERN    only generate configurations with a matching name (wildcards like * are supported)
+    --full-rebuild      clear the node trees and build every node again
+    --dry-run           don't save the files
+    --profile           measure the time of every generation step (included in the statistics)
+    --stats FILE        write the statistics of every generated configuration to FILE (JSON)
+"""
+import argparse
+import json
+import sys
+import addon_utils
+import bpy
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender -b --python generate_all.py --", description="Regenerate every Beantextures node tree in .blend files.")
+    parser.add_argument("files", nargs="+", help=".blend files to process")
+    parser.add_argument("--filter", default="", help="only generate configurations with a matching name")
+    parser.add_argument("--full-rebuild", action="store_true", help="clear the node trees and build every node again")
+    parser.add_argument("--dry-run", action="store_true", help="don't save the files")
+    parser.add_argument("--profile", action="store_true", help="measure the time of every generation step")
+    parser.add_argument("--stats", default=None, help="write statistics to this JSON file")
+    return parser.parse_args(argv)
+
+def enable_beantextures():
+    """Enable the add-on (installed either as a legacy add-on or as an extension) and return its module."""
+    for mod in addon_utils.modules(refresh=False):
+        if mod.__name__.split(".")[-1] == "beantextures":
+            return addon_utils.enable(mod.__name__, default_set=False, persistent=True)
+    return None
+
+def main() -> int:
+    args = parse_args()
+    beantextures = enable_beantextures()
+    if beantextures is None:
+        print("Beantextures add-on is not installed.", file=sys.stderr)
+        return 1
+
+    all_stats: dict[str, dict[str, list[dict]]] = {}
+    failed = 0
+
+    for filepath in args.files:
+        try:
+            bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+            file_stats = {
+                scene.name: beantextures.ops_generation.generate_scene_configs(scene, args.filter, incremental=not args.full_rebuild, profile=args.profile)
+                for scene in bpy.data.scenes
+            }
+            if not args.dry_run:
+                bpy.ops.wm.save_mainfile()
+        except Exception as e:
+            print(f"{filepath}: failed ({e})", file=sys.stderr)
+            failed += 1
+            continue
+
+        all_stats[filepath] = file_stats
+        generated = [stats for scene_stats in file_stats.values() for stats in scene_stats if stats["generated"]]
+        warnings = sum(len(stats["warnings"]) for stats in generated)
+        print(f"{filepath}: generated {len(generated)} node tree(s), {warnings} warning(s)")
+
+    if args.stats is not None:
+        with open(args.stats, "w") as f:
+            json.dump(all_stats, f, indent=1)
+
+    return 1 if failed > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())